@@ -0,0 +1,64 @@
+"""Add denormalized station_availability table (per-station charger counts)
+
+Revision ID: 20261017_add_station_availability
+Revises: 20251025_add_station_api_compat, 20251028_convert_kepco_ts_to_timestamptz, 20251031_subsidy_data_migration
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+# This revision also merges the three open heads.
+revision: str = '20261017_add_station_availability'
+down_revision: Union[str, Sequence[str], None] = (
+    '20251025_add_station_api_compat',
+    '20251028_convert_kepco_ts_to_timestamptz',
+    '20251031_subsidy_data_migration',
+)
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS station_availability (
+            cs_id VARCHAR(50) PRIMARY KEY,
+            total_chargers INTEGER NOT NULL DEFAULT 0,
+            available_chargers INTEGER NOT NULL DEFAULT 0,
+            fast_total INTEGER NOT NULL DEFAULT 0,
+            fast_available INTEGER NOT NULL DEFAULT 0,
+            slow_total INTEGER NOT NULL DEFAULT 0,
+            slow_available INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """)
+
+    # Backfill from existing chargers (same aggregation as
+    # app.repository.station_repository.REFRESH_STATION_AVAILABILITY_SQL)
+    op.execute("""
+        INSERT INTO station_availability (
+            cs_id, total_chargers, available_chargers,
+            fast_total, fast_available, slow_total, slow_available, updated_at
+        )
+        SELECT
+            s.cs_id,
+            COUNT(c.id),
+            COALESCE(SUM((COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+            COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('2', '3', '5', '6', '7'))::int), 0),
+            COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('2', '3', '5', '6', '7')
+                          AND COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+            COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('1', '4'))::int), 0),
+            COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('1', '4')
+                          AND COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+            now()
+        FROM stations s
+        LEFT JOIN chargers c ON c.station_id = s.id
+        WHERE s.cs_id IS NOT NULL
+        GROUP BY s.cs_id
+        ON CONFLICT (cs_id) DO NOTHING;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS station_availability;")
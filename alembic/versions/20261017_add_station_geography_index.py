@@ -0,0 +1,32 @@
+"""Add GiST expression index on stations.location::geography
+
+Revision ID: 20261017_add_station_geography_index
+Revises: 20261017_add_station_availability
+Create Date: 2026-10-17 13:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = '20261017_add_station_geography_index'
+down_revision: Union[str, Sequence[str], None] = '20261017_add_station_availability'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The station search filters with ST_DWithin(location::geography, ...)
+    # (meters) and orders by location::geography <-> point. The geometry
+    # index idx_stations_location cannot serve the casted expression, so
+    # index the expression itself.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_stations_location_geog
+        ON stations USING gist ((location::geography))
+        WHERE location IS NOT NULL
+    """)
+    op.execute("ANALYZE stations")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_stations_location_geog")
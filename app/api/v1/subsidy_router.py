@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_async_session
+from app.db.database import get_read_session
 from app.services.subsidy_service import subsidy_service
 
 # ----------------------------------------------------------------
@@ -27,7 +27,7 @@ router = APIRouter(
 async def search_subsidies(
         manufacturer: str = Query(..., description="자동차 제조사 이름, 예: '현대자동차'"),
         model_group: str = Query(..., description="차량 모델 그룹 이름, 예: 'GV60'"),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     """
     제조사(manufacturer)와 모델 그룹명(model_group)을 기준으로
@@ -24,6 +24,24 @@ class Settings(BaseSettings):
     # 데이터베이스
     # --------------------------
     DATABASE_URL: str
+    # Read-only replica (or read-only account) for hot SELECTs
+    # (app/db/database.py read engine). Falls back to DATABASE_URL.
+    DATABASE_URL_READONLY: Optional[str] = None
+    # Independent pools per engine: writes (KEPCO upserts, background jobs)
+    # cannot starve the read path and vice versa.
+    DB_WRITE_POOL_SIZE: int = 5
+    DB_WRITE_MAX_OVERFLOW: int = 5
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache per connection (0 behind pgbouncer
+    # in transaction pooling mode)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Prepare the hot read queries of app/db/queries.py on every new pooled
+    # connection (skipped when DB_STATEMENT_CACHE_SIZE is 0)
+    DB_WARM_QUERIES: bool = True
 
     # --------------------------
     # 보안 관련
@@ -38,6 +56,15 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: Optional[str] = None
+    # Connection pool per client (text + binary). Requests wait up to
+    # REDIS_POOL_TIMEOUT_SECONDS for a free connection when all are busy.
+    # Socket timeouts of 0 disable them; idle connections are PINGed after
+    # REDIS_HEALTH_CHECK_INTERVAL_SECONDS before reuse.
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5.0
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
     # Cache TTL in seconds for station SEARCH results. Use 300s (5 minutes)
     # per deployment request to balance freshness and load.
     CACHE_EXPIRE_SECONDS: int = 300
@@ -52,9 +79,142 @@ class Settings(BaseSettings):
     # DB-based rule for longer-term decisions) but cached dynamic snapshots
     # should be refreshed frequently to remain current.
     CACHE_DETAIL_EXPIRE_SECONDS: int = 300
-    # Number of decimal places to round coordinates for cache keys.
-    # Higher precision (e.g., 8) keeps cache keys very local to exact coords.
-    CACHE_COORD_ROUND_DECIMALS: int = 8
+    # Stale-while-revalidate window after CACHE_DETAIL_EXPIRE_SECONDS: the
+    # cached detail is returned with "stale": true while a background refresh
+    # runs. The Redis key lives EXPIRE + STALE seconds. 0 disables.
+    CACHE_DETAIL_STALE_SECONDS: int = 600
+    # Lease preventing several workers from refreshing the same key at once.
+    SWR_REVALIDATE_LOCK_TTL_SECONDS: int = 60
+    # Per-worker L1 cache of decoded values in front of Redis (get_cache /
+    # set_cache, app/services/l1_cache.py), bounded by entries and by the
+    # total length of the serialized values. Other workers drop their copy
+    # via the pub/sub channel; the TTL bounds staleness if a message is lost.
+    L1_CACHE_ENABLED: bool = True
+    L1_CACHE_MAX_ENTRIES: int = 2048
+    L1_CACHE_MAX_BYTES: int = 33554432
+    L1_CACHE_TTL_SECONDS: float = 30.0
+    L1_CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    # Encoding of cache values (app/redis_client.py encode_value): serializer
+    # "auto" | "msgpack" | "json" (orjson when installed) and compression
+    # "auto" | "zstd" | "zlib" | "none" for bodies of at least
+    # REDIS_CACHE_COMPRESS_MIN_BYTES. "auto" uses msgpack / zstd when the
+    # packages are installed. Legacy JSON values stay readable.
+    REDIS_CACHE_CODEC: str = "auto"
+    REDIS_CACHE_COMPRESSION: str = "auto"
+    REDIS_CACHE_COMPRESS_MIN_BYTES: int = 512
+    REDIS_CACHE_ZLIB_LEVEL: int = 6
+    REDIS_CACHE_ZSTD_LEVEL: int = 3
+
+    # --------------------------
+    # Metrics (app/metrics.py, GET /metrics)
+    # --------------------------
+    METRICS_ENABLED: bool = True
+    # In-process counters mirrored to Redis (metrics:*) are flushed as
+    # deltas on this interval instead of an INCR per request.
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 10.0
+    # Logging (app/core/logging_config.py): "json" or "text" lines on stdout
+    # through a queue of LOG_QUEUE_SIZE records (dropped when full). Each
+    # message template up to LOG_RATE_LIMIT_MAX_LEVEL is limited to
+    # LOG_RATE_LIMIT_PER_MINUTE records (0 = unlimited). SQL statements are
+    # logged at LOG_SQL_LEVEL=INFO (replaces the engine's echo=True).
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_RATE_LIMIT_PER_MINUTE: int = 60
+    LOG_RATE_LIMIT_MAX_LEVEL: str = "WARNING"
+    LOG_SQL_LEVEL: str = "WARNING"
+    # Per-request stage tracing (app/tracing.py): Server-Timing header on
+    # every response; a JSON trace log line for a random share of requests
+    # and for requests slower than TRACE_LOG_SLOW_MS (0 disables either).
+    TRACING_ENABLED: bool = True
+    TRACE_LOG_SAMPLE_RATE: float = 0.0
+    TRACE_LOG_SLOW_MS: int = 2000
+    # Edge length (degrees) of the grid tiles used by the station search cache.
+    # Static station data is cached per tile so all searches touching a tile
+    # share one entry. 0.05 deg is roughly 5.5km (lat) x 4.4km (lon) in Korea.
+    # Tile entries use PERSISTENT_STATION_CACHE_SECONDS as TTL.
+    STATION_TILE_SIZE_DEG: float = 0.05
+    # Tiles older than this are still served (the search response is marked
+    # "stale") and rebuilt from the DB in the background; the Redis TTL
+    # (PERSISTENT_STATION_CACHE_SECONDS) is the hard expiry. 0 disables.
+    STATION_TILE_SOFT_TTL_SECONDS: int = 3600
+    # In-process STRtree index of all stations (app/services/station_index.py).
+    # Loaded at startup; rows changed since the last refresh are applied every
+    # STATION_INDEX_REFRESH_SECONDS and the whole table is reloaded every
+    # STATION_INDEX_FULL_RELOAD_SECONDS (drops deleted stations).
+    STATION_INDEX_ENABLED: bool = True
+    STATION_INDEX_REFRESH_SECONDS: int = 300
+    STATION_INDEX_FULL_RELOAD_SECONDS: int = 21600
+    # Each delta refresh re-reads this window before the watermark: change
+    # timestamps are transaction start times, so a slow transaction can commit
+    # rows older than the watermark (keep above the longest write transaction).
+    STATION_INDEX_REFRESH_OVERLAP_SECONDS: int = 300
+    # Stations pushed by searches (KEPCO results) are applied in one rebuild
+    # after this delay instead of one rebuild per response.
+    STATION_INDEX_UPSERT_DELAY_SECONDS: float = 2.0
+
+    # --------------------------
+    # 역지오코딩 (좌표 -> 시/군/구/동)
+    # --------------------------
+    # Administrative boundary polygons (.geojson) for the offline reverse
+    # geocoder, built with scripts/build_admin_districts.py. Defaults to
+    # app/data/admin_districts.geojson; without it every lookup falls back
+    # to Nominatim.
+    REVERSE_GEOCODER_DATASET_PATH: Optional[str] = None
+    # Call Nominatim when the offline geocoder has no answer.
+    REVERSE_GEOCODER_NOMINATIM_FALLBACK: bool = True
+    # Nominatim results are cached per quantized cell: in-process LRU first,
+    # then a Redis hash. 0.005 deg is roughly 550m x 440m in Korea.
+    REVERSE_GEOCODE_CACHE_CELL_DEG: float = 0.005
+    REVERSE_GEOCODE_CACHE_LRU_SIZE: int = 4096
+    # Administrative boundaries rarely change: each cached entry is reloaded
+    # after 30 days.
+    REVERSE_GEOCODE_CACHE_TTL_SECONDS: int = 2592000
+
+    # --------------------------
+    # Request coalescing (single-flight) for KEPCO fetches
+    # --------------------------
+    # Redis lease held by the worker calling upstream; must outlive the
+    # KEPCO request timeout (30s) so a slow call is not duplicated.
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS: int = 35
+    # How long other workers wait for the leader before serving the previous
+    # result (or calling upstream themselves when there is none).
+    SINGLE_FLIGHT_WAIT_SECONDS: float = 10.0
+    # Retention of the shared result in Redis (also the "previous value").
+    SINGLE_FLIGHT_RESULT_TTL_SECONDS: int = 60
+
+    # --------------------------
+    # Write-behind persistence of KEPCO results (app/services/write_behind.py)
+    # --------------------------
+    # False: the station endpoints upsert inline before responding.
+    WRITE_BEHIND_ENABLED: bool = True
+    # Pending jobs per worker; when full, callers fall back to inline writes.
+    WRITE_BEHIND_MAX_JOBS: int = 1000
+    # A batch is flushed once this many KEPCO items are pending or
+    # FLUSH_SECONDS after its first job, whichever comes first.
+    WRITE_BEHIND_BATCH_MAX_ITEMS: int = 5000
+    WRITE_BEHIND_FLUSH_SECONDS: float = 0.5
+    # Upper bound for flushing the remaining jobs on shutdown.
+    WRITE_BEHIND_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    # Retries of a failed batch (backoff doubles from RETRY_BACKOFF_SECONDS)
+    # before its jobs are written one by one and failing ones dropped.
+    WRITE_BEHIND_RETRY_ATTEMPTS: int = 2
+    WRITE_BEHIND_RETRY_BACKOFF_SECONDS: float = 0.5
+
+    # --------------------------
+    # Background charger status refresh (app/services/charger_refresher.py)
+    # --------------------------
+    # Run the refresher inside the API process. Disable when it runs as a
+    # separate process (scripts/refresh_stale_chargers.py).
+    CHARGER_REFRESH_ENABLED: bool = True
+    CHARGER_REFRESH_INTERVAL_SECONDS: int = 300
+    # Refresh before the detail endpoint's 30-minute freshness rule expires.
+    CHARGER_REFRESH_STALE_MINUTES: int = 25
+    # Concurrent KEPCO calls and minimum spacing between them.
+    CHARGER_REFRESH_CONCURRENCY: int = 2
+    CHARGER_REFRESH_MIN_CALL_INTERVAL_SECONDS: float = 1.0
+    # Addresses (districts) refreshed per pass; the rest waits for the next one.
+    CHARGER_REFRESH_MAX_ADDRS_PER_RUN: int = 50
 
     # --------------------------
     # KEPCO API 설정 (기존 EXTERNAL_STATION_API 환경변수 활용)
@@ -81,8 +241,31 @@ class Settings(BaseSettings):
     EXTERNAL_STATION_API_RETURN_TYPE: str = "json"
     # seed / batch 스크립트용 타임아웃(초)
     EXTERNAL_STATION_API_TIMEOUT_SEED_SECONDS: int = 30
-    # 외부 API 호출 타임아웃(초)
-    EXTERNAL_STATION_API_TIMEOUT_SECONDS: int = 10
+    # 외부 API 호출 타임아웃(초) - read timeout of the shared KEPCO client
+    EXTERNAL_STATION_API_TIMEOUT_SECONDS: int = 30
+    # Raw KEPCO payloads per addr (REDIS_CACHE_* codec, indexed by csId) shared by
+    # station search and detail: a click on a station of a just-searched
+    # area is served without another upstream call. Matches the detail TTL.
+    KEPCO_PAYLOAD_CACHE_SECONDS: int = 300
+    # KEPCO connection pool (app/http_client.py)
+    EXTERNAL_STATION_API_MAX_CONNECTIONS: int = 20
+    EXTERNAL_STATION_API_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
+    # --------------------------
+    # Outbound HTTP client pool (app/http_client.py)
+    # --------------------------
+    # One keep-alive client per upstream host, created in the lifespan.
+    # HTTP/2 needs the optional `h2` package (httpx[http2]).
+    HTTP_CLIENT_HTTP2: bool = False
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # Max wait for a free pooled connection
+    HTTP_CLIENT_POOL_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_DEFAULT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CLIENT_DEFAULT_MAX_CONNECTIONS: int = 10
+    # Nominatim usage policy allows ~1 req/s: keep concurrency low
+    NOMINATIM_TIMEOUT_SECONDS: float = 10.0
+    NOMINATIM_MAX_CONNECTIONS: int = 2
 
     # --------------------------
     # 실행 환경
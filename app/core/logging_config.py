@@ -0,0 +1,159 @@
+"""Non-blocking structured logging
+
+setup_logging() routes the root logger through a bounded queue: request
+handlers only enqueue the LogRecord (no stdout write, no formatting of the
+args), and a QueueListener thread formats and writes them as JSON lines (or
+plain text with LOG_FORMAT=text). When the queue is full records are
+dropped and counted instead of blocking the event loop.
+
+Per-message rate limiting keeps the log volume flat under load: records up
+to LOG_RATE_LIMIT_MAX_LEVEL are limited to LOG_RATE_LIMIT_PER_MINUTE per
+message template (the unformatted `msg`, so per-row messages with different
+args share one budget). The first record after a suppressed window carries
+`suppressed=<n>`. Use %-style arguments so formatting stays lazy:
+
+    logger.info("DB hit: %d stations", len(rows))
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "suppressed"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, extra fields, exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """At most `limit` records per message template and window (levels <= max_level)"""
+
+    def __init__(self, limit: int, window_seconds: float = 60.0, max_level: int = logging.WARNING):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_level = max_level
+        self._lock = threading.Lock()
+        # (logger, template) -> [window start, emitted, suppressed]
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno > self.max_level:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                if len(self._windows) > 10000:
+                    self._windows.clear()
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks or formats on the caller's thread"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: no pickling needed. Only freeze args that could
+        # change before the listener formats them.
+        if record.args and not all(isinstance(a, _PRIMITIVES) for a in _iter_args(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _iter_args(args):
+    return args.values() if isinstance(args, dict) else args
+
+
+def setup_logging() -> None:
+    """Install the queue handler on the root logger (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(RateLimitFilter(
+        settings.LOG_RATE_LIMIT_PER_MINUTE,
+        max_level=logging.getLevelName(settings.LOG_RATE_LIMIT_MAX_LEVEL.upper()),
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # SQL echo of the engine goes through the same pipeline (and levels)
+    logging.getLogger("sqlalchemy.engine").setLevel(settings.LOG_SQL_LEVEL.upper())
+
+    _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    handler = next((h for h in logging.getLogger().handlers if isinstance(h, NonBlockingQueueHandler)), None)
+    if handler is None:
+        return {}
+    return {"queued": handler.queue.qsize(), "dropped": handler.dropped}
@@ -1,19 +1,80 @@
 import asyncio
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import AsyncGenerator, Dict, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from ..models import Base
 from ..core.config import settings
+from ..metrics import DB_POOL_WAIT_SECONDS
+from .queries import warm_connection
 
 # 🌟 [수정] settings.DATABASE_URL을 사용하여 비동기 드라이버(asyncpg)를 명시적으로 지정
 # settings.DATABASE_URL에는 "postgresql://"로 시작하는 주소가 있으므로,
 # 이를 "postgresql+asyncpg://"로 변경하여 비동기 연결을 강제합니다.
-ASYNC_DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+def _async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(
-    ASYNC_DATABASE_URL, # 🌟 수정된 비동기 URL 사용
-    echo=True,
-    future=True
+ASYNC_DATABASE_URL = _async_url(settings.DATABASE_URL)
+# reads go to the replica / read-only account when configured
+ASYNC_READ_DATABASE_URL = _async_url(settings.DATABASE_URL_READONLY or settings.DATABASE_URL)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Default async pool, recording the checkout wait (DB_POOL_WAIT_SECONDS)"""
+
+    engine_label = "primary"
+
+    def _do_get(self):
+        with DB_POOL_WAIT_SECONDS.time(engine=self.engine_label):
+            return super()._do_get()
+
+
+class _ReadTimedQueuePool(TimedQueuePool):
+    engine_label = "read"
+
+
+def _create_engine(url: str, pool_class, pool_size: int, max_overflow: int, read_only: bool = False) -> AsyncEngine:
+    connect_args = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # SQLAlchemy's own per-connection cache (keyed by compiled SQL), used
+        # by every execute() and filled at connect time by warm_connection()
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if read_only:
+        # a write on a read connection fails loudly instead of reaching the replica/primary
+        connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+    async_engine = create_async_engine(
+        url,
+        # SQL statement logging via LOG_SQL_LEVEL (app/core/logging_config.py);
+        # echo=True wrote every statement synchronously to stdout
+        echo=False,
+        future=True,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _warm_prepared_statements(dbapi_connection, connection_record):
+        warm_connection(dbapi_connection, async_engine.dialect)
+
+    return async_engine
+
+
+# primary: KEPCO upserts, background jobs and read-your-writes paths
+engine = _create_engine(
+    ASYNC_DATABASE_URL, TimedQueuePool, settings.DB_WRITE_POOL_SIZE, settings.DB_WRITE_MAX_OVERFLOW
+)
+write_engine = engine
+# hot SELECTs (station search, subsidy, health); own pool even on the same URL
+read_engine = _create_engine(
+    ASYNC_READ_DATABASE_URL, _ReadTimedQueuePool, settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW,
+    read_only=True,
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -24,13 +85,37 @@ AsyncSessionLocal = sessionmaker(
     autocommit=False
 )
 
+# Read sessions run in AUTOCOMMIT: no BEGIN/COMMIT/ROLLBACK round-trips, and
+# (like every AsyncSession) no pool checkout until the first execute(), so a
+# request answered from cache never takes a connection.
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+
+def pool_usage() -> Dict[Tuple[str, str], int]:
+    """(engine, state) -> connections, for the /metrics gauges"""
+    usage: Dict[Tuple[str, str], int] = {}
+    for label, eng in (("primary", write_engine), ("read", read_engine)):
+        pool = eng.sync_engine.pool
+        usage[(label, "checked_out")] = pool.checkedout()
+        usage[(label, "size")] = pool.size()
+        usage[(label, "overflow")] = pool.overflow()
+    return usage
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Primary (write) session, committed when the request succeeds"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
             # 세션 내에서 트랜잭션이 성공적으로 처리된 경우에만 커밋
             # 비동기 세션을 사용할 때는 commit() 호출이 필요합니다.
-            await session.commit()
+            # (no transaction = no statement ran: skip the round-trip)
+            if session.in_transaction():
+                await session.commit()
         except Exception:
             # 예외 발생 시 롤백
             await session.rollback()
@@ -39,6 +124,20 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             # 세션 닫기
             await session.close()
 
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Lazy, autocommit, read-only session on the read pool for GET handlers.
+
+    Nothing is committed: writes must use AsyncSessionLocal /
+    get_async_session (the primary) explicitly.
+    """
+    async with AsyncReadSessionLocal() as session:
+        yield session
+
+async def dispose_engines():
+    """Close the pooled connections of both engines (app shutdown)"""
+    await read_engine.dispose()
+    await write_engine.dispose()
+
 # 데이터베이스에 테이블이 없는 경우 테이블을 생성하는 함수
 async def init_db():
     async with engine.begin() as conn:
@@ -0,0 +1,545 @@
+"""Named query registry for the hot raw SQL
+
+Every hot statement (station search, detail, availability counts, KEPCO
+upserts, subsidy lookups) is defined once here as a NamedQuery: the SQL
+text, a `text()` construct built at import time with typed bind
+parameters, and a stable name. Typed binds make the asyncpg dialect render
+explicit casts (`$1::FLOAT`), so Postgres never has to infer parameter
+types and the compiled string is identical on every call.
+
+    result = await NEARBY_STATIONS.execute(db, {"lat": ..., "lon": ..., ...})
+
+execute() records the latency in DB_QUERY_SECONDS
+(eon_db_query_duration_seconds{query="stations.nearby"}), so every query
+can be compared by name on /metrics and with scripts/bench_queries.py.
+
+SQLAlchemy's asyncpg dialect keeps a per-connection prepared statement
+cache keyed by the compiled SQL (prepared_statement_cache_size =
+DB_STATEMENT_CACHE_SIZE). warm_connection() runs the read queries that have
+`warm_params` once on every new pooled connection (parameters chosen to
+match no rows), so the parse/plan round-trip is paid at connect time instead
+of by the first request on that connection. Write statements are registered
+for timing only and are never executed during warmup.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import ARRAY, DateTime, Float, Integer, String, bindparam, text
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.types import TypeEngine
+
+from app.core.config import settings
+from app.metrics import DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class NamedQuery:
+    """A registered statement: name, SQL text and its precompiled text() construct"""
+
+    __slots__ = ("name", "sql", "statement", "warm_params")
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        types: Optional[Mapping[str, TypeEngine]] = None,
+        warm_params: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.sql = sql
+        statement: TextClause = text(sql)
+        if types:
+            statement = statement.bindparams(*(bindparam(key, type_=type_) for key, type_ in types.items()))
+        self.statement = statement
+        # parameters for the connect-time warmup (read queries only; must match no rows)
+        self.warm_params = warm_params
+
+    async def execute(self, db: AsyncSession, params: Optional[Dict[str, Any]] = None) -> Result:
+        """Execute on the session, timed as DB_QUERY_SECONDS{query=name}"""
+        with DB_QUERY_SECONDS.time(query=self.name):
+            return await db.execute(self.statement, params or {})
+
+    def __repr__(self) -> str:
+        return f"NamedQuery({self.name!r})"
+
+
+QUERIES: Dict[str, NamedQuery] = {}
+
+
+def register(
+    name: str,
+    sql: str,
+    types: Optional[Mapping[str, TypeEngine]] = None,
+    warm_params: Optional[Dict[str, Any]] = None,
+) -> NamedQuery:
+    if name in QUERIES:
+        raise ValueError(f"query {name} already registered")
+    query = QUERIES[name] = NamedQuery(name, sql, types, warm_params)
+    return query
+
+
+def get_query(name: str) -> NamedQuery:
+    return QUERIES[name]
+
+
+def warm_connection(dbapi_connection, dialect) -> int:
+    """Prepare the warmable queries on a new DBAPI connection (pool "connect" event)
+
+    Runs inside the pool's greenlet, so the adapted asyncpg cursor can be used
+    synchronously. Each statement is compiled exactly as Session.execute()
+    compiles it, so the prepared statement lands under the same cache key.
+    A failing query (e.g. a column missing on an older schema) is skipped.
+
+    Returns:
+        Number of statements prepared
+    """
+    if not settings.DB_WARM_QUERIES or settings.DB_STATEMENT_CACHE_SIZE <= 0:
+        return 0
+    started = time.perf_counter()
+    prepared = 0
+    try:
+        cursor = dbapi_connection.cursor()
+        for query in QUERIES.values():
+            if query.warm_params is None:
+                continue
+            compiled = query.statement.compile(dialect=dialect)
+            params = tuple(query.warm_params[key] for key in compiled.positiontup)
+            try:
+                cursor.execute(compiled.string, params)
+                cursor.fetchall()
+                prepared += 1
+            except Exception as e:
+                logger.debug("Warmup of %s skipped: %s", query.name, e)
+                dbapi_connection.rollback()
+        cursor.close()
+        # leave the connection idle (no open transaction) for the pool
+        dbapi_connection.rollback()
+    except Exception as e:
+        # never fail the checkout because of the warmup
+        logger.warning("Query warmup failed: %s", e)
+        return prepared
+    logger.debug("Prepared %d queries in %.1f ms", prepared, (time.perf_counter() - started) * 1000)
+    return prepared
+
+
+# ---------------------------------------------------------------------------
+# Station search
+# ---------------------------------------------------------------------------
+# Radius search with nearest-first ordering.
+# Both the radius filter and the ORDER BY use the `location::geography`
+# expression so they are answered by idx_stations_location_geog (GiST on the
+# geography cast); `<->` walks the index in distance order (KNN) and stops
+# after LIMIT + OFFSET rows instead of sorting every candidate in the radius
+# (ties on the distance are put in cs_id order by an incremental sort).
+# `sort_distance` is that ordering distance; (sort_distance, station_id) is
+# the cursor key of app/services/search_cursor.py.
+NEARBY_STATIONS_SQL = """
+    SELECT
+        stations.cs_id AS station_id,
+        COALESCE(stations.address, '') AS addr,
+        COALESCE(stations.name, '') AS station_name,
+        ST_Y(stations.location)::text AS lat,
+        ST_X(stations.location)::text AS lon,
+        stations.location::geography <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography AS sort_distance,
+        COALESCE(sa.total_chargers, 0) AS total_chargers,
+        COALESCE(sa.available_chargers, 0) AS available_chargers
+    FROM stations
+    LEFT JOIN station_availability sa ON sa.cs_id = stations.cs_id
+    WHERE stations.location IS NOT NULL
+      AND stations.cs_id IS NOT NULL
+      AND ST_DWithin(
+          stations.location::geography,
+          ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+          :radius_m
+      )
+    ORDER BY stations.location::geography <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography, stations.cs_id
+    LIMIT :limit OFFSET :offset
+"""
+
+NEARBY_STATIONS = register(
+    "stations.nearby",
+    NEARBY_STATIONS_SQL,
+    types={"lat": Float, "lon": Float, "radius_m": Float, "limit": Integer, "offset": Integer},
+    warm_params={"lat": 0.0, "lon": 0.0, "radius_m": 0.0, "limit": 0, "offset": 0},
+)
+
+# Keyset page of the radius search: stations after the cursor key
+# (sort_distance, station_id). Same KNN index walk as NEARBY_STATIONS; rows up
+# to the key are skipped by the scan instead of being fetched and discarded.
+NEARBY_STATIONS_AFTER_SQL = """
+    SELECT
+        stations.cs_id AS station_id,
+        COALESCE(stations.address, '') AS addr,
+        COALESCE(stations.name, '') AS station_name,
+        ST_Y(stations.location)::text AS lat,
+        ST_X(stations.location)::text AS lon,
+        stations.location::geography <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography AS sort_distance,
+        COALESCE(sa.total_chargers, 0) AS total_chargers,
+        COALESCE(sa.available_chargers, 0) AS available_chargers
+    FROM stations
+    LEFT JOIN station_availability sa ON sa.cs_id = stations.cs_id
+    WHERE stations.location IS NOT NULL
+      AND stations.cs_id IS NOT NULL
+      AND ST_DWithin(
+          stations.location::geography,
+          ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+          :radius_m
+      )
+      AND (
+          stations.location::geography <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+          stations.cs_id
+      ) > (:after_distance, :after_station_id)
+    ORDER BY stations.location::geography <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography, stations.cs_id
+    LIMIT :limit
+"""
+
+NEARBY_STATIONS_AFTER = register(
+    "stations.nearby_after",
+    NEARBY_STATIONS_AFTER_SQL,
+    types={
+        "lat": Float, "lon": Float, "radius_m": Float,
+        "after_distance": Float, "after_station_id": String, "limit": Integer,
+    },
+    warm_params={
+        "lat": 0.0, "lon": 0.0, "radius_m": 0.0,
+        "after_distance": 0.0, "after_station_id": "", "limit": 0,
+    },
+)
+
+# Name/address LIKE search, used when the spatial query fails (no PostGIS,
+# invalid geometries or schema drift), so it uses no PostGIS function at all:
+# coordinates come from the KEPCO lat/longi text columns and the distance is
+# a plain haversine (same formula and radius as app/services/distance_engine.py).
+# Ordered and keyset-paginated by (sort_distance, station_id) like the radius
+# search; the _AFTER form continues after a cursor. The inner OFFSET 0 keeps
+# the planner from flattening the subquery, so the regex-guarded casts run
+# once per matched row.
+_FALLBACK_NAME_SEARCH_SELECT = """
+    SELECT * FROM (
+        SELECT
+            c.station_id, c.addr, c.station_name, c.lat, c.lon,
+            2 * 6371000.0 * ASIN(SQRT(LEAST(1.0,
+                POWER(SIN(RADIANS(c.lat_deg - :lat) / 2), 2)
+                + COS(RADIANS(:lat)) * COS(RADIANS(c.lat_deg)) * POWER(SIN(RADIANS(c.lon_deg - :lon) / 2), 2)
+            ))) AS sort_distance,
+            c.total_chargers, c.available_chargers
+        FROM (
+            SELECT
+                stations.cs_id AS station_id,
+                COALESCE(stations.address, '') AS addr,
+                COALESCE(stations.name, '') AS station_name,
+                stations.lat AS lat,
+                stations.longi AS lon,
+                CASE WHEN stations.lat ~ '^-?[0-9]+(\\.[0-9]+)?$' THEN stations.lat::float END AS lat_deg,
+                CASE WHEN stations.longi ~ '^-?[0-9]+(\\.[0-9]+)?$' THEN stations.longi::float END AS lon_deg,
+                COALESCE(sa.total_chargers, 0) AS total_chargers,
+                COALESCE(sa.available_chargers, 0) AS available_chargers
+            FROM stations
+            LEFT JOIN station_availability sa ON sa.cs_id = stations.cs_id
+            WHERE stations.cs_id IS NOT NULL
+              AND (COALESCE(stations.address, '') LIKE :addr_pattern OR COALESCE(stations.name, '') LIKE :addr_pattern)
+            OFFSET 0
+        ) c
+        WHERE c.lat_deg IS NOT NULL AND c.lon_deg IS NOT NULL
+    ) s
+    WHERE s.sort_distance <= :radius_m"""
+
+FALLBACK_NAME_SEARCH_SQL = _FALLBACK_NAME_SEARCH_SELECT + """
+    ORDER BY s.sort_distance, s.station_id
+    LIMIT :limit OFFSET :offset
+"""
+
+FALLBACK_NAME_SEARCH_AFTER_SQL = _FALLBACK_NAME_SEARCH_SELECT + """
+      AND (s.sort_distance, s.station_id) > (:after_distance, :after_station_id)
+    ORDER BY s.sort_distance, s.station_id
+    LIMIT :limit
+"""
+
+FALLBACK_NAME_SEARCH = register(
+    "stations.name_search",
+    FALLBACK_NAME_SEARCH_SQL,
+    types={
+        "lat": Float, "lon": Float, "radius_m": Float, "addr_pattern": String,
+        "limit": Integer, "offset": Integer,
+    },
+)
+FALLBACK_NAME_SEARCH_AFTER = register(
+    "stations.name_search_after",
+    FALLBACK_NAME_SEARCH_AFTER_SQL,
+    types={
+        "lat": Float, "lon": Float, "radius_m": Float, "addr_pattern": String,
+        "after_distance": Float, "after_station_id": String, "limit": Integer,
+    },
+)
+
+# Bounding-box query used to (re)build tiles (app/services/station_tile_cache.py).
+# `&&` against the envelope is answered by the GiST index on stations.location
+# (geometry).
+TILE_FILL_SQL = """
+    SELECT
+        cs_id AS station_id,
+        COALESCE(address, '') AS addr,
+        COALESCE(name, '') AS station_name,
+        ST_Y(location) AS lat,
+        ST_X(location) AS lon
+    FROM stations
+    WHERE location IS NOT NULL
+      AND cs_id IS NOT NULL
+      AND location && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)
+"""
+
+TILE_FILL = register(
+    "stations.tile_fill",
+    TILE_FILL_SQL,
+    types={"min_lat": Float, "min_lon": Float, "max_lat": Float, "max_lon": Float},
+    warm_params={"min_lat": -90.0, "min_lon": -180.0, "max_lat": -90.0, "max_lon": -180.0},
+)
+
+
+# ---------------------------------------------------------------------------
+# Station detail
+# ---------------------------------------------------------------------------
+# Static station data + most recent charger update time. The primary query
+# prefers static_data_updated_at; the fallback is for schemas without it.
+STATION_DETAIL_SQL = """
+    SELECT id as station_db_id, cs_id, COALESCE(name, '') AS cs_nm, COALESCE(address, '') AS addr,
+        ST_Y(location)::text AS lat, ST_X(location)::text AS longi,
+        COALESCE(static_data_updated_at, updated_at) AS last_updated,
+        -- most recent charger dynamic update time for this station
+        (SELECT MAX(stat_update_datetime) FROM chargers WHERE cs_id = stations.cs_id) AS last_charger_update
+    FROM stations
+    WHERE cs_id = :station_id
+    LIMIT 1
+"""
+
+STATION_DETAIL_FALLBACK_SQL = """
+    SELECT id as station_db_id, cs_id, COALESCE(name, '') AS cs_nm, COALESCE(address, '') AS addr,
+        ST_Y(location)::text AS lat, ST_X(location)::text AS longi,
+        updated_at AS last_updated,
+        (SELECT MAX(stat_update_datetime) FROM chargers WHERE cs_id = stations.cs_id) AS last_charger_update
+    FROM stations
+    WHERE cs_id = :station_id
+    LIMIT 1
+"""
+
+STATION_CHARGERS_SQL = """
+    SELECT station_id, cp_id, cp_nm, cp_stat, charge_tp, cs_id, stat_update_datetime, kepco_stat_update_datetime
+    FROM chargers
+    WHERE cs_id = :station_id
+    ORDER BY cp_id
+"""
+
+STATION_DETAIL = register(
+    "station.detail",
+    STATION_DETAIL_SQL,
+    types={"station_id": String},
+    warm_params={"station_id": ""},
+)
+STATION_DETAIL_FALLBACK = register(
+    "station.detail_fallback",
+    STATION_DETAIL_FALLBACK_SQL,
+    types={"station_id": String},
+)
+STATION_CHARGERS = register(
+    "station.chargers",
+    STATION_CHARGERS_SQL,
+    types={"station_id": String},
+    warm_params={"station_id": ""},
+)
+
+
+# ---------------------------------------------------------------------------
+# Availability counts (station_availability)
+# ---------------------------------------------------------------------------
+# Recompute station_availability rows for the given cs_ids from chargers.
+# Chargers are joined via station_id so rows written by the batch scripts
+# (which fill cp_stat_raw/charger_type instead of cp_stat/charge_tp) count too.
+# Fast = DC charge types 2,3,5,6,7; slow = AC charge types 1,4.
+REFRESH_STATION_AVAILABILITY_SQL = """
+    INSERT INTO station_availability (
+        cs_id, total_chargers, available_chargers,
+        fast_total, fast_available, slow_total, slow_available, updated_at
+    )
+    SELECT
+        s.cs_id,
+        COUNT(c.id),
+        COALESCE(SUM((COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+        COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('2', '3', '5', '6', '7'))::int), 0),
+        COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('2', '3', '5', '6', '7')
+                      AND COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+        COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('1', '4'))::int), 0),
+        COALESCE(SUM((COALESCE(c.charge_tp::text, c.charger_type) IN ('1', '4')
+                      AND COALESCE(c.cp_stat::text, c.cp_stat_raw) = '1')::int), 0),
+        now()
+    FROM stations s
+    LEFT JOIN chargers c ON c.station_id = s.id
+    WHERE s.cs_id = ANY(:cs_ids)
+    GROUP BY s.cs_id
+    ON CONFLICT (cs_id) DO UPDATE SET
+        total_chargers = EXCLUDED.total_chargers,
+        available_chargers = EXCLUDED.available_chargers,
+        fast_total = EXCLUDED.fast_total,
+        fast_available = EXCLUDED.fast_available,
+        slow_total = EXCLUDED.slow_total,
+        slow_available = EXCLUDED.slow_available,
+        updated_at = EXCLUDED.updated_at
+"""
+
+GET_STATION_AVAILABILITY_SQL = """
+    SELECT cs_id, total_chargers, available_chargers,
+           fast_total, fast_available, slow_total, slow_available, updated_at
+    FROM station_availability
+    WHERE cs_id = ANY(:cs_ids)
+"""
+
+REFRESH_STATION_AVAILABILITY = register(
+    "station_availability.refresh",
+    REFRESH_STATION_AVAILABILITY_SQL,
+    types={"cs_ids": ARRAY(String)},
+)
+GET_STATION_AVAILABILITY = register(
+    "station_availability.get_many",
+    GET_STATION_AVAILABILITY_SQL,
+    types={"cs_ids": ARRAY(String)},
+    warm_params={"cs_ids": []},
+)
+
+
+# ---------------------------------------------------------------------------
+# Bulk KEPCO upserts
+# ---------------------------------------------------------------------------
+# A KEPCO payload (one item per charger) is written in a constant number of
+# statements: rows are passed as parallel arrays and expanded server-side with
+# unnest(). Items are deduplicated per key first because ON CONFLICT DO UPDATE
+# cannot touch the same row twice in one statement. Both the API columns
+# (cp_id/cp_stat/charge_tp) and the batch-script columns
+# (charger_code/cp_stat_raw/charger_type) are filled so every reader agrees.
+
+BULK_UPSERT_STATIONS_SQL = """
+    INSERT INTO stations (station_code, cs_id, name, address, location, raw_data, last_synced_at, created_at, updated_at)
+    SELECT
+        u.cs_id, u.cs_id, u.name, u.address,
+        CASE WHEN u.lon IS NOT NULL AND u.lat IS NOT NULL
+             THEN ST_SetSRID(ST_MakePoint(u.lon, u.lat), 4326) END,
+        u.raw_data::json, CAST(:synced_at AS timestamptz), now(), now()
+    FROM unnest(
+        CAST(:cs_ids AS text[]), CAST(:names AS text[]), CAST(:addresses AS text[]),
+        CAST(:lats AS float8[]), CAST(:lons AS float8[]), CAST(:raw_data AS text[])
+    ) AS u(cs_id, name, address, lat, lon, raw_data)
+    ON CONFLICT (cs_id) DO UPDATE SET
+        station_code = COALESCE(stations.station_code, EXCLUDED.station_code),
+        name = COALESCE(EXCLUDED.name, stations.name),
+        address = COALESCE(EXCLUDED.address, stations.address),
+        location = COALESCE(EXCLUDED.location, stations.location),
+        raw_data = COALESCE(EXCLUDED.raw_data, stations.raw_data),
+        last_synced_at = EXCLUDED.last_synced_at,
+        updated_at = now()
+    RETURNING id, cs_id
+"""
+
+# Rows written by the batch scripts before they used the bulk upsert have
+# charger_code = KEPCO cpId but no cp_id; adopt them so ON CONFLICT (cp_id)
+# updates them instead of violating (station_id, charger_code).
+ADOPT_LEGACY_CHARGERS_SQL = """
+    UPDATE chargers SET cp_id = charger_code
+    WHERE cp_id IS NULL
+      AND charger_code = ANY(CAST(:cp_ids AS text[]))
+      AND NOT EXISTS (SELECT 1 FROM chargers c WHERE c.cp_id = chargers.charger_code)
+"""
+
+BULK_UPSERT_CHARGERS_SQL = """
+    INSERT INTO chargers (
+        station_id, charger_code, external_charger_id, cp_id, cp_nm, cp_stat, cp_stat_raw,
+        charge_tp, charger_type, cp_tp, cs_id, stat_update_datetime, kepco_stat_update_datetime,
+        created_at, updated_at
+    )
+    SELECT
+        s.id, u.cp_id, u.cp_id, u.cp_id, u.cp_nm, u.cp_stat, u.cp_stat,
+        u.charge_tp, u.charge_tp, u.cp_tp, u.cs_id, CAST(:fetched_at AS timestamptz), u.kepco_ts,
+        now(), now()
+    FROM unnest(
+        CAST(:cp_ids AS text[]), CAST(:cs_ids AS text[]), CAST(:cp_nms AS text[]),
+        CAST(:cp_stats AS text[]), CAST(:charge_tps AS text[]), CAST(:cp_tps AS text[]),
+        CAST(:kepco_ts AS timestamptz[])
+    ) AS u(cp_id, cs_id, cp_nm, cp_stat, charge_tp, cp_tp, kepco_ts)
+    JOIN stations s ON s.cs_id = u.cs_id
+    ON CONFLICT (cp_id) DO UPDATE SET
+        station_id = EXCLUDED.station_id,
+        cs_id = EXCLUDED.cs_id,
+        cp_nm = COALESCE(EXCLUDED.cp_nm, chargers.cp_nm),
+        cp_stat = EXCLUDED.cp_stat,
+        cp_stat_raw = EXCLUDED.cp_stat_raw,
+        charge_tp = COALESCE(EXCLUDED.charge_tp, chargers.charge_tp),
+        charger_type = COALESCE(EXCLUDED.charger_type, chargers.charger_type),
+        cp_tp = COALESCE(EXCLUDED.cp_tp, chargers.cp_tp),
+        stat_update_datetime = EXCLUDED.stat_update_datetime,
+        kepco_stat_update_datetime = EXCLUDED.kepco_stat_update_datetime,
+        updated_at = now()
+    RETURNING id
+"""
+
+# array parameters are CAST in the SQL itself (also run by the sync batch scripts)
+BULK_UPSERT_STATIONS = register("stations.bulk_upsert", BULK_UPSERT_STATIONS_SQL)
+ADOPT_LEGACY_CHARGERS = register("chargers.adopt_legacy", ADOPT_LEGACY_CHARGERS_SQL)
+BULK_UPSERT_CHARGERS = register("chargers.bulk_upsert", BULK_UPSERT_CHARGERS_SQL)
+
+
+# ---------------------------------------------------------------------------
+# Charger status refresh
+# ---------------------------------------------------------------------------
+# Stale chargers with the station data needed to refresh them, keyset-paginated
+STALE_CHARGERS_SQL = """
+    SELECT
+        c.id, c.cp_id, s.cs_id, s.address,
+        ST_Y(s.location) AS lat, ST_X(s.location) AS lon,
+        c.stat_update_datetime
+    FROM chargers c
+    JOIN stations s ON s.id = c.station_id
+    WHERE (c.stat_update_datetime IS NULL OR c.stat_update_datetime < :threshold)
+      AND c.id > :after_id
+    ORDER BY c.id
+    LIMIT :limit
+"""
+
+STALE_CHARGERS = register(
+    "chargers.stale",
+    STALE_CHARGERS_SQL,
+    types={"threshold": DateTime(timezone=True), "after_id": Integer, "limit": Integer},
+)
+
+
+# ---------------------------------------------------------------------------
+# Subsidies
+# ---------------------------------------------------------------------------
+SUBSIDIES_BY_MODEL_SQL = (
+    "SELECT model_name, subsidy_national_10k_won, subsidy_local_10k_won, subsidy_total_10k_won, sale_price "
+    "FROM subsidies "
+    "WHERE manufacturer = :manufacturer AND model_group = :model_group "
+    "ORDER BY model_name LIMIT 100"
+)
+
+# /api/v1/db-test: unordered, 50 rows
+SUBSIDIES_DB_TEST_SQL = (
+    "SELECT model_name, subsidy_national_10k_won, subsidy_local_10k_won, subsidy_total_10k_won, sale_price "
+    "FROM subsidies "
+    "WHERE manufacturer = :manufacturer AND model_group = :model_group LIMIT 50"
+)
+
+SUBSIDIES_BY_MODEL = register(
+    "subsidies.by_model",
+    SUBSIDIES_BY_MODEL_SQL,
+    types={"manufacturer": String, "model_group": String},
+    warm_params={"manufacturer": "", "model_group": ""},
+)
+SUBSIDIES_DB_TEST = register(
+    "subsidies.db_test",
+    SUBSIDIES_DB_TEST_SQL,
+    types={"manufacturer": String, "model_group": String},
+)
+
+PING = register("health.ping", "SELECT 1")
@@ -0,0 +1,135 @@
+"""Shared outbound HTTP clients
+
+One long-lived httpx.AsyncClient per upstream host (KEPCO, Nominatim) is
+created in the app lifespan so connections are pooled and kept alive
+instead of paying a TCP+TLS handshake per request. Each upstream gets its
+own connection limits and timeouts from Settings, so a slow KEPCO cannot
+starve geocoding and we stay within Nominatim's usage policy.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEPCO = "kepco"
+NOMINATIM = "nominatim"
+
+http_clients: Dict[str, httpx.AsyncClient] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _client_options(name: str) -> Dict[str, Any]:
+    if name == KEPCO:
+        read_timeout = settings.EXTERNAL_STATION_API_TIMEOUT_SECONDS
+        max_connections = settings.EXTERNAL_STATION_API_MAX_CONNECTIONS
+        max_keepalive = settings.EXTERNAL_STATION_API_MAX_KEEPALIVE_CONNECTIONS
+    elif name == NOMINATIM:
+        read_timeout = settings.NOMINATIM_TIMEOUT_SECONDS
+        max_connections = settings.NOMINATIM_MAX_CONNECTIONS
+        max_keepalive = settings.NOMINATIM_MAX_CONNECTIONS
+    else:
+        read_timeout = settings.HTTP_CLIENT_DEFAULT_TIMEOUT_SECONDS
+        max_connections = settings.HTTP_CLIENT_DEFAULT_MAX_CONNECTIONS
+        max_keepalive = settings.HTTP_CLIENT_DEFAULT_MAX_CONNECTIONS
+
+    return {
+        "timeout": httpx.Timeout(
+            read_timeout,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+            pool=settings.HTTP_CLIENT_POOL_TIMEOUT_SECONDS,
+        ),
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+
+def _create_client(name: str) -> httpx.AsyncClient:
+    stats = _stats.setdefault(name, {"requests": 0, "responses": 0, "errors": 0})
+
+    async def on_request(request: httpx.Request):
+        stats["requests"] += 1
+
+    async def on_response(response: httpx.Response):
+        stats["responses"] += 1
+        if response.status_code >= 400:
+            stats["errors"] += 1
+
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("HTTP_CLIENT_HTTP2 set but the 'h2' package is missing - using HTTP/1.1 for %s", name)
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        event_hooks={"request": [on_request], "response": [on_response]},
+        **_client_options(name),
+    )
+
+
+async def init_http_clients():
+    """Create the per-upstream clients (called from the app lifespan)"""
+    for name in (KEPCO, NOMINATIM):
+        if name not in http_clients:
+            http_clients[name] = _create_client(name)
+    logger.info("HTTP clients ready: %s (http2=%s)", ", ".join(http_clients), settings.HTTP_CLIENT_HTTP2)
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Return the shared client for an upstream.
+
+    Created on first use when the lifespan did not run (scripts, tests).
+    """
+    client = http_clients.get(name)
+    if client is None or client.is_closed:
+        client = http_clients[name] = _create_client(name)
+    return client
+
+
+async def close_http_clients():
+    for client in list(http_clients.values()):
+        await client.aclose()
+    http_clients.clear()
+
+
+def _pool_stats(client: httpx.AsyncClient) -> Optional[Dict[str, int]]:
+    """Connection counts from the httpcore pool (best-effort, internal API)"""
+    try:
+        connections = list(client._transport._pool.connections)
+    except Exception:
+        return None
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for c in connections if c.is_idle()),
+        "active": sum(1 for c in connections if not c.is_idle() and not c.is_closed()),
+    }
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """Per-upstream request counters and pool usage of this worker"""
+    result: Dict[str, Any] = {}
+    for name, client in http_clients.items():
+        limits = _client_options(name)["limits"]
+        result[name] = {
+            **_stats.get(name, {}),
+            "pool": _pool_stats(client),
+            "max_connections": limits.max_connections,
+            "max_keepalive_connections": limits.max_keepalive_connections,
+            "closed": client.is_closed,
+        }
+    return result
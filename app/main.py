@@ -1,48 +1,147 @@
+import asyncio
 import contextlib
+import contextvars
+import logging
 import time
 from datetime import datetime, timezone, timedelta
 import os
 
-from fastapi import FastAPI, Depends, HTTPException, status, APIRouter, Response, Header, Body, Query, Path
+from fastapi import FastAPI, Depends, HTTPException, status, APIRouter, Request, Response, Header, Body, Query, Path
 from typing import Optional
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from sqlalchemy.exc import ProgrammingError
 from redis.asyncio import Redis
-import httpx
 import math
 import json
 import re
 
 # 프로젝트 내부 모듈 임포트
 from app.core.config import settings
-from app.db.database import get_async_session
+from app.core.logging_config import setup_logging, logging_stats
+from app.db.database import (
+    get_async_session,
+    get_read_session,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    dispose_engines,
+    pool_usage as db_pool_usage,
+)
+from app.db.queries import (
+    FALLBACK_NAME_SEARCH,
+    FALLBACK_NAME_SEARCH_AFTER,
+    PING,
+    STATION_CHARGERS,
+    STATION_DETAIL,
+    STATION_DETAIL_FALLBACK,
+    SUBSIDIES_BY_MODEL,
+    SUBSIDIES_DB_TEST,
+)
+from app.http_client import init_http_clients, close_http_clients, get_http_client_stats
 from app.redis_client import (
     init_redis_pool,
     close_redis_pool,
     get_redis_client,
     set_cache,
-    get_cache
+    get_cache,
+    pool_usage as redis_pool_usage
 )
 from app.api.v1.api import api_router
+from app.metrics import metrics, HTTP_REQUEST_SECONDS, SEARCH_RESULTS
+from app.tracing import trace_stage, start_trace, finish_trace, detach_trace, annotate
+from app.services.station_tile_cache import station_tile_cache
+from app.services.geocoding_service import geocoding_service
+from app.services.reverse_geocoder import reverse_geocoder
+from app.services.geocode_cache import geocode_cache
+from app.services.station_index import station_index
+from app.services.distance_engine import StationBatch
+from app.services.kepco_fetch import kepco_fetcher, KepcoAPIError
+from app.services.single_flight import single_flight
+from app.services.search_cursor import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    search_fingerprint,
+    station_key,
+)
+from app.services.swr import swr, parse_cache_timestamp, STALE, EXPIRED
+from app.services.l1_cache import l1_cache
+from app.services.write_behind import write_behind, persist_kepco_items
+from app.services.charger_refresher import charger_refresher
+from app.repository.station_repository import (
+    StationRepository,
+    StationAvailabilityRepository,
+    parse_kepco_timestamp,
+)
 from app.api.deps import frontend_api_key_required
 
+# non-blocking structured logging (queue + listener thread, per-message rate limit)
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # --- 환경 변수로 관리자 모드 판단 ---
 IS_ADMIN = os.getenv("ADMIN_MODE", "false").lower() == "true"
 
 # --- Lifespan Context Manager 정의 ---
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Application startup: Initializing resources...")
+    logger.info("Application startup: Initializing resources...")
     await init_redis_pool()
+    # L1 cache coherence: drop keys written/deleted by other workers
+    l1_listener = None
+    redis_for_l1 = await get_redis_client()
+    if settings.L1_CACHE_ENABLED and redis_for_l1 is not None:
+        l1_listener = asyncio.create_task(l1_cache.run_invalidation_listener(redis_for_l1))
+    # shared keep-alive HTTP clients for KEPCO / Nominatim
+    await init_http_clients()
+    # load the offline reverse geocoder dataset once per worker
+    if not reverse_geocoder.load():
+        logger.warning("Offline reverse geocoder unavailable - Nominatim fallback only")
+    # in-memory station index (static data) + periodic incremental refresh
+    index_refresher = None
+    if settings.STATION_INDEX_ENABLED:
+        try:
+            async with AsyncReadSessionLocal() as db:
+                loaded = await station_index.load(db)
+            logger.info("Station index loaded: %s stations", loaded)
+        except Exception as e:
+            logger.warning("Station index load failed (tile cache / DB only until next refresh): %s", e)
+        index_refresher = asyncio.create_task(station_index.run_refresher(AsyncReadSessionLocal))
+    # write-behind persistence of KEPCO results (drained on shutdown)
+    if settings.WRITE_BEHIND_ENABLED:
+        write_behind.start(AsyncSessionLocal)
+    # refresh stale charger statuses ahead of the detail endpoint's 30-minute rule
+    charger_refresh_task = None
+    if settings.CHARGER_REFRESH_ENABLED:
+        charger_refresh_task = asyncio.create_task(charger_refresher.run_forever(AsyncSessionLocal))
+    # mirror in-process counters to Redis (metrics:*) in batches
+    metrics_flusher = asyncio.create_task(metrics.run_flusher())
     # [TODO] DB 마이그레이션 확인 및 초기 데이터 로드
     yield
-    print("Application shutdown: Cleaning up resources...")
+    logger.info("Application shutdown: Cleaning up resources...")
+    metrics_flusher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await metrics_flusher
+    if charger_refresh_task is not None:
+        charger_refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await charger_refresh_task
+    await write_behind.stop()
+    if l1_listener is not None:
+        l1_listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await l1_listener
+    if index_refresher is not None:
+        index_refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await index_refresher
+    await close_http_clients()
     await close_redis_pool()
+    await dispose_engines()
 
 # --- HTTP Basic 인증 (관리자 전용) ---
 security = HTTPBasic()
@@ -58,14 +157,6 @@ def admin_required(credentials: HTTPBasicCredentials = Depends(security)):
 # frontend API key dependency moved to `app.api.deps` to avoid circular imports
 
 
-def ensure_read_only_sql(sql: str):
-    """Basic guard to ensure the provided SQL starts with SELECT to avoid write queries.
-
-    This is a defensive, best-effort check and should be combined with parameterized queries and DB user permissions.
-    """
-    if not sql.strip().lower().startswith("select"):
-        raise HTTPException(status_code=400, detail="Only read-only SELECT queries are allowed")
-
 # --- FastAPI Application 생성 ---
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -93,6 +184,42 @@ if allowed_origins:
         allow_headers=["*"],
     )
 
+# --- 요청 지연 시간 메트릭 (app/metrics.py) + Server-Timing (app/tracing.py) ---
+# Latency is labelled with the route template (not the raw path) to bound
+# cardinality. Stages timed with trace_stage() inside the handler end up in
+# the Server-Timing header of the response.
+@app.middleware("http")
+async def _record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    trace = start_trace()
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        if trace is not None:
+            finish_trace(trace, response, request.method, request.url.path)
+            # let the allowed frontends read Server-Timing (Resource Timing API)
+            origin = request.headers.get("origin")
+            if origin and origin in allowed_origins:
+                response.headers["Timing-Allow-Origin"] = origin
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            route=getattr(route, "path", "unmatched"),
+            method=request.method,
+            status=str(status_code),
+        )
+
+# connection pool usage, read at scrape time
+metrics.gauge("eon_db_pool_connections", "SQLAlchemy pool connections by state", ("engine", "state"), db_pool_usage)
+metrics.gauge("eon_redis_pool_connections", "Redis pool connections by state", ("client", "state"), redis_pool_usage)
+metrics.gauge(
+    "eon_write_behind_queue_depth", "Pending KEPCO write-behind jobs", (),
+    lambda: {(): write_behind.stats()["depth"]},
+)
+
 # --- 관리자용 docs & redoc 엔드포인트 ---
 if IS_ADMIN:
     @app.get("/docs", include_in_schema=False)
@@ -121,7 +248,7 @@ def head_root():
 
 @app.get("/health", tags=["Infrastructure"], summary="Health check (DB & Redis)")
 @app.head("/health")    
-async def health_check(db: AsyncSession = Depends(get_async_session), redis_client: Redis = Depends(get_redis_client)):
+async def health_check(db: AsyncSession = Depends(get_read_session), redis_client: Redis = Depends(get_redis_client)):
     """Simple health check endpoint. Returns 200 if at least one of DB/Redis responds, 503 if both fail.
 
     Response body example:
@@ -136,7 +263,7 @@ async def health_check(db: AsyncSession = Depends(get_async_session), redis_clie
 
     # DB check
     try:
-        await db.execute(text("SELECT 1"))
+        await PING.execute(db)
         db_ok = True
     except Exception:
         db_ok = False
@@ -159,8 +286,16 @@ async def health_check(db: AsyncSession = Depends(get_async_session), redis_clie
     return JSONResponse(status_code=code, content={"status": status_str, "db": db_ok, "redis": redis_ok})
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus text exposition of this worker's metrics"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/subsidy", tags=["Subsidy"], summary="Lookup subsidies by manufacturer and model_group")
-async def subsidy_lookup(manufacturer: str, model_group: str, db: AsyncSession = Depends(get_async_session), _ok: bool = Depends(frontend_api_key_required)):
+async def subsidy_lookup(manufacturer: str, model_group: str, db: AsyncSession = Depends(get_read_session), _ok: bool = Depends(frontend_api_key_required)):
     """Return subsidy rows for given manufacturer and model_group.
 
     Response format (list of objects):
@@ -175,14 +310,7 @@ async def subsidy_lookup(manufacturer: str, model_group: str, db: AsyncSession =
     ]
     """
     try:
-        query_sql = (
-            "SELECT model_name, subsidy_national_10k_won, subsidy_local_10k_won, subsidy_total_10k_won, sale_price "
-            "FROM subsidies "
-            "WHERE manufacturer = :manufacturer AND model_group = :model_group "
-            "ORDER BY model_name LIMIT 100"
-        )
-        ensure_read_only_sql(query_sql)
-        result = await db.execute(text(query_sql), {"manufacturer": manufacturer, "model_group": model_group})
+        result = await SUBSIDIES_BY_MODEL.execute(db, {"manufacturer": manufacturer, "model_group": model_group})
         rows = result.fetchall()
 
         mapped = []
@@ -207,7 +335,7 @@ async def subsidy_lookup(manufacturer: str, model_group: str, db: AsyncSession =
 
 
 @app.get("/subsidy/by", tags=["Subsidy"], summary="Lookup subsidies (camelCase) by manufacturer and modelGroup")
-async def subsidy_lookup_camel(manufacturer: str, modelGroup: str, db: AsyncSession = Depends(get_async_session), _ok: bool = Depends(frontend_api_key_required)):
+async def subsidy_lookup_camel(manufacturer: str, modelGroup: str, db: AsyncSession = Depends(get_read_session), _ok: bool = Depends(frontend_api_key_required)):
     """Compatibility wrapper: accept camelCase `modelGroup` from frontend and return subsidy rows.
 
     Header: x-api-key: <key>
@@ -216,14 +344,7 @@ async def subsidy_lookup_camel(manufacturer: str, modelGroup: str, db: AsyncSess
     # reuse same logic as /subsidy but accept modelGroup camelCase
     model_group = modelGroup
     try:
-        query_sql = (
-            "SELECT model_name, subsidy_national_10k_won, subsidy_local_10k_won, subsidy_total_10k_won, sale_price "
-            "FROM subsidies "
-            "WHERE manufacturer = :manufacturer AND model_group = :model_group "
-            "ORDER BY model_name LIMIT 100"
-        )
-        ensure_read_only_sql(query_sql)
-        result = await db.execute(text(query_sql), {"manufacturer": manufacturer, "model_group": model_group})
+        result = await SUBSIDIES_BY_MODEL.execute(db, {"manufacturer": manufacturer, "model_group": model_group})
         rows = result.fetchall()
 
         mapped = []
@@ -254,11 +375,11 @@ async def search_ev_stations_new_test(
     page: int = Query(1, description="페이지 번호", ge=1),
     limit: int = Query(20, description="페이지당 결과 수", ge=1, le=100),
     api_key: str = Depends(frontend_api_key_required),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     redis_client: Redis = Depends(get_redis_client)
 ):
     """🚨 NEW CODE TEST ENDPOINT"""
-    print(f"🔥🔥🔥 TEST ENDPOINT - NEW CODE CONFIRMED RUNNING 🔥🔥🔥")
+    logger.debug("stations-test-new called")
     return {
         "message": "NEW CODE IS RUNNING!",
     "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -270,10 +391,11 @@ async def search_ev_stations_requirement_compliant(
     lat: str = Query(..., description="사용자 위도 (string 타입)", regex=r"^-?\d+\.?\d*$"),
     lon: str = Query(..., description="사용자 경도 (string 타입)", regex=r"^-?\d+\.?\d*$"),
     radius: int = Query(..., description="반경(m) - 5000,10000,15000 기준", ge=100, le=15000),
-    page: int = Query(1, description="페이지 번호", ge=1),
+    page: int = Query(1, description="페이지 번호 (cursor가 없을 때)", ge=1),
     limit: int = Query(20, description="페이지당 결과 수", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (page 대신 사용)"),
     api_key: str = Depends(frontend_api_key_required),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     redis_client: Redis = Depends(get_redis_client)
 ):
     """
@@ -284,45 +406,31 @@ async def search_ev_stations_requirement_compliant(
     3. 반경 기준값(1000/3000/5000/7000/10000) 처리
     4. 정적/동적 데이터 분리 저장
     5. 응답: 충전소ID, 충전기주소(addr), 충전소명칭, 위도, 경도 (모두 string)
+    6. 페이지: `next_cursor`를 다음 요청의 `cursor`로 전달 (keyset, 마지막 페이지는 null).
+       `page`는 기존 클라이언트를 위해 계속 지원
     """
-    print(f"✅ 요구사항 준수 충전소 검색 시작")
-    print(f"✅ 입력: lat={lat}, lon={lon}, radius={radius}")
+    logger.debug("Station search: lat=%s lon=%s radius=%s", lat, lon, radius)
     
     try:
         # === 1단계: 좌표 → 주소 변환 ===
         lat_float = float(lat)
         lon_float = float(lon)
+
+        # keyset pagination (app/services/search_cursor.py): the cursor wins over page
+        fingerprint = search_fingerprint(lat, lon, radius)
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, fingerprint)
+            except InvalidCursor as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
         
-        # Nominatim을 통한 역지오코딩
-        async with httpx.AsyncClient() as client:
-            nominatim_response = await client.get(
-                "https://nominatim.openstreetmap.org/reverse",
-                params={
-                    "lat": lat_float,
-                    "lon": lon_float,
-                    "format": "json",
-                    "accept-language": "ko",
-                    "addressdetails": 1
-                },
-                headers={"User-Agent": "Codyssey-EV-App/1.0"},
-                timeout=10.0
-            )
-            
-            if nominatim_response.status_code == 200:
-                nominatim_data = nominatim_response.json()
-                address_components = nominatim_data.get("address", {})
-                
-                # 시/군/구/동 추출
-                city = address_components.get("city") or address_components.get("town") or ""
-                district = address_components.get("borough") or address_components.get("suburb") or ""
-                addr = f"{city} {district}".strip()
-                
-                if not addr:
-                    addr = "서울특별시"  # 기본값
-            else:
-                addr = "서울특별시"  # 기본값
+        # 오프라인 역지오코딩 (로컬 행정구역 데이터, STRtree). Nominatim is only
+        # called as a fallback when the local dataset has no answer.
+        with trace_stage("search", "geocode"):
+            addr = await geocoding_service.resolve_search_addr(lat_float, lon_float)
         
-        print(f"✅ 매핑된 주소: {addr}")
+        logger.debug("Station search addr: %s", addr)
         
         # === 2단계: 반경 기준값 정규화 ===
         # Use "이하" (less than or equal) mapping: map requested radius to
@@ -340,313 +448,248 @@ async def search_ev_stations_requirement_compliant(
             requested_radius = radius
 
         actual_radius = next((r for r in radius_standards if requested_radius <= r), radius_standards[-1])
-        print(f"✅ 반경 정규화: requested={requested_radius} -> normalized={actual_radius} (buckets={radius_standards})")
+        logger.debug("Radius normalized: requested=%s -> normalized=%s", requested_radius, actual_radius)
         
-        # === 3단계: Cache 조회 ===
-        # Use rounded coordinates in the cache key to avoid cache collisions caused
-        # by tiny floating differences. We keep raw lat/lon (lat_float/lon_float)
-        # for distance calculations, but round the coordinates used in cache keys.
-        # Per product decision, use 2 decimal places (~1.11km) for cache keys.
-        coord_decimals = getattr(settings, "CACHE_COORD_ROUND_DECIMALS", 2)
-        lat_round = round(lat_float, coord_decimals)
-        lon_round = round(lon_float, coord_decimals)
-        # Use coordinate-first key (avoid addr text differences)
-        # include pagination in cache key so different pages/limits are cached separately
-        cache_key = f"stations:lat{lat_round}:lon{lon_round}:r{actual_radius}:p{page}:l{limit}"
-        # persistent cache key (longer TTL) to keep static station positions for
-        # map-marker UX when users return to a previously-viewed region.
-        persistent_key = f"stations_persistent:lat{lat_round}:lon{lon_round}:r{actual_radius}:p{page}:l{limit}"
-
-        try:
-            cached_data = await redis_client.get(cache_key)
-            if cached_data:
-                print(f"✅ Cache Hit: {cache_key}")
-                cached_result = json.loads(cached_data)
-                
-                # 거리 필터링 후 반환
-                filtered_stations = []
-                for station in cached_result.get("stations", []):
-                    # cached station contains only static fields (no distance_m)
-                    dist = calculate_distance_haversine(
-                        lat_float, lon_float,
-                        float(station["lat"]), float(station["lon"])
-                    )
-                    if dist <= radius:
-                        # avoid mutating cached object
+        offset = (page - 1) * limit
+
+        # === 3단계: In-memory station index 조회 ===
+        # Static station data of the whole table lives in an STRtree per
+        # worker (app/services/station_index.py): the radius search needs no
+        # DB/Redis round-trip, only the charger counts of the page are fetched.
+        # When ready the index is the authoritative tier; the tile cache below
+        # only answers when the index is disabled, not loaded yet, failed, or
+        # found nothing (stations inserted since the last index refresh). Both
+        # tiers report the same fields: the stations within the radius, and
+        # `stale` + `cache_age_seconds` once their data is older than
+        # STATION_TILE_SOFT_TTL_SECONDS (index: last DB sync; tiles: last rebuild).
+        if station_index.ready:
+            try:
+                with trace_stage("search", "memory_index"):
+                    index_hits = station_index.within_radius(lat_float, lon_float, radius)
+                if index_hits:
+                    index_hits.sort(key=_index_hit_key)
+                    hits_page, next_cursor = paginate(index_hits, limit, after, offset, fingerprint, key=_index_hit_key)
+                    page_stations = []
+                    for station, dist in hits_page:
                         station_out = dict(station)
                         station_out["distance_m"] = str(int(dist))
-                        # fetch charger counts per-station (do not store counts in the cache)
-                        try:
-                            counts_q = "SELECT COUNT(*) AS total_ch, COALESCE(SUM( (cp_stat::text = '1')::int ), 0) AS avail_ch FROM chargers WHERE cs_id = :cs_id"
-                            cnt_res = await db.execute(text(counts_q), {"cs_id": station_out.get("station_id")})
-                            cnt_row = cnt_res.fetchone()
-                            if cnt_row:
-                                total_ch = int(cnt_row._mapping.get("total_ch") or 0)
-                                avail_ch = int(cnt_row._mapping.get("avail_ch") or 0)
-                            else:
-                                total_ch = 0
-                                avail_ch = 0
-                        except Exception:
-                            total_ch = 0
-                            avail_ch = 0
-
-                        station_out["total_chargers"] = total_ch
-                        station_out["available_chargers"] = avail_ch
-                        filtered_stations.append(station_out)
-                
-                filtered_stations.sort(key=lambda x: int(x["distance_m"]))
-                # Metrics: increment short-lived cache hit counter (best-effort)
-                try:
-                    if redis_client:
-                        await redis_client.incr("metrics:stations:cache_hits:short")
-                except Exception as _merr:
-                    print(f"⚠️ Metric increment (short cache) failed: {_merr}")
-
-                return {
-                    "source": "cache",
-                    "addr": addr,
-                    "radius_normalized": actual_radius,
-                    "stations": filtered_stations
-                }
-            # Short-lived cache miss -> try persistent static cache for fast map markers
+                        page_stations.append(station_out)
+
+                    counts_map = await _fetch_charger_counts(db, [s["station_id"] for s in page_stations])
+                    for station_out in page_stations:
+                        counts = counts_map.get(str(station_out.get("station_id")))
+                        station_out["total_chargers"] = counts["total"] if counts else None
+                        station_out["available_chargers"] = counts["avail"] if counts else None
+
+                    logger.info("Station index: %d stations within radius (page %d)", len(index_hits), page)
+                    SEARCH_RESULTS.inc(source="memory")
+                    annotate(source="memory")
+
+                    response = {
+                        "source": "memory",
+                        "addr": addr,
+                        "radius_normalized": actual_radius,
+                        "stations": page_stations,
+                        "next_cursor": next_cursor
+                    }
+                    index_age = station_index.sync_age()
+                    soft_ttl = settings.STATION_TILE_SOFT_TTL_SECONDS
+                    if soft_ttl > 0 and index_age is not None and index_age > soft_ttl:
+                        # the periodic refresh has been failing: same marker as stale tiles
+                        response["stale"] = True
+                        response["cache_age_seconds"] = int(index_age)
+                    return response
+            except Exception as index_error:
+                logger.warning("Station index lookup failed, using tile cache: %s", index_error)
+
+        # === 3-1단계: Tile cache 조회 ===
+        # Static station data is cached per fixed grid tile (see
+        # app/services/station_tile_cache.py) instead of per coordinate, so
+        # every search touching a tile shares the same entry regardless of GPS
+        # jitter, radius bucket or page. Missing tiles are rebuilt from the DB
+        # with one bounding-box query. Without Redis we go straight to the
+        # paginated spatial query below.
+        tile_checked = False
+        if redis_client:
             try:
-                persistent_raw = await redis_client.get(persistent_key)
-                if persistent_raw:
-                    print(f"✅ Persistent Cache Hit: {persistent_key}")
-                    persistent_result = json.loads(persistent_raw)
-                    # Return static markers quickly. We compute distances but do
-                    # NOT fetch per-station charger counts here to keep the
-                    # response fast; frontend should request details on click.
-                    filtered_stations = []
-                    station_ids = [s.get("station_id") for s in persistent_result.get("stations", []) if s.get("station_id")]
-
-                    # Batch-fetch charger counts for all stations to avoid N queries.
-                    counts_map = {}
-                    try:
-                        if station_ids:
-                            counts_q = """
-                                SELECT cs_id, COUNT(*) AS total_ch, COALESCE(SUM( (cp_stat::text = '1')::int ), 0) AS avail_ch
-                                FROM chargers
-                                WHERE cs_id = ANY(:cs_ids)
-                                GROUP BY cs_id
-                            """
-                            res = await db.execute(text(counts_q), {"cs_ids": station_ids})
-                            rows = res.fetchall()
-                            for r in rows:
-                                m = r._mapping
-                                counts_map[str(m.get("cs_id"))] = {
-                                    "total": int(m.get("total_ch") or 0),
-                                    "avail": int(m.get("avail_ch") or 0)
-                                }
-                    except Exception as _batch_err:
-                        print(f"⚠️ Batch counts query failed (ignored): {_batch_err}")
-
-                    for station in persistent_result.get("stations", []):
-                        try:
-                            dist = calculate_distance_haversine(
-                                lat_float, lon_float,
-                                float(station["lat"]), float(station["lon"])
-                            )
-                        except Exception:
-                            dist = 999999
-
-                        if dist <= radius:
-                            station_out = dict(station)
-                            station_out["distance_m"] = str(int(dist))
-                            # Attach batch counts if available; otherwise None
-                            sid = str(station_out.get("station_id")) if station_out.get("station_id") is not None else None
-                            if sid and sid in counts_map:
-                                station_out["total_chargers"] = counts_map[sid]["total"]
-                                station_out["available_chargers"] = counts_map[sid]["avail"]
-                            else:
-                                station_out["total_chargers"] = None
-                                station_out["available_chargers"] = None
-                            filtered_stations.append(station_out)
-
-                    filtered_stations.sort(key=lambda x: int(x["distance_m"]))
-                    # Metrics: increment persistent cache hit counter (best-effort)
-                    try:
-                        if redis_client:
-                            await redis_client.incr("metrics:stations:cache_hits:persistent")
-                    except Exception as _merr:
-                        print(f"⚠️ Metric increment (persistent cache) failed: {_merr}")
+                with trace_stage("search", "tile_cache"):
+                    tile_stations, filled_tiles, stale_age = await station_tile_cache.get_stations(
+                        redis_client, db, lat_float, lon_float, radius
+                    )
+                source = "cache" if filled_tiles == 0 else "database"
 
-                    return {
-                        "source": "persistent_cache",
+                # one vectorized pass: distances, radius mask and nearest-first order
+                filtered_stations = []
+                for station, dist in StationBatch(tile_stations).hits(lat_float, lon_float, radius):
+                    # avoid mutating cached object
+                    station_out = dict(station)
+                    # unrounded until the page is cut (cursor key)
+                    station_out["distance_m"] = float(dist)
+                    filtered_stations.append(station_out)
+
+                # already nearest-first; dedupe keeps the first (nearest) entry
+                filtered_stations = _dedupe_stations_by_id(filtered_stations)
+                logger.info(
+                    "Tile cache: %d stations within radius (page %d) filled_from_db=%d source=%s stale_age=%s",
+                    len(filtered_stations), page, filled_tiles, source, stale_age,
+                )
+                if filtered_stations:
+                    filtered_stations.sort(key=station_key)
+                    page_stations, next_cursor = paginate(filtered_stations, limit, after, offset, fingerprint)
+
+                    # charger counts are dynamic: fetch them for this page only (one query)
+                    counts_map = await _fetch_charger_counts(db, [s["station_id"] for s in page_stations])
+                    for station_out in page_stations:
+                        station_out["distance_m"] = str(int(station_out["distance_m"]))
+                        counts = counts_map.get(str(station_out.get("station_id")))
+                        station_out["total_chargers"] = counts["total"] if counts else None
+                        station_out["available_chargers"] = counts["avail"] if counts else None
+
+                    # Metrics: tile cache hit / DB fill counter
+                    SEARCH_RESULTS.inc(source="tile" if source == "cache" else "db")
+                    annotate(source=source)
+
+                    response = {
+                        "source": source,
                         "addr": addr,
                         "radius_normalized": actual_radius,
-                        "stations": filtered_stations
+                        "stations": page_stations,
+                        "next_cursor": next_cursor
                     }
-            except Exception as _p_err:
-                print(f"⚠️ Persistent cache read error (ignored): {_p_err}")
-        except Exception as cache_error:
-            print(f"⚠️ Cache 오류: {cache_error}")
-        
-    # === 4단계: DB 조회 (정적 데이터) ===
-        print(f"✅ DB 조회 시작...")
-        try:
-            # 정적 데이터 조회 (충전기 상태코드 제외)
-            # NOTE: some deployments may not have KEPCO-specific columns (cs_nm/addr).
-            # To remain resilient against schema drift we select stable columns
-            # and map them to the expected keys in Python.
-            # Note: production DB uses PostGIS `location` (geometry/point) and columns `name`/`address`.
-            # Use ST_Y(location) for latitude and ST_X(location) for longitude. Keep COALESCE for address/name.
-            # Try a spatial query (PostGIS). If the DB does not support PostGIS or
-            # the `location` column is missing, fall back to a name/address LIKE query.
-            spatial_query = """
-                SELECT DISTINCT
-                    cs_id as station_id,
-                    COALESCE(address, '') as addr,
-                    COALESCE(name, '') as station_name,
-                    ST_Y(location)::text as lat,
-                    ST_X(location)::text as lon,
-                    -- compute distance in meters on DB side for accurate ordering/filtering
-                    ROUND(ST_Distance(location::geography, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography))::int as distance_m,
-                    -- charger counts (total and available). We treat cp_stat values '0' and '1' as available.
-                    (SELECT COUNT(*) FROM chargers WHERE cs_id = stations.cs_id) AS total_chargers,
-                    (SELECT COALESCE(SUM( (cp_stat::text = '1')::int ), 0) FROM chargers WHERE cs_id = stations.cs_id) AS available_chargers
-                FROM stations
-                WHERE location IS NOT NULL
-                  AND ST_DWithin(
-                      location::geography,
-                      ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
-                      :radius_m
-                  )
-                ORDER BY distance_m
-                LIMIT :limit OFFSET :offset
-            """
-
-            # Fallback query when spatial support is unavailable
-            fallback_name_query = """
-                SELECT DISTINCT
-                    cs_id as station_id,
-                    COALESCE(address, '') as addr,
-                    COALESCE(name, '') as station_name,
-                    ST_Y(location)::text as lat,
-                    ST_X(location)::text as lon,
-                    ROUND(ST_Distance(location::geography, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography))::int as distance_m,
-                    (SELECT COUNT(*) FROM chargers WHERE cs_id = stations.cs_id) AS total_chargers,
-                    (SELECT COALESCE(SUM( (cp_stat::text = '1')::int ), 0) FROM chargers WHERE cs_id = stations.cs_id) AS available_chargers
-                FROM stations
-                WHERE (COALESCE(address, '') LIKE :addr_pattern OR COALESCE(name, '') LIKE :addr_pattern)
-                AND location IS NOT NULL
-                ORDER BY distance_m
-                LIMIT :limit OFFSET :offset
-            """
+                    if stale_age is not None:
+                        # served from tiles past their soft TTL; rebuilt in the background
+                        response["stale"] = True
+                        response["cache_age_seconds"] = int(stale_age)
+                    return response
+                tile_checked = True
+                logger.info("Tile cache: no stations within radius, calling KEPCO")
+            except Exception as cache_error:
+                try:
+                    await db.rollback()
+                except Exception:
+                    pass
+                logger.warning("Tile cache failed, using the spatial query: %s", cache_error)
 
+        # === 4단계: DB 조회 (정적 데이터) ===
+        # Only reached when the tile cache could not be used (no Redis or a
+        # tile error); an empty tile result already reflects the DB contents.
+        if not tile_checked:
             try:
-                # pass the normalized radius to the spatial query
-                offset = (page - 1) * limit
-                result = await db.execute(
-                    text(spatial_query),
-                    {"lon": lon_float, "lat": lat_float, "radius_m": actual_radius, "limit": limit, "offset": offset}
-                )
-            except Exception:
-                # If spatial query fails (no PostGIS or column differences), fallback
-                result = await db.execute(
-                    text(fallback_name_query),
-                    {
+                # 정적 데이터 조회 (충전기 상태코드 제외)
+                # NOTE: some deployments may not have KEPCO-specific columns (cs_nm/addr).
+                # To remain resilient against schema drift we select stable columns
+                # and map them to the expected keys in Python.
+                # Note: production DB uses PostGIS `location` (geometry/point) and columns `name`/`address`.
+                # Use ST_Y(location) for latitude and ST_X(location) for longitude. Keep COALESCE for address/name.
+                # Try a spatial query (PostGIS). If the DB does not support PostGIS or
+                # the `location` column is missing, fall back to a name/address LIKE query.
+                # The spatial query (radius filter on the geography GiST index,
+                # ordered by the cursor key) lives in StationRepository.search_nearby.
+
+                try:
+                    # filter by the requested radius like the other tiers, so
+                    # every returned row is kept; one extra row tells whether
+                    # there is a next page
+                    with trace_stage("search", "db_query"):
+                        if after is not None:
+                            db_stations = await StationRepository(db).search_nearby_after(
+                                lat_float, lon_float, radius, limit + 1, after
+                            )
+                        else:
+                            db_stations = await StationRepository(db).search_nearby(
+                                lat_float, lon_float, radius, limit + 1, offset
+                            )
+                except Exception:
+                    # If spatial query fails (no PostGIS or column differences), fallback
+                    await _clear_db_transaction(db)
+                    fallback_params = {
                         "addr_pattern": f"%{addr.split()[0] if addr else '서울'}%",
                         "lon": lon_float,
-                        "lat": lat_float
+                        "lat": lat_float,
+                        "radius_m": radius,
+                        "limit": limit + 1,
                     }
-                )
-            db_stations = result.fetchall()
+                    if after is not None:
+                        result = await FALLBACK_NAME_SEARCH_AFTER.execute(
+                            db, {**fallback_params, "after_distance": after[0], "after_station_id": after[1]}
+                        )
+                    else:
+                        result = await FALLBACK_NAME_SEARCH.execute(db, {**fallback_params, "offset": offset})
+                    db_stations = [row._mapping for row in result.fetchall()]
             
-            if db_stations:
-                print(f"✅ DB Hit: {len(db_stations)}개 충전소 발견")
+                if db_stations:
+                    logger.info("DB hit: %d stations", len(db_stations))
                 
-                db_result = []
-                for row in db_stations:
-                    try:
-                        row_dict = row._mapping
-                        # prefer DB-calculated distance_m when available (faster and consistent)
-                        db_distance = row_dict.get("distance_m")
+                    db_result = []
+                    for row in db_stations:
                         try:
-                            dist_val = int(db_distance) if db_distance is not None else int(calculate_distance_haversine(
-                                lat_float, lon_float, float(row_dict["lat"]), float(row_dict["lon"])
-                            ))
-                        except Exception:
-                            dist_val = int(calculate_distance_haversine(lat_float, lon_float, float(row_dict["lat"]), float(row_dict["lon"])))
-
-                        if dist_val <= radius:
-                                # charger counts from DB subselects
-                                total_ch = int(row_dict.get("total_chargers") or 0)
-                                avail_ch = int(row_dict.get("available_chargers") or 0)
-                                db_result.append({
-                                    "station_id": str(row_dict["station_id"]),
-                                    "addr": str(row_dict["addr"]),
-                                    "station_name": str(row_dict["station_name"]),
-                                    "lat": str(row_dict["lat"]),
-                                    "lon": str(row_dict["lon"]),
-                                    # ensure distance is returned as string (frontend expects string)
-                                    "distance_m": str(int(dist_val)),
-                                    "total_chargers": total_ch,
-                                    "available_chargers": avail_ch
-                                })
-                    except Exception as row_error:
-                        print(f"⚠️ DB row 처리 오류: {row_error}")
-                        continue
+                            row_dict = row
+                            # the ordering distance of the query is the cursor key
+                            db_distance = row_dict.get("sort_distance")
+                            try:
+                                dist_val = float(db_distance) if db_distance is not None else calculate_distance_haversine(
+                                    lat_float, lon_float, float(row_dict["lat"]), float(row_dict["lon"])
+                                )
+                            except Exception:
+                                dist_val = calculate_distance_haversine(lat_float, lon_float, float(row_dict["lat"]), float(row_dict["lon"]))
+
+                            if dist_val <= radius:
+                                    # charger counts from DB subselects
+                                    total_ch = int(row_dict.get("total_chargers") or 0)
+                                    avail_ch = int(row_dict.get("available_chargers") or 0)
+                                    db_result.append({
+                                        "station_id": str(row_dict["station_id"]),
+                                        "addr": str(row_dict["addr"]),
+                                        "station_name": str(row_dict["station_name"]),
+                                        "lat": str(row_dict["lat"]),
+                                        "lon": str(row_dict["lon"]),
+                                        # unrounded until the page is cut (cursor key)
+                                        "distance_m": dist_val,
+                                        "total_chargers": total_ch,
+                                        "available_chargers": avail_ch
+                                    })
+                        except Exception as row_error:
+                            logger.warning("DB row skipped: %s", row_error)
+                            continue
                 
-                if db_result:
-                    # sort by distance (and log a small sample for debugging radius handling)
-                    db_result.sort(key=lambda x: calculate_distance_haversine(
-                        lat_float, lon_float, float(x["lat"]), float(x["lon"])
-                    ))
-                    try:
-                        distances = [int(x.get("distance_m") or calculate_distance_haversine(lat_float, lon_float, float(x["lat"]), float(x["lon"]))) for x in db_result]
-                        sample = distances[:10]
-                        print(f"🔍 Debug distances sample (meters): count={len(distances)} sample={sample}")
-                    except Exception as _dist_err:
-                        print(f"⚠️ 거리 디버그 생성 실패: {_dist_err}")
+                    if db_result:
+                        # rows come ordered by the cursor key (sort_distance, station_id);
+                        # there is a next page only if a row within the radius is left over
+                        next_cursor = None
+                        if len(db_result) > limit:
+                            db_result = db_result[:limit]
+                            next_cursor = encode_cursor(station_key(db_result[-1]), fingerprint)
+                        for station_out in db_result:
+                            # ensure distance is returned as string (frontend expects string)
+                            station_out["distance_m"] = str(int(station_out["distance_m"]))
+                        try:
+                            distances = [int(x["distance_m"]) for x in db_result]
+                            sample = distances[:10]
+                            logger.debug("Distances (m): count=%d sample=%s", len(distances), sample)
+                        except Exception as _dist_err:
+                            logger.debug("Distance sample failed: %s", _dist_err)
                     
-                    # Cache에 저장
-                    try:
-                        # don't cache empty results; when caching, exclude dynamic fields
-                        if db_result:
-                            # Exclude dynamic fields (distance and charger counts) from cache
-                            cache_stations = [{k: v for k, v in s.items() if k not in ("distance_m", "total_chargers", "available_chargers")} for s in db_result]
-                            cache_data = {"stations": _serialize_for_cache(cache_stations), "timestamp": datetime.now(timezone.utc).isoformat()}
-                            await redis_client.setex(cache_key, settings.CACHE_EXPIRE_SECONDS, json.dumps(_serialize_for_cache(cache_data), ensure_ascii=False))
-                            # Also write a persistent, long-lived static snapshot used
-                            # to quickly repopulate map markers when users return.
-                            try:
-                                persistent_ttl = getattr(settings, "PERSISTENT_STATION_CACHE_SECONDS", 86400)
-                                await redis_client.setex(persistent_key, persistent_ttl, json.dumps(_serialize_for_cache(cache_data), ensure_ascii=False))
-                                print(f"✅ DB 결과 Persistent Cache 저장 완료: key={persistent_key} ttl={persistent_ttl}s")
-                            except Exception as _p_e:
-                                print(f"⚠️ Persistent cache write failed (ignored): {_p_e}")
-
-                            print(f"✅ DB 결과 Cache 저장 완료: key={cache_key} ttl={settings.CACHE_EXPIRE_SECONDS}s")
                         # Metrics: DB-path result
-                        try:
-                            if redis_client:
-                                await redis_client.incr("metrics:stations:cache_hits:db")
-                        except Exception as _merr:
-                            print(f"⚠️ Metric increment (db) failed: {_merr}")
-                        else:
-                            print(f"ℹ️ DB 결과 빈 리스트 - 캐시 저장 생략: key={cache_key}")
-                    except Exception as _c_err:
-                        print(f"⚠️ Cache 저장 실패: {_c_err}")
-                        pass
+                        SEARCH_RESULTS.inc(source="db")
+                        annotate(source="database")
                     
-                    return {
-                        "source": "database",
-                        "addr": addr,
-                        "radius_normalized": actual_radius,
-                        "stations": db_result
-                    }
-        except Exception as db_error:
-            # If a DB error occurs, rollback the session so subsequent DB commands
-            # (e.g. inserts) are not run inside an aborted transaction.
-            try:
-                await db.rollback()
-            except Exception:
-                pass
-            print(f"⚠️ DB 조회 오류: {db_error}")
+                        return {
+                            "source": "database",
+                            "addr": addr,
+                            "radius_normalized": actual_radius,
+                            "stations": db_result,
+                            "next_cursor": next_cursor
+                        }
+            except Exception as db_error:
+                # If a DB error occurs, rollback the session so subsequent DB commands
+                # (e.g. inserts) are not run inside an aborted transaction.
+                try:
+                    await db.rollback()
+                except Exception:
+                    pass
+                logger.warning("Station DB query failed: %s", db_error)
         
         # === 5단계: API 호출 및 저장 ===
-        print(f"✅ KEPCO API 호출 시작...")
         # use module-level `settings` imported at top to avoid UnboundLocalError
         kepco_url = settings.EXTERNAL_STATION_API_BASE_URL
         kepco_key = settings.EXTERNAL_STATION_API_KEY
@@ -654,111 +697,80 @@ async def search_ev_stations_requirement_compliant(
         if not kepco_url or not kepco_key:
             raise HTTPException(status_code=500, detail="KEPCO API 설정 누락")
         
-        print(f"✅ KEPCO URL: {kepco_url}")
-        print(f"✅ Making KEPCO API request to: {kepco_url}")
+        logger.debug("KEPCO request: addr=%s", addr)
         
-        async with httpx.AsyncClient() as client:
-            kepco_response = await client.get(
-                kepco_url,
-                params={
-                    "addr": addr,
-                    "apiKey": kepco_key,
-                    "returnType": "json"
-                },
-                timeout=30.0
-            )
-            
-            print(f"✅ KEPCO Response Status: {kepco_response.status_code}")
-            
-            if kepco_response.status_code != 200:
-                raise HTTPException(
-                    status_code=502,
-                    detail=f"KEPCO API 오류: HTTP {kepco_response.status_code}"
-                )
-            
-            kepco_data = kepco_response.json()
-            print(f"✅ KEPCO API 응답 수신 완료")
+        # Concurrent requests for the same addr (searches, details, the charger
+        # refresher; in this worker or any other) share one upstream call.
+        try:
+            with trace_stage("search", "kepco"):
+                kepco_data, kepco_leader, fetched_at = await kepco_fetcher.fetch_by_addr(addr)
+        except KepcoAPIError as kepco_error:
+            logger.warning("KEPCO response status %s (addr=%s)", kepco_error.status_code, addr)
+            raise HTTPException(status_code=502, detail=str(kepco_error))
+        logger.info("KEPCO response received (addr=%s leader=%s)", addr, kepco_leader)
         
         # === 6단계: 데이터 처리 및 DB 저장 ===
         api_stations = []
-        now = datetime.now(timezone.utc)
+        # last_synced_at = upstream fetch time (shared/cached payloads keep theirs)
+        now = fetched_at
         
         if isinstance(kepco_data, dict) and "data" in kepco_data:
             raw_data = kepco_data["data"]
             
             if isinstance(raw_data, list):
-                for item in raw_data:
+                # radius filter for the whole payload in one vectorized pass
+                # (items without coordinates are dropped by StationBatch)
+                kepco_batch = StationBatch([
+                    {"item": item, "lat": item.get("lat"), "lon": item.get("longi")}
+                    for item in raw_data if isinstance(item, dict)
+                ])
+                persist_items = []
+                for entry, dist in kepco_batch.hits(lat_float, lon_float, radius):
+                    item = entry["item"]
                     try:
-                        item_lat = float(item.get("lat", 0))
-                        item_lon = float(item.get("longi", 0))
+                        item_lat = float(entry["lat"])
+                        item_lon = float(entry["lon"])
                         
                         if item_lat == 0 or item_lon == 0:
                             continue
                         
-                        dist = calculate_distance_haversine(lat_float, lon_float, item_lat, item_lon)
-                        if dist > radius:
-                            continue
-                        
                         station_data = {
                             "station_id": str(item.get("csId", "")),
                             "addr": str(item.get("addr", "")),
                             "station_name": str(item.get("csNm", "")),
                             "lat": str(item_lat),
                             "lon": str(item_lon),
-                            "distance_m": str(int(dist))
+                            # unrounded until the page is cut (cursor key)
+                            "distance_m": float(dist)
                         }
                         api_stations.append(station_data)
                         
-                        # DB에 저장 (정적 데이터) - 안전한 방식
-                        try:
-                            # Ensure we are not in an aborted transaction from an earlier error
-                            await _clear_db_transaction(db)
-
-                            # Use PostGIS location column. Some DBs don't have lat/long columns.
-                            insert_sql = """
-                                INSERT INTO stations (cs_id, address, name, location, raw_data, last_synced_at)
-                                VALUES (:cs_id, :address, :name, ST_SetSRID(ST_MakePoint(:longi, :lat), 4326), :raw_data, :update_time)
-                                ON CONFLICT (cs_id) DO UPDATE SET
-                                    address = EXCLUDED.address,
-                                    name = EXCLUDED.name,
-                                    location = EXCLUDED.location,
-                                    raw_data = EXCLUDED.raw_data,
-                                    last_synced_at = EXCLUDED.last_synced_at
-                            """
-                            
-                            await db.execute(text(insert_sql), {
-                                "cs_id": item.get("csId"),
-                                "address": item.get("addr"),
-                                "name": item.get("csNm"),
-                                "lat": item_lat,
-                                "longi": item_lon,
-                                "raw_data": json.dumps(item, ensure_ascii=False),
-                                "update_time": now
-                            })
-                        except Exception as insert_error:
-                            # If insert fails, rollback so the session is usable for later operations
-                            try:
-                                await _clear_db_transaction(db)
-                            except Exception:
-                                pass
-                            print(f"⚠️ DB 저장 오류: {insert_error}")
+                        persist_items.append(item)
                     
                     except Exception as item_error:
-                        print(f"⚠️ Item 처리 오류: {item_error}")
+                        logger.warning("KEPCO item skipped: %s", item_error)
                         continue
                 
-                # 트랜잭션 커밋
-                try:
-                    await db.commit()
-                    print(f"✅ DB 저장 완료: {len(api_stations)}개 충전소")
-                except Exception as commit_error:
-                    print(f"⚠️ 트랜잭션 커밋 오류: {commit_error}")
-                    await db.rollback()
+                # DB에 저장 (정적 데이터) - queued for the write-behind flusher so the
+                # response does not wait on it; inline bulk upsert when the queue
+                # is unavailable. Written for shared payloads too: the leader may have
+                # been a detail request that wrote a single station (idempotent upserts).
+                if persist_items:
+                    if write_behind.submit(persist_items, with_chargers=False, fetched_at=now):
+                        logger.debug("Queued %d stations for write-behind", len(persist_items))
+                    else:
+                        # writes go to the primary explicitly (db is the read session)
+                        try:
+                            with trace_stage("search", "persist"):
+                                async with AsyncSessionLocal() as write_db:
+                                    await persist_kepco_items(write_db, persist_items, with_chargers=False, now=now)
+                                    await write_db.commit()
+                            logger.info("Persisted %d stations inline", len(persist_items))
+                        except Exception as insert_error:
+                            logger.warning("Station persist failed: %s", insert_error)
         
         # === 7단계: Cache 저장 및 결과 반환 ===
-        api_stations.sort(key=lambda x: calculate_distance_haversine(
-            lat_float, lon_float, float(x["lat"]), float(x["lon"])
-        ))
+        api_stations.sort(key=station_key)
         # Deduplicate stations by station_id before caching/returning
         try:
             api_stations = _dedupe_stations_by_id(api_stations)
@@ -766,49 +778,53 @@ async def search_ev_stations_requirement_compliant(
             pass
 
         try:
-            # Avoid caching empty API results
+            # Merge into already-cached tiles so the next search in this area
+            # sees the new stations without waiting for the tile TTL. Tiles that
+            # are not cached yet are rebuilt from the DB on the next miss.
             if api_stations:
-                # when caching API results, exclude dynamic fields (distance and charger counts)
-                cache_stations = [{k: v for k, v in s.items() if k not in ("distance_m", "total_chargers", "available_chargers")} for s in api_stations]
-                cache_data = {"stations": _serialize_for_cache(cache_stations), "timestamp": now.isoformat()}
-                await redis_client.setex(cache_key, settings.CACHE_EXPIRE_SECONDS, json.dumps(_serialize_for_cache(cache_data), ensure_ascii=False))
-                # Also persist a static snapshot for faster marker rehydration
-                try:
-                    persistent_ttl = getattr(settings, "PERSISTENT_STATION_CACHE_SECONDS", 86400)
-                    await redis_client.setex(persistent_key, persistent_ttl, json.dumps(_serialize_for_cache(cache_data), ensure_ascii=False))
-                    print(f"✅ API 결과 Persistent Cache 저장 완료: key={persistent_key} ttl={persistent_ttl}s")
-                except Exception as _p_e:
-                    print(f"⚠️ Persistent cache write failed (ignored): {_p_e}")
-                print(f"✅ API 결과 Cache 저장 완료: key={cache_key} ttl={settings.CACHE_EXPIRE_SECONDS}s")
+                with trace_stage("search", "cache_write"):
+                    await station_tile_cache.merge_stations(redis_client, api_stations)
+                logger.debug("Merged %d KEPCO stations into tiles", len(api_stations))
+                # this worker's in-memory index; other workers pick the rows
+                # up on their next incremental refresh (last_synced_at)
+                await station_index.upsert(api_stations)
             else:
-                print(f"ℹ️ API 결과 빈 리스트 - 캐시 저장 생략: key={cache_key}")
+                logger.debug("KEPCO returned no stations in radius, cache not updated")
         except Exception as _c_err:
-            print(f"⚠️ API 캐시 저장 실패: {_c_err}")
-            pass
+            logger.warning("Cache update after KEPCO failed: %s", _c_err)
 
-        # Metrics: API-path result (best-effort)
-        try:
-            if redis_client:
-                await redis_client.incr("metrics:stations:cache_hits:api")
-        except Exception as _merr:
-            print(f"⚠️ Metric increment (api) failed: {_merr}")
+        # Metrics: API-path result
+        SEARCH_RESULTS.inc(source="api")
+        annotate(source="kepco_api")
+
+        # sliced like the cached tiers: the whole radius went into the tiles /
+        # station index above, so the next page is served from there
+        api_stations.sort(key=station_key)
+        api_stations, next_cursor = paginate(api_stations, limit, after, offset, fingerprint)
+        for station_out in api_stations:
+            station_out["distance_m"] = str(int(station_out["distance_m"]))
 
         return {
             "source": "kepco_api",
             "addr": addr,
             "radius_normalized": actual_radius,
-            "stations": api_stations
+            "stations": api_stations,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"🚨 전체 오류: {str(e)}")
+        logger.exception("Station search failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 def calculate_distance_haversine(lat1, lon1, lat2, lon2):
-    """하버사인 공식으로 두 지점 간 거리 계산 (미터)"""
+    """하버사인 공식으로 두 지점 간 거리 계산 (미터)
+
+    Scalar fallback for single rows; station lists go through
+    app.services.distance_engine.StationBatch (vectorized).
+    """
     try:
         R = 6371000  # 지구 반지름(미터)
         lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
@@ -819,6 +835,11 @@ def calculate_distance_haversine(lat1, lon1, lat2, lon2):
         return 999999
 
 
+def _index_hit_key(hit):
+    """search_cursor key of a (station, distance) hit of the station index"""
+    return float(hit[1]), str(hit[0]["station_id"])
+
+
 def _dedupe_stations_by_id(stations):
     """Deduplicate station dicts by station_id.
 
@@ -860,6 +881,30 @@ def _dedupe_stations_by_id(stations):
     return list(by_id.values())
 
 
+async def _fetch_charger_counts(db: AsyncSession, station_ids) -> dict:
+    """Batch-fetch total/available charger counts for the given cs_ids.
+
+    Reads the precomputed station_availability rows in one indexed lookup.
+    Returns {cs_id: {"total": int, "avail": int}}; stations without a row
+    are absent. Failures are logged and yield an empty map.
+    """
+    counts_map = {}
+    station_ids = [str(sid) for sid in station_ids if sid]
+    if not station_ids:
+        return counts_map
+    try:
+        with trace_stage("search", "db_counts"):
+            rows = await StationAvailabilityRepository(db).get_many(station_ids)
+        for cs_id, m in rows.items():
+            counts_map[cs_id] = {
+                "total": int(m.get("total_chargers") or 0),
+                "avail": int(m.get("available_chargers") or 0)
+            }
+    except Exception as _batch_err:
+        logger.warning("Batch counts query failed (ignored): %s", _batch_err)
+    return counts_map
+
+
 async def _clear_db_transaction(db: AsyncSession):
     """Ensure the DB session is not in an aborted transaction state.
 
@@ -874,70 +919,6 @@ async def _clear_db_transaction(db: AsyncSession):
         pass
 
 
-async def _ensure_station_db_id(db: AsyncSession, cs_id: str, item: dict = None, now: datetime = None):
-    """Ensure a station row exists for given cs_id and return its DB primary key id.
-
-    If the station exists, returns the id. If not, attempts to INSERT the station
-    (using provided `item` for fields) and RETURNING id. This centralizes the
-    logic so callers inserting chargers never omit the required station_id FK.
-    """
-    if not cs_id:
-        return None
-
-    try:
-        res = await db.execute(text("SELECT id FROM stations WHERE cs_id = :cs_id LIMIT 1"), {"cs_id": cs_id})
-        row = res.fetchone()
-        if row and row._mapping.get("id"):
-            return row._mapping.get("id")
-    except Exception:
-        # best-effort: clear transaction and continue to attempt insert
-        try:
-            await _clear_db_transaction(db)
-        except Exception:
-            pass
-
-    # attempt to insert station using available item data (if any)
-    try:
-        if now is None:
-            now = datetime.now(timezone.utc)
-
-        insert_sql = """
-            INSERT INTO stations (cs_id, name, address, location, raw_data, last_synced_at)
-            VALUES (:cs_id, :name, :address, ST_SetSRID(ST_MakePoint(:longi, :lat), 4326), :raw_data, :update_time)
-            ON CONFLICT (cs_id) DO UPDATE SET
-                name = COALESCE(EXCLUDED.name, stations.name),
-                address = COALESCE(EXCLUDED.address, stations.address),
-                location = COALESCE(EXCLUDED.location, stations.location),
-                raw_data = COALESCE(EXCLUDED.raw_data, stations.raw_data),
-                last_synced_at = COALESCE(EXCLUDED.last_synced_at, stations.last_synced_at)
-            RETURNING id
-        """
-
-        params = {
-            "cs_id": cs_id,
-            "name": (item.get("csNm") if item else None) or (item.get("cs_nm") if item else None) or None,
-            "address": (item.get("addr") if item else None) or None,
-            "lat": float(item.get("lat")) if item and item.get("lat") else None,
-            "longi": float(item.get("longi")) if item and item.get("longi") else None,
-            "raw_data": json.dumps(item, ensure_ascii=False) if item else None,
-            "update_time": now
-        }
-
-        await _clear_db_transaction(db)
-        r = await db.execute(text(insert_sql), params)
-        row = r.fetchone()
-        if row and row._mapping.get("id"):
-            return row._mapping.get("id")
-    except Exception as e:
-        try:
-            await _clear_db_transaction(db)
-        except Exception:
-            pass
-        print(f"⚠️ _ensure_station_db_id 실패: {e}")
-
-    return None
-
-
 def _serialize_for_cache(obj):
     """Recursively convert common non-JSON types to JSON-serializable values.
 
@@ -1027,7 +1008,7 @@ async def kepco_2025_new_api_implementation(
     page: int = Query(1, description="페이지 번호", ge=1),
     limit: int = Query(20, description="페이지당 결과 수", ge=1, le=100),
     api_key: str = Depends(frontend_api_key_required),
-    db: AsyncSession = Depends(get_async_session),
+    db: AsyncSession = Depends(get_read_session),
     redis_client: Redis = Depends(get_redis_client)
 ):
     """
@@ -1035,12 +1016,7 @@ async def kepco_2025_new_api_implementation(
     이전 URL: /ws/chargePoint/curChargePoint (삭제됨)
     새 URL: /EVchargeManage.do (정확함)
     """
-    print(f"🚀🚀🚀 KEPCO 2025 COMPLETELY NEW CODE 🚀🚀🚀")
-    print(f"🚀 Function: kepco_2025_new_api_implementation")
-    print(f"🚀 Time: {datetime.now(timezone.utc)}")
-    print(f"🚀 Params: lat={lat}, lon={lon}, radius={radius}")
-    print(f"🚀 ABSOLUTE CONFIRMATION: This is the NEW CODE running!")
-    print(f"🚀 Expected KEPCO URL: https://bigdata.kepco.co.kr/openapi/v1/EVchargeManage.do")
+    logger.debug("Deprecated /stations-kepco-2025 called: lat=%s lon=%s radius=%s", lat, lon, radius)
     
     # This endpoint is deprecated in favor of the canonical `/api/v1/stations` handler.
     # For compatibility we return a temporary redirect to the canonical endpoint
@@ -1049,7 +1025,7 @@ async def kepco_2025_new_api_implementation(
         target = f"/api/v1/stations?lat={lat}&lon={lon}&radius={radius}&page={page}&limit={limit}"
         return RedirectResponse(url=target, status_code=307)
     except Exception as e:
-        print(f"⚠️ Redirect to /api/v1/stations failed: {e}")
+        logger.warning("Redirect to /api/v1/stations failed: %s", e)
         raise HTTPException(status_code=500, detail="Internal redirect failed")
 
 
@@ -1066,7 +1042,7 @@ async def admin_data():
 
 # Admin: Redis key inspection (dry-run only, no delete)
 @admin_router.get("/redis/keys", summary="관리자: Redis 키 조회 (삭제하지 않음)")
-async def admin_redis_keys(pattern: str = Query("stations:*", description="SCAN 패턴 (예: stations:*)"),
+async def admin_redis_keys(pattern: str = Query("station_tile:*", description="SCAN 패턴 (예: station_tile:*)"),
                            count: int = Query(100, description="SCAN count hint"),
                            redis_client: Redis = Depends(get_redis_client)):
     """관리자 전용: Redis에서 패턴에 맞는 키를 나열합니다. 삭제는 수행하지 않습니다.
@@ -1138,6 +1114,84 @@ async def admin_redis_debug(redis_client: Redis = Depends(get_redis_client)):
     }
 
 
+@admin_router.get("/geocode/cache", summary="관리자: 역지오코딩 캐시 통계")
+async def admin_geocode_cache_stats():
+    """Admin-only: hit/miss counters of the quantized reverse-geocoding cache.
+
+    Use these to size REVERSE_GEOCODE_CACHE_CELL_DEG and REVERSE_GEOCODE_CACHE_LRU_SIZE.
+    Counters are per worker process.
+    """
+    return {
+        "offline_geocoder_ready": reverse_geocoder.ready,
+        "cache": geocode_cache.stats()
+    }
+
+
+@admin_router.get("/single-flight", summary="관리자: KEPCO 요청 병합(single-flight) 통계")
+async def admin_single_flight_stats():
+    """Admin-only: how many KEPCO fetches were executed vs. shared.
+
+    leader_calls = coalesced calls run by this worker, local_shared = callers
+    that joined an in-process call, remote_shared / stale_served = callers
+    that used another worker's fresh / previous result. kepco_payload_cache
+    shows addr / csId cache hits vs. actual upstream calls. Per worker process.
+    """
+    return {**single_flight.stats(), "kepco_payload_cache": kepco_fetcher.stats()}
+
+
+@admin_router.get("/http-clients", summary="관리자: 외부 HTTP 커넥션 풀 통계")
+async def admin_http_client_stats():
+    """Admin-only: request counters and pooled connections per upstream (KEPCO, Nominatim).
+
+    Counters are per worker process.
+    """
+    return get_http_client_stats()
+
+
+@admin_router.get("/write-behind", summary="관리자: KEPCO write-behind 큐 상태")
+async def admin_write_behind_stats():
+    """Admin-only: write-behind queue depth, lag (enqueue -> commit) and counters.
+
+    rejected = jobs persisted inline because the queue was full, jobs_lost =
+    jobs of failed flushes or dropped at shutdown. Per worker process.
+    """
+    return write_behind.stats()
+
+
+@admin_router.get("/charger-refresher", summary="관리자: 충전기 상태 백그라운드 갱신 통계")
+async def admin_charger_refresher_stats():
+    """Admin-only: background charger status refresh counters and the last pass.
+
+    addrs_shared = addresses fetched by another worker (which persisted them).
+    Per worker process.
+    """
+    return charger_refresher.stats()
+
+
+@admin_router.get("/swr", summary="관리자: stale-while-revalidate 통계")
+async def admin_swr_stats():
+    """Admin-only: fresh / stale-served / expired cache reads (detail + search tiles)
+    and background revalidations (deduplicated = skipped, already running). Per worker.
+    """
+    return swr.stats()
+
+
+@admin_router.get("/cache-tiers", summary="관리자: L1(프로세스) / L2(Redis) 캐시 적중 통계")
+async def admin_cache_tier_stats():
+    """Admin-only: get_cache() hits per tier (l1 = this worker, l2 = Redis), misses,
+    L1 evictions / usage and pub/sub invalidations. Per worker process.
+    """
+    return l1_cache.stats()
+
+
+@admin_router.get("/logging", summary="관리자: 비동기 로그 큐 상태")
+async def admin_logging_stats():
+    """Admin-only: records waiting in the log queue and records dropped
+    because it was full. Per worker process.
+    """
+    return {**logging_stats(), "level": settings.LOG_LEVEL, "rate_limit_per_minute": settings.LOG_RATE_LIMIT_PER_MINUTE}
+
+
 # Register admin_router AFTER all admin routes have been defined so every
 # admin endpoint (e.g. /admin/redis/debug) is included. Previously the
 # router was registered too early which caused routes defined afterwards
@@ -1210,13 +1264,7 @@ async def db_test_endpoint(manufacturer: str, model_group: str, db: AsyncSession
     start_time = time.time()
     try:
         # 안전한 파라미터 바인딩으로 쿼리 실행
-        query_sql = (
-            "SELECT model_name, subsidy_national_10k_won, subsidy_local_10k_won, subsidy_total_10k_won, sale_price "
-            "FROM subsidies "
-            "WHERE manufacturer = :manufacturer AND model_group = :model_group LIMIT 50"
-        )
-        ensure_read_only_sql(query_sql)
-        result = await db.execute(text(query_sql), {"manufacturer": manufacturer, "model_group": model_group})
+        result = await SUBSIDIES_DB_TEST.execute(db, {"manufacturer": manufacturer, "model_group": model_group})
         rows = result.fetchall()
 
         response_time_ms = (time.time() - start_time) * 1000
@@ -1267,6 +1315,23 @@ async def redis_test_endpoint(redis_client: Redis = Depends(get_redis_client)):
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Redis operation FAILED!: {e.__class__.__name__}: {e}")
 
 
+# Set while a background stale-while-revalidate refresh re-runs the detail
+# handler, so it rebuilds the cache instead of reading it.
+_detail_revalidating: contextvars.ContextVar[bool] = contextvars.ContextVar("detail_revalidating", default=False)
+
+
+async def _revalidate_station_detail(station_id: str, addr: str):
+    """Rebuild station_detail:{station_id} in the background (own DB session)"""
+    _detail_revalidating.set(True)
+    # the spawning request's trace is already sent
+    detach_trace()
+    async with AsyncSessionLocal() as db:
+        await get_station_charger_specs(
+            station_id=station_id, addr=addr, api_key="", db=db, redis_client=await get_redis_client()
+        )
+        await db.commit()
+
+
 # --- 충전소 아이콘 클릭 → 충전기 스펙 조회 엔드포인트 ---
 @app.get("/api/v1/station/{station_id}/chargers", tags=["Station"], summary="✅ 충전기 스펙 조회 (요구사항 준수)")
 async def get_station_charger_specs(
@@ -1280,45 +1345,73 @@ async def get_station_charger_specs(
     ✅ 요구사항 2번 - 충전소 아이콘 클릭 → 충전기 스펙 조회
     
     1. 프론트 요청: 충전소ID, 충전기주소(addr), API KEY (모두 string)
-    2. 백엔드 로직: DB검색(충전소ID) → API검색(addr) → 캐시 반영 & 동적 데이터 갱신
+    2. 백엔드 로직: 캐시 조회 → DB검색(충전소ID) → API검색(addr) → 캐시 반영 & 동적 데이터 갱신
     3. 응답: 충전소명칭, 제공가능한충전방식, 각 충전기 정보(상태코드+충전방식 매핑)
     """
-    print(f"✅ 충전기 스펙 조회 시작")
-    print(f"✅ station_id={station_id}, addr={addr}")
+    logger.debug("Station detail: station_id=%s addr=%s", station_id, addr)
     
     try:
+        # === Redis 캐시 우선 검사 (stale-while-revalidate) ===
+        # Checked before the DB so a cache hit never checks out a connection.
+        # fresh (<= CACHE_DETAIL_EXPIRE_SECONDS): returned as-is.
+        # stale (up to CACHE_DETAIL_STALE_SECONDS more): returned with
+        # "stale": true and its age while a deduplicated background refresh
+        # rebuilds it. Skipped by that refresh itself.
+        try:
+            cache_key = f"station_detail:{station_id}"
+            cached_blob = None
+            if redis_client and not _detail_revalidating.get():
+                # per-worker L1 (decoded) first, then Redis
+                try:
+                    with trace_stage("detail", "cache_read"):
+                        cached_blob = await get_cache(cache_key, client=redis_client)
+                except ValueError:
+                    cached_blob = None
+
+                if cached_blob and isinstance(cached_blob, dict) and cached_blob.get("timestamp"):
+                    cached_ts = parse_cache_timestamp(cached_blob.get("timestamp"))
+                    if cached_ts is None:
+                        logger.warning("Unparseable timestamp in %s, ignoring the cached detail", cache_key)
+                    else:
+                        freshness, age_sec = swr.classify(
+                            cached_ts, settings.CACHE_DETAIL_EXPIRE_SECONDS, settings.CACHE_DETAIL_STALE_SECONDS
+                        )
+                        if freshness != EXPIRED:
+                            logger.info("Detail cache hit: %s age=%.0fs (%s)", cache_key, age_sec, freshness)
+                            # normalize cached payload to the endpoint response shape
+                            cached_station_info = cached_blob.get("station_info") or {}
+                            cached_chargers = cached_blob.get("chargers") or []
+                            cached_available = cached_blob.get("available_charge_types") or []
+                            resp = {
+                                "station_name": cached_station_info.get("station_name") or cached_station_info.get("cs_nm") or "",
+                                "available_charge_types": ", ".join(cached_available),
+                                "charger_details": cached_chargers,
+                                "total_chargers": len(cached_chargers),
+                                "source": "cache",
+                                "timestamp": cached_blob.get("timestamp")
+                            }
+                            annotate(source="cache", freshness=freshness)
+                            if freshness == STALE:
+                                resp["stale"] = True
+                                resp["cache_age_seconds"] = int(age_sec)
+                                swr.revalidate(cache_key, lambda: _revalidate_station_detail(station_id, addr))
+                            return JSONResponse(status_code=200, content=resp)
+                        else:
+                            logger.info("Detail cache expired: %s age=%.0fs", cache_key, age_sec)
+        except Exception as cache_err:
+            logger.warning("Detail cache read failed (ignored): %s", cache_err)
+
         # === 1단계: DB 조회 (충전소ID 활용) - 안전한 쿼리 ===
-        print(f"✅ DB에서 충전소 정보 조회...")
         
         # 정적 데이터 조회
         # Try a richer query that uses `static_data_updated_at` if present; if the
         # column is missing (ProgrammingError) fallback to a simpler query. Also
         # ensure we rollback any aborted transaction before retrying.
-        primary_station_query = """
-         SELECT id as station_db_id, cs_id, COALESCE(name, '') AS cs_nm, COALESCE(address, '') AS addr,
-             ST_Y(location)::text AS lat, ST_X(location)::text AS longi,
-             COALESCE(static_data_updated_at, updated_at) AS last_updated,
-             -- most recent charger dynamic update time for this station
-             (SELECT MAX(stat_update_datetime) FROM chargers WHERE cs_id = stations.cs_id) AS last_charger_update
-         FROM stations
-         WHERE cs_id = :station_id
-         LIMIT 1
-     """
-
-        fallback_station_query = """
-         SELECT id as station_db_id, cs_id, COALESCE(name, '') AS cs_nm, COALESCE(address, '') AS addr,
-             ST_Y(location)::text AS lat, ST_X(location)::text AS longi,
-             updated_at AS last_updated,
-             (SELECT MAX(stat_update_datetime) FROM chargers WHERE cs_id = stations.cs_id) AS last_charger_update
-         FROM stations
-         WHERE cs_id = :station_id
-         LIMIT 1
-     """
-
         station_row = None
         try:
             try:
-                station_result = await db.execute(text(primary_station_query), {"station_id": station_id})
+                with trace_stage("detail", "db_query"):
+                    station_result = await STATION_DETAIL.execute(db, {"station_id": station_id})
                 station_row = station_result.fetchone()
             except ProgrammingError as pe:
                 # Column missing or other programming error — clear transaction and retry with fallback
@@ -1326,16 +1419,16 @@ async def get_station_charger_specs(
                     await _clear_db_transaction(db)
                 except Exception:
                     pass
-                print(f"⚠️ Primary station query ProgrammingError, falling back: {pe}")
+                logger.warning("Primary station query ProgrammingError, falling back: %s", pe)
                 try:
-                    station_result = await db.execute(text(fallback_station_query), {"station_id": station_id})
+                    station_result = await STATION_DETAIL_FALLBACK.execute(db, {"station_id": station_id})
                     station_row = station_result.fetchone()
                 except Exception as fallback_err:
                     try:
                         await _clear_db_transaction(db)
                     except Exception:
                         pass
-                    print(f"⚠️ Fallback station query failed: {fallback_err}")
+                    logger.warning("Fallback station query failed: %s", fallback_err)
                     station_row = None
             except Exception as station_db_error:
                 # Other DB error: clear and continue
@@ -1343,7 +1436,7 @@ async def get_station_charger_specs(
                     await _clear_db_transaction(db)
                 except Exception:
                     pass
-                print(f"⚠️ DB 조회 오류(충전소 상세): {station_db_error}")
+                logger.warning("Station detail DB query failed: %s", station_db_error)
                 station_row = None
         finally:
             # ensure we aren't leaving an aborted transaction open
@@ -1353,7 +1446,7 @@ async def get_station_charger_specs(
                 pass
         
         if not station_row:
-            print(f"⚠️ DB에서 충전소 정보 없음, API 호출로 진행")
+            logger.info("Station %s not in DB, calling KEPCO", station_id)
             station_info = None
         else:
             station_dict = station_row._mapping
@@ -1382,72 +1475,7 @@ async def get_station_charger_specs(
                 # keep raw DB value (may be datetime or string) for freshness check
                 "last_charger_update": station_dict.get("last_charger_update")
             }
-            print(f"✅ DB에서 충전소 정보 발견: {station_info['station_name']}")
-
-        # === Redis 캐시 우선 검사 (30분 이내인 경우 바로 반환) ===
-        try:
-            cache_key = f"station_detail:{station_id}"
-            cached_blob = None
-            if redis_client:
-                cached_raw = await redis_client.get(cache_key)
-                if cached_raw:
-                    try:
-                        cached_blob = json.loads(cached_raw)
-                    except Exception:
-                        cached_blob = None
-
-                if cached_blob and isinstance(cached_blob, dict) and cached_blob.get("timestamp"):
-                    # Robust parsing of cached timestamp:
-                    # - Accept ISO with and without timezone
-                    # - Accept ISO with trailing 'Z' (convert to +00:00)
-                    # - Accept legacy compact format YYYYMMDDHHMMSS
-                    def _parse_cached_ts(raw_ts):
-                        if raw_ts is None:
-                            return None
-                        s = str(raw_ts)
-                        # Handle trailing Z (UTC)
-                        if s.endswith("Z"):
-                            s = s[:-1] + "+00:00"
-                        try:
-                            parsed = datetime.fromisoformat(s)
-                            # Treat naive datetimes as UTC for cache age calculations
-                            if parsed.tzinfo is None:
-                                parsed = parsed.replace(tzinfo=timezone.utc)
-                            return parsed
-                        except Exception:
-                            # Try legacy compact format: YYYYMMDDHHMMSS
-                            try:
-                                parsed = datetime.strptime(s, "%Y%m%d%H%M%S")
-                                return parsed.replace(tzinfo=timezone.utc)
-                            except Exception:
-                                return None
-
-                    cached_ts = _parse_cached_ts(cached_blob.get("timestamp"))
-                    if cached_ts is None:
-                        print("⚠️ Redis 캐시의 timestamp 파싱 실패 - 무시하고 API/DB 검사 진행")
-                    else:
-                        age_min = (datetime.now(timezone.utc) - cached_ts).total_seconds() / 60
-                        # use configured detail TTL for cache acceptance (seconds -> minutes)
-                        detail_ttl_min = getattr(settings, "CACHE_DETAIL_EXPIRE_SECONDS", 300) / 60
-                        if age_min <= detail_ttl_min:
-                            print(f"✅ Redis 캐시 사용: station_detail:{station_id} age={age_min:.1f}min (ttl_min={detail_ttl_min:.1f})")
-                            # normalize cached payload to the endpoint response shape
-                            cached_station_info = cached_blob.get("station_info") or {}
-                            cached_chargers = cached_blob.get("chargers") or []
-                            cached_available = cached_blob.get("available_charge_types") or []
-                            resp = {
-                                "station_name": cached_station_info.get("station_name") or cached_station_info.get("cs_nm") or "",
-                                "available_charge_types": ", ".join(cached_available),
-                                "charger_details": cached_chargers,
-                                "total_chargers": len(cached_chargers),
-                                "source": "cache",
-                                "timestamp": cached_blob.get("timestamp")
-                            }
-                            return JSONResponse(status_code=200, content=resp)
-                        else:
-                            print(f"ℹ️ Redis 캐시 존재하지만 만료 기준 초과(age={age_min:.1f}min) - API/DB 검사 진행")
-        except Exception as cache_err:
-            print(f"⚠️ Redis 조회 오류(무시): {cache_err}")
+            logger.debug("Station %s found in DB", station_id)
 
         # === 2단계: 충전기 동적 데이터 갱신 체크 (30분 규칙) ===
         need_api_call = True
@@ -1465,30 +1493,24 @@ async def get_station_charger_specs(
                 try:
                     time_diff = (now - last_charger_update_dt).total_seconds() / 60
                 except Exception as td_err:
-                    print(f"⚠️ 시간 차 계산 중 예외: {td_err} now={now} other={last_charger_update_dt}")
+                    logger.warning("Charger age computation failed: %s now=%s other=%s", td_err, now, last_charger_update_dt)
                     time_diff = None
 
                 if time_diff is not None:
                     if time_diff <= 30:
-                        print(f"✅ 충전기 데이터가 최신임 (갱신 후 {time_diff:.1f}분), DB의 동적 데이터 사용")
+                        logger.debug("Charger statuses fresh (%.1f min), using DB", time_diff)
                         need_api_call = False
                     else:
-                        print(f"✅ 충전기 데이터가 오래됨 (갱신 후 {time_diff:.1f}분), API 호출 필요")
+                        logger.debug("Charger statuses stale (%.1f min), calling KEPCO", time_diff)
                 else:
-                    print("⚠️ 충전기 최신 업데이트 시간 비교 불가 - 안전을 위해 API 호출 진행")
+                    logger.warning("Charger update time not comparable, calling KEPCO")
             else:
-                print("✅ 충전기 최신 업데이트 없음(첫 조회 또는 DB에 충전기 데이터 없음 또는 파싱 실패), API 호출 필요")
+                logger.debug("No charger update time for %s, calling KEPCO", station_id)
 
             # If DB is fresh, load charger rows to return
             if not need_api_call:
-                charger_query = """
-                    SELECT station_id, cp_id, cp_nm, cp_stat, charge_tp, cs_id, stat_update_datetime, kepco_stat_update_datetime
-                    FROM chargers 
-                    WHERE cs_id = :station_id
-                    ORDER BY cp_id
-                """
-
-                charger_result = await db.execute(text(charger_query), {"station_id": station_id})
+                with trace_stage("detail", "db_chargers"):
+                    charger_result = await STATION_CHARGERS.execute(db, {"station_id": station_id})
                 charger_rows = charger_result.fetchall()
 
                 for row in charger_rows:
@@ -1508,7 +1530,6 @@ async def get_station_charger_specs(
         
         # === 3단계: API 호출 (필요시) ===
         if need_api_call:
-            print(f"✅ KEPCO API 호출로 최신 데이터 조회...")
             # use module-level `settings` imported at top
             kepco_url = settings.EXTERNAL_STATION_API_BASE_URL
             kepco_key = settings.EXTERNAL_STATION_API_KEY
@@ -1516,221 +1537,103 @@ async def get_station_charger_specs(
             if not kepco_url or not kepco_key:
                 raise HTTPException(status_code=500, detail="KEPCO API 설정 누락")
             
-            async with httpx.AsyncClient() as client:
-                kepco_response = await client.get(
-                    kepco_url,
-                    params={
-                        "addr": addr,
-                        "apiKey": kepco_key,
-                        "returnType": "json"
-                    },
-                    timeout=30.0
-                )
-                
-                print(f"✅ KEPCO Response Status: {kepco_response.status_code}")
-                
-                if kepco_response.status_code != 200:
-                    # API 실패시 DB 데이터 사용
-                    if cached_chargers:
-                        print(f"⚠️ API 실패, 기존 DB 데이터 사용")
-                    else:
-                        raise HTTPException(
-                            status_code=502,
-                            detail=f"KEPCO API 오류: HTTP {kepco_response.status_code}"
-                        )
+            # A recent KEPCO payload of this station's area (e.g. from the
+            # search that showed the marker) is served from the csId index
+            # with its original fetch time. Otherwise concurrent requests for
+            # this addr share one upstream call.
+            kepco_error = None
+            kepco_leader = False
+            fetched_at = datetime.now(timezone.utc)
+            cached_items = await kepco_fetcher.get_cached_station_items(station_id)
+            if cached_items is not None:
+                # the search that fetched the payload wrote stations only:
+                # the chargers are persisted below with the cached fetch time
+                station_items, fetched_at = cached_items
+                kepco_data = {"data": station_items}
+                logger.info("KEPCO payload cache hit: csId=%s (%d chargers)", station_id, len(station_items))
+            else:
+                try:
+                    with trace_stage("detail", "kepco"):
+                        kepco_data, kepco_leader, fetched_at = await kepco_fetcher.fetch_by_addr(addr)
+                except KepcoAPIError as e:
+                    kepco_error = e
+            logger.info("KEPCO response: %s (csId=%s leader=%s)", f"error {kepco_error.status_code}" if kepco_error else "ok", station_id, kepco_leader)
+            
+            if kepco_error is not None:
+                # API 실패시 DB 데이터 사용
+                if cached_chargers:
+                    logger.warning("KEPCO failed for %s, using DB chargers", station_id)
                 else:
-                    kepco_data = kepco_response.json()
+                    raise HTTPException(
+                        status_code=502,
+                        detail=str(kepco_error)
+                    )
+            else:
+                # API 데이터 처리 및 DB 저장
+                if isinstance(kepco_data, dict) and "data" in kepco_data:
+                    raw_data = kepco_data["data"]
+                    updated_chargers = []
+                    # stat_update_datetime = upstream fetch time, not the time of this request
+                    now = fetched_at
                     
-                    # API 데이터 처리 및 DB 저장
-                    if isinstance(kepco_data, dict) and "data" in kepco_data:
-                        raw_data = kepco_data["data"]
-                        updated_chargers = []
-                        now = datetime.now(timezone.utc)
-                        
-                        if isinstance(raw_data, list):
-                            for item in raw_data:
-                                try:
-                                    if str(item.get("csId", "")) == station_id:
-                                        # 충전소 정보 업데이트
-                                        if not station_info:
-                                            station_info = {
-                                                "station_id": str(item.get("csId", "")),
-                                                "station_name": str(item.get("csNm", "")),
-                                                "addr": str(item.get("addr", "")),
-                                                "lat": str(item.get("lat", "")),
-                                                "lon": str(item.get("longi", ""))
-                                            }
-
-                                        # 충전기 정보 수집 (we'll respond with these freshly fetched statuses)
-                                        charger_data = {
-                                            "charger_id": str(item.get("cpId", "")),
-                                            "charger_name": str(item.get("cpNm", "")),
-                                            "status_code": str(item.get("cpStat", "")),
-                                            "charge_type": str(item.get("chargeTp", ""))
+                    station_items = []
+                    
+                    if isinstance(raw_data, list):
+                        for item in raw_data:
+                            try:
+                                if str(item.get("csId", "")) == station_id:
+                                    # 충전소 정보 업데이트
+                                    if not station_info:
+                                        station_info = {
+                                            "station_id": str(item.get("csId", "")),
+                                            "station_name": str(item.get("csNm", "")),
+                                            "addr": str(item.get("addr", "")),
+                                            "lat": str(item.get("lat", "")),
+                                            "lon": str(item.get("longi", ""))
                                         }
-                                        updated_chargers.append(charger_data)
-
-                                        # DB에 저장 (동적 데이터 갱신) - set stat_update_datetime to now
-                                        try:
-                                            # ensure we have the station DB primary key to satisfy chargers.station_id NOT NULL
-                                            station_db_id = station_info.get("station_db_id") if station_info else None
-                                            # ensure station_db_id exists (create station row if necessary)
-                                            if not station_db_id:
-                                                station_db_id = await _ensure_station_db_id(db, str(item.get("csId")), item=item, now=now)
-
-                                            # determine provider-side timestamp (if any) from API payload
-                                            provider_ts = None
-                                            provider_ts_dt = None
-                                            # Try to extract and parse provider-supplied timestamp from several possible key names.
-                                            for k in ("kepco_stat_update_datetime", "stat_update_datetime", "statUpdateDatetime", "statUpdate", "statUpdDt", "update_time", "update_dt", "lastUpdate", "stat_date", "stat_time", "cpStatTime"):
-                                                if k in item and item.get(k):
-                                                    raw_ts = item.get(k)
-                                                    # Normalize to ISO UTC when possible; otherwise keep raw string for auditing.
-                                                    try:
-                                                        # try ISO formats first
-                                                        try:
-                                                            parsed = datetime.fromisoformat(str(raw_ts))
-                                                            if parsed.tzinfo is None:
-                                                                # assume UTC if no tz provided
-                                                                parsed = parsed.replace(tzinfo=timezone.utc)
-                                                            provider_ts_dt = parsed.astimezone(timezone.utc)
-                                                            provider_ts = provider_ts_dt.isoformat()
-                                                        except Exception:
-                                                            # try common compact format YYYYMMDDHHMMSS
-                                                            try:
-                                                                parsed = datetime.strptime(str(raw_ts), "%Y%m%d%H%M%S")
-                                                                provider_ts_dt = parsed.replace(tzinfo=timezone.utc)
-                                                                provider_ts = provider_ts_dt.isoformat()
-                                                            except Exception:
-                                                                # fallback: stringify raw value
-                                                                provider_ts = str(raw_ts)
-                                                                provider_ts_dt = None
-                                                    except Exception:
-                                                        provider_ts = str(raw_ts)
-                                                        provider_ts_dt = None
-                                                    break
-
-                                            # Log notable discrepancies between provider timestamp and server fetch time for monitoring
-                                            try:
-                                                if provider_ts_dt:
-                                                    delta = now - provider_ts_dt
-                                                    # if provider timestamp differs from server fetch by >5 minutes, log it for review
-                                                    if abs(delta) > timedelta(minutes=5):
-                                                        print(f"⚠️ Provider timestamp discrepancy for csId={item.get('csId')} cpId={item.get('cpId')}: provider={provider_ts_dt.isoformat()} server_fetch={now.isoformat()} delta={delta}")
-                                            except Exception:
-                                                # non-fatal monitoring failure
-                                                pass
-
-                                            charger_insert_sql = """
-                                                INSERT INTO chargers (station_id, cp_id, cp_nm, cp_stat, charge_tp, cs_id, stat_update_datetime, kepco_stat_update_datetime)
-                                                VALUES (:station_id, :cp_id, :cp_nm, :cp_stat, :charge_tp, :cs_id, :update_time, :kepco_ts)
-                                                ON CONFLICT (cp_id) DO UPDATE SET
-                                                    station_id = COALESCE(EXCLUDED.station_id, chargers.station_id),
-                                                    cp_nm = EXCLUDED.cp_nm,
-                                                    cp_stat = EXCLUDED.cp_stat,
-                                                    charge_tp = EXCLUDED.charge_tp,
-                                                    stat_update_datetime = EXCLUDED.stat_update_datetime,
-                                                    kepco_stat_update_datetime = EXCLUDED.kepco_stat_update_datetime
-                                            """
-                                            # clear any prior aborted transaction
-                                            try:
-                                                await _clear_db_transaction(db)
-                                            except Exception:
-                                                pass
-
-                                            # Ensure we have station_db_id for the foreign key constraint
-                                            if station_db_id is not None:
-                                                try:
-                                                    await _clear_db_transaction(db)
-                                                    await db.execute(text(charger_insert_sql), {
-                                                        "station_id": station_db_id,
-                                                        "cp_id": item.get("cpId"),
-                                                        "cp_nm": item.get("cpNm"),
-                                                        "cp_stat": item.get("cpStat"),
-                                                        "charge_tp": item.get("chargeTp"),
-                                                        "cs_id": item.get("csId"),
-                                                        # stat_update_datetime stores server fetch time (now) to be used for 30-min freshness checks
-                                                        "update_time": now,
-                                                        # kepco_stat_update_datetime stores provider-supplied timestamp (if any) for auditing
-                                                        "kepco_ts": provider_ts
-                                                    })
-                                                    print(f"✅ 충전기 DB 저장 성공: cp_id={item.get('cpId')}, station_id={station_db_id}")
-                                                except Exception as db_err_inner:
-                                                    try:
-                                                        await db.rollback()
-                                                    except Exception:
-                                                        pass
-                                                    print(f"⚠️ 충전기 DB 저장 오류: {db_err_inner}")
-                                            else:
-                                                # station DB id missing -> try to create station then insert charger
-                                                try:
-                                                    await _clear_db_transaction(db)
-                                                    station_insert_sql = """
-                                                        INSERT INTO stations (cs_id, name, address, location, raw_data, last_synced_at)
-                                                        VALUES (:cs_id, :name, :address, ST_SetSRID(ST_MakePoint(:longi, :lat), 4326), :raw_data, :update_time)
-                                                        ON CONFLICT (cs_id) DO UPDATE SET
-                                                            name = EXCLUDED.name,
-                                                            address = EXCLUDED.address,
-                                                            location = EXCLUDED.location,
-                                                            raw_data = EXCLUDED.raw_data,
-                                                            last_synced_at = EXCLUDED.last_synced_at
-                                                        RETURNING id
-                                                    """
-                                                    result = await db.execute(text(station_insert_sql), {
-                                                        "cs_id": item.get("csId"),
-                                                        "name": item.get("csNm"),
-                                                        "address": item.get("addr"),
-                                                        "lat": float(item.get("lat", 0)),
-                                                        "longi": float(item.get("longi", 0)),
-                                                        "raw_data": json.dumps(item, ensure_ascii=False),
-                                                        "update_time": now
-                                                    })
-                                                    station_row = result.fetchone()
-                                                    if station_row:
-                                                        station_db_id = station_row._mapping.get("id")
-                                                        print(f"✅ 충전소 생성됨: station_id={station_db_id}")
-                                                        try:
-                                                            await db.execute(text(charger_insert_sql), {
-                                                                "station_id": station_db_id,
-                                                                "cp_id": item.get("cpId"),
-                                                                "cp_nm": item.get("cpNm"),
-                                                                "cp_stat": item.get("cpStat"),
-                                                                "charge_tp": item.get("chargeTp"),
-                                                                "cs_id": item.get("csId"),
-                                                                "update_time": now,
-                                                                "kepco_ts": provider_ts
-                                                            })
-                                                            print(f"✅ 충전기 DB 저장 재시도 성공: cp_id={item.get('cpId')}")
-                                                        except Exception as charger_retry_err:
-                                                            try:
-                                                                await db.rollback()
-                                                            except Exception:
-                                                                pass
-                                                            print(f"⚠️ 충전기 재시도 저장 실패: {charger_retry_err}")
-                                                    else:
-                                                        print(f"⚠️ 충전기 DB 저장 스킵: station DB id를 찾을 수 없음 for csId={item.get('csId')}")
-                                                except Exception as station_create_error:
-                                                    print(f"⚠️ 충전소 생성 실패: {station_create_error}")
-                                                    try:
-                                                        await _clear_db_transaction(db)
-                                                    except Exception:
-                                                        pass
-                                        except Exception as db_error:
-                                            try:
-                                                await db.rollback()
-                                            except Exception:
-                                                pass
-                                            print(f"⚠️ 충전기 DB 저장 오류: {db_error}")
-                                except Exception as item_error:
-                                    print(f"⚠️ 충전기 데이터 처리 오류: {item_error}")
-                                    continue
-                        
-                        # 트랜잭션 커밋
-                        await db.commit()
-                        # After successful update, respond using freshly fetched charger statuses
-                        cached_chargers = updated_chargers
-                        print(f"✅ 충전기 정보 DB 저장 완료: {len(updated_chargers)}개 (fresh)")
-        
+
+                                    # 충전기 정보 수집 (we'll respond with these freshly fetched statuses)
+                                    charger_data = {
+                                        "charger_id": str(item.get("cpId", "")),
+                                        "charger_name": str(item.get("cpNm", "")),
+                                        "status_code": str(item.get("cpStat", "")),
+                                        "charge_type": str(item.get("chargeTp", ""))
+                                    }
+                                    updated_chargers.append(charger_data)
+                                    station_items.append(item)
+
+                                    # Log notable discrepancies between provider timestamp and server fetch time for monitoring
+                                    provider_ts_dt = parse_kepco_timestamp(item)
+                                    if provider_ts_dt and abs(now - provider_ts_dt) > timedelta(minutes=5):
+                                        logger.warning("Provider timestamp discrepancy for csId=%s cpId=%s: provider=%s server_fetch=%s delta=%s", item.get("csId"), item.get("cpId"), provider_ts_dt, now, now - provider_ts_dt)
+                            except Exception as item_error:
+                                logger.warning("KEPCO charger item skipped: %s", item_error)
+                                continue
+                    
+                    # DB에 저장 (동적 데이터 갱신) - station + all chargers + availability, queued for the
+                    # write-behind flusher (inline when unavailable). The response uses the fetched statuses.
+                    # stat_update_datetime = upstream fetch time (30-min freshness), kepco_stat_update_datetime =
+                    # provider timestamp. Written for cached and shared payloads too: the request that fetched
+                    # them may not have written chargers, and the upserts are idempotent.
+                    if station_items:
+                        if write_behind.submit(station_items, with_chargers=True, fetched_at=now):
+                            logger.debug("Queued %d chargers of csId=%s for write-behind", len(station_items), station_id)
+                        else:
+                            try:
+                                with trace_stage("detail", "persist"):
+                                    await _clear_db_transaction(db)
+                                    await persist_kepco_items(db, station_items, with_chargers=True, now=now)
+                                logger.info("Persisted %d chargers of csId=%s inline", len(station_items), station_id)
+                            except Exception as db_error:
+                                await _clear_db_transaction(db)
+                                logger.warning("Charger persist failed: %s", db_error)
+
+                    # 트랜잭션 커밋
+                    await db.commit()
+                    # After successful update, respond using freshly fetched charger statuses
+                    cached_chargers = updated_chargers
+                    logger.debug("Responding with %d fresh chargers", len(updated_chargers))
+    
         # === 4단계: 응답 데이터 구성 ===
         if not station_info:
             raise HTTPException(status_code=404, detail="충전소 정보를 찾을 수 없습니다.")
@@ -1789,14 +1692,16 @@ async def get_station_charger_specs(
                 "available_charge_types": available_charge_types,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
-            # use configured detail TTL (30 minutes by default)
-            await redis_client.setex(cache_key, settings.CACHE_DETAIL_EXPIRE_SECONDS, json.dumps(_serialize_for_cache(cache_data), ensure_ascii=False))
-            print(f"✅ 충전소 상세 정보 Cache 저장 완료")
+            # kept through the stale-while-revalidate window; freshness is judged by "timestamp"
+            detail_cache_ttl = settings.CACHE_DETAIL_EXPIRE_SECONDS + max(settings.CACHE_DETAIL_STALE_SECONDS, 0)
+            with trace_stage("detail", "cache_write"):
+                await set_cache(cache_key, _serialize_for_cache(cache_data), expire=detail_cache_ttl, client=redis_client)
         except Exception as cache_error:
-            print(f"⚠️ Cache 저장 오류: {cache_error}")
+            logger.warning("Detail cache write failed: %s", cache_error)
         
         # Explicitly mark where the data came from so frontend can display/diagnose
         response_source = "api" if need_api_call else "database"
+        annotate(source=response_source)
 
         return {
             "station_name": station_info["station_name"],
@@ -1810,5 +1715,5 @@ async def get_station_charger_specs(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"🚨 충전기 스펙 조회 오류: {str(e)}")
+        logger.exception("Station detail failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -0,0 +1,290 @@
+"""In-process metrics registry with a Prometheus text endpoint
+
+Counters and histograms live in process memory, so recording a value costs
+no network round-trip. GET /metrics renders them in the Prometheus text
+exposition format (0.0.4). Every worker keeps its own registry; scrape each
+worker (or run a single worker per container) to aggregate.
+
+Counters created with a `redis_key` template are additionally flushed as
+deltas to Redis every METRICS_FLUSH_INTERVAL_SECONDS (one fire-and-forget
+pipeline), which keeps the deployment-wide `metrics:stations:cache_hits:*`
+counters without an INCR per request.
+
+Usage:
+    with STAGE_SECONDS.time(endpoint="search", stage="db_query"):
+        rows = await ...
+    SEARCH_RESULTS.inc(source="cache")
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# seconds; covers sub-millisecond cache hits up to slow upstream calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter; optionally mirrored to Redis (see module docstring)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), redis_key: Optional[str] = None):
+        super().__init__(name, documentation, labelnames)
+        # e.g. "metrics:stations:cache_hits:{source}", formatted with the labels
+        self.redis_key = redis_key
+        self._values: Dict[LabelValues, float] = {}
+        self._flushed: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def take_deltas(self) -> Dict[str, int]:
+        """Redis key -> increase since the last call (whole units only)"""
+        deltas: Dict[str, int] = {}
+        if self.redis_key is None:
+            return deltas
+        for key, value in self._values.items():
+            delta = int(value - self._flushed.get(key, 0))
+            if delta > 0:
+                deltas[self.redis_key.format(**dict(zip(self.labelnames, key)))] = delta
+                self._flushed[key] = self._flushed.get(key, 0) + delta
+        return deltas
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values (seconds by convention)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        counts = series[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the block (also when it raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value read at scrape time from a callback returning {label values: value}"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], fn: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+
+    def _samples(self) -> List[str]:
+        try:
+            values = self.fn()
+        except Exception as e:
+            logger.debug("Gauge %s unavailable: %s", self.name, e)
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+            if value is not None
+        ]
+
+
+class MetricsRegistry:
+    """Named metrics of this process + Prometheus rendering and Redis flushing"""
+
+    def __init__(self, flush_interval_seconds: Optional[float] = None):
+        self.flush_interval_seconds = float(flush_interval_seconds or settings.METRICS_FLUSH_INTERVAL_SECONDS)
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), redis_key: Optional[str] = None) -> Counter:
+        return self._register(Counter(name, documentation, labelnames, redis_key))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str], fn: Callable[[], Dict[LabelValues, float]]) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def flush_to_redis(self):
+        """Push counter deltas with a redis_key to Redis (fire-and-forget)"""
+        from app.redis_client import incr_counters
+
+        deltas: Dict[str, int] = {}
+        for metric in self._metrics.values():
+            if isinstance(metric, Counter):
+                deltas.update(metric.take_deltas())
+        if deltas:
+            incr_counters(deltas)
+
+    async def run_flusher(self) -> None:
+        """Background loop: flush_to_redis() every flush_interval_seconds"""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval_seconds)
+                try:
+                    self.flush_to_redis()
+                except Exception as e:
+                    logger.warning("Metrics flush failed: %s", e)
+        finally:
+            # last partial interval on shutdown
+            with contextlib.suppress(Exception):
+                self.flush_to_redis()
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+# --------------------------
+# Metrics of the app
+# --------------------------
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "eon_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code",
+    ("route", "method", "status"),
+)
+STAGE_SECONDS = metrics.histogram(
+    "eon_request_stage_duration_seconds",
+    "Latency of each stage of the station search/detail endpoints",
+    ("endpoint", "stage"),
+)
+SEARCH_RESULTS = metrics.counter(
+    "eon_station_search_results",
+    "Station searches by the tier that answered (memory, tile, db, api)",
+    ("source",),
+    redis_key="metrics:stations:cache_hits:{source}",
+)
+CACHE_LOOKUPS = metrics.counter(
+    "eon_cache_lookups",
+    "get_cache()/get_many() lookups by tier (l1 = worker memory, l2 = Redis) and result",
+    ("tier", "result"),
+)
+KEPCO_REQUEST_SECONDS = metrics.histogram(
+    "eon_kepco_request_duration_seconds",
+    "Upstream KEPCO EVchargeManage.do call latency by outcome",
+    ("outcome",),
+)
+PERSIST_SECONDS = metrics.histogram(
+    "eon_kepco_persist_duration_seconds",
+    "Bulk upsert latency of KEPCO items (stations, optionally chargers)",
+    ("with_chargers",),
+)
+REDIS_POOL_WAIT_SECONDS = metrics.histogram(
+    "eon_redis_pool_wait_seconds",
+    "Time to obtain a Redis connection from the pool",
+    ("client",),
+)
+DB_POOL_WAIT_SECONDS = metrics.histogram(
+    "eon_db_pool_wait_seconds",
+    "Time to check out a DB connection from the SQLAlchemy pool (includes connecting)",
+    ("engine",),
+)
+DB_QUERY_SECONDS = metrics.histogram(
+    "eon_db_query_duration_seconds",
+    "Latency of the registered raw SQL queries by name (app/db/queries.py)",
+    ("query",),
+)
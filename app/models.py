@@ -94,6 +94,25 @@ class Charger(Base):
     __table_args__ = (UniqueConstraint('station_id', 'charger_code', name='_station_charger_uc'),)
     station: Mapped['Station'] = relationship(back_populates="chargers")
 
+# ------------------ StationAvailability ------------------
+class StationAvailability(Base):
+    """Denormalized per-station charger counts.
+
+    Maintained by the charger write paths (see
+    app.repository.station_repository.StationAvailabilityRepository) so search
+    can read counts with one indexed lookup instead of aggregating chargers.
+    """
+    __tablename__ = "station_availability"
+
+    cs_id: Mapped[str] = mapped_column(String(50), primary_key=True)  # KEPCO station ID
+    total_chargers: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    available_chargers: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    fast_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    fast_available: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    slow_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    slow_available: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
 # ------------------ ApiLog ------------------
 class ApiLog(Base):
     __tablename__ = "api_logs"
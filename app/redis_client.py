@@ -1,33 +1,196 @@
+import asyncio
 import json
-from typing import Any, Optional
-from redis.asyncio import Redis
+import logging
+import uuid
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from redis.asyncio import BlockingConnectionPool, Redis
 from .core.config import settings
+from .metrics import CACHE_LOOKUPS, REDIS_POOL_WAIT_SECONDS
+from .services.l1_cache import l1_cache, MISSING
+
+# Optional faster serializers / compressor (fall back to json / zlib)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
 
 redis_pool: Optional[Redis] = None
+# Same server, raw bytes (decode_responses=False) for compressed payloads
+redis_binary_pool: Optional[Redis] = None
+
+
+# --------------------------
+# Cache value codec
+# --------------------------
+# Encoded values are: CODEC_VERSION byte, flags byte, body.
+#   flags & 0x0F: serializer (0 = JSON, 1 = msgpack)
+#   flags >> 4:   compression (0 = none, 1 = zlib, 2 = zstd)
+# Bodies shorter than REDIS_CACHE_COMPRESS_MIN_BYTES are stored uncompressed.
+# Values without the version byte are legacy JSON strings and still decoded,
+# so keys written before the rollout stay readable until they expire.
+CODEC_VERSION = 1
+SERIALIZER_JSON, SERIALIZER_MSGPACK = 0, 1
+COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD = 0, 1, 2
+
+
+def _pick_serializer(name: str) -> int:
+    if name == "msgpack" or (name == "auto" and msgpack is not None):
+        if msgpack is None:
+            raise RuntimeError("REDIS_CACHE_CODEC=msgpack but the 'msgpack' package is not installed")
+        return SERIALIZER_MSGPACK
+    return SERIALIZER_JSON
+
+
+def _pick_compression(name: str) -> int:
+    if name == "zstd" or (name == "auto" and zstandard is not None):
+        if zstandard is None:
+            raise RuntimeError("REDIS_CACHE_COMPRESSION=zstd but the 'zstandard' package is not installed")
+        return COMPRESSION_ZSTD
+    if name == "none":
+        return COMPRESSION_NONE
+    return COMPRESSION_ZLIB
+
+
+def _serialize(value: Any, serializer: int) -> bytes:
+    if serializer == SERIALIZER_MSGPACK:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(body: bytes, serializer: int) -> Any:
+    if serializer == SERIALIZER_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack-encoded cache value but 'msgpack' is not installed")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def encode_value(value: Any, serializer: Optional[str] = None, compression: Optional[str] = None) -> bytes:
+    """Encode a cache value with the configured codec (see CODEC_VERSION)"""
+    ser = _pick_serializer(serializer or settings.REDIS_CACHE_CODEC)
+    comp = _pick_compression(compression or settings.REDIS_CACHE_COMPRESSION)
+    body = _serialize(value, ser)
+    if comp != COMPRESSION_NONE and len(body) >= settings.REDIS_CACHE_COMPRESS_MIN_BYTES:
+        if comp == COMPRESSION_ZSTD:
+            body = zstandard.ZstdCompressor(level=settings.REDIS_CACHE_ZSTD_LEVEL).compress(body)
+        else:
+            body = zlib.compress(body, settings.REDIS_CACHE_ZLIB_LEVEL)
+    else:
+        comp = COMPRESSION_NONE
+    return bytes((CODEC_VERSION, ser | (comp << 4))) + body
+
+
+def decode_value(raw: Optional[bytes]) -> Any:
+    """Decode a cache value written by encode_value() or a legacy JSON string.
+
+    Raises ValueError for undecodable values.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if not raw:
+        return None
+    if raw[0] != CODEC_VERSION:
+        # legacy: plain JSON text
+        return json.loads(raw.decode("utf-8"))
+    if len(raw) < 2:
+        raise ValueError("truncated cache value")
+    ser, comp = raw[1] & 0x0F, raw[1] >> 4
+    body = raw[2:]
+    try:
+        if comp == COMPRESSION_ZLIB:
+            body = zlib.decompress(body)
+        elif comp == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstd-compressed cache value but 'zstandard' is not installed")
+            body = zstandard.ZstdDecompressor().decompress(body)
+        elif comp != COMPRESSION_NONE:
+            raise ValueError(f"unknown cache compression {comp}")
+    except zlib.error as e:
+        raise ValueError(f"corrupt cache value: {e}") from e
+    return _deserialize(body, ser)
+
+
+def codec_info() -> Tuple[str, str]:
+    """(serializer, compression) used for new cache values"""
+    ser = _pick_serializer(settings.REDIS_CACHE_CODEC)
+    comp = _pick_compression(settings.REDIS_CACHE_COMPRESSION)
+    return (
+        "msgpack" if ser == SERIALIZER_MSGPACK else ("orjson" if orjson is not None else "json"),
+        {COMPRESSION_NONE: "none", COMPRESSION_ZLIB: "zlib", COMPRESSION_ZSTD: "zstd"}[comp],
+    )
+
+class _TimedConnectionPool(BlockingConnectionPool):
+    """BlockingConnectionPool recording the connection wait (REDIS_POOL_WAIT_SECONDS)"""
+
+    def __init__(self, *args, client_name: str = "text", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client_name = client_name
+
+    async def get_connection(self, *args, **kwargs):
+        with REDIS_POOL_WAIT_SECONDS.time(client=self.client_name):
+            return await super().get_connection(*args, **kwargs)
+
+def _make_client(decode_responses: bool) -> Redis:
+    """Client over its own bounded pool (REDIS_MAX_CONNECTIONS, timeouts, health checks).
+
+    Callers wait up to REDIS_POOL_TIMEOUT_SECONDS for a free connection
+    instead of failing when the pool is exhausted.
+    """
+    pool = _TimedConnectionPool(
+        client_name="text" if decode_responses else "binary",
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=0,
+        password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+        decode_responses=decode_responses,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS or None,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS or None,
+        socket_keepalive=True,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+    )
+    return Redis.from_pool(pool)
 
 async def init_redis_pool():
-    global redis_pool
+    global redis_pool, redis_binary_pool
     try:
-        redis_pool = Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=0,
-            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
-            decode_responses=True,
-        )
+        redis_pool = _make_client(decode_responses=True)
         await redis_pool.ping()
+        redis_binary_pool = _make_client(decode_responses=False)
         try:
             info = await redis_pool.info()
             # pick a few helpful fields for startup logs
             mem = info.get("used_memory_human") or info.get("used_memory")
             clients = info.get("connected_clients")
             role = info.get("role")
-            print(f"Redis connected ({settings.REDIS_HOST}:{settings.REDIS_PORT}) role={role} clients={clients} mem={mem}")
+            logger.info(
+                "Redis connected (%s:%s) role=%s clients=%s mem=%s max_connections=%s",
+                settings.REDIS_HOST, settings.REDIS_PORT, role, clients, mem, settings.REDIS_MAX_CONNECTIONS,
+            )
         except Exception:
-            print(f"Redis connected ({settings.REDIS_HOST}:{settings.REDIS_PORT}) (info unavailable)")
+            logger.info("Redis connected (%s:%s) (info unavailable)", settings.REDIS_HOST, settings.REDIS_PORT)
     except Exception as e:
-        print(f"Redis connection failed ({settings.REDIS_HOST}:{settings.REDIS_PORT}): {e}")
+        logger.error("Redis connection failed (%s:%s): %s", settings.REDIS_HOST, settings.REDIS_PORT, e)
         redis_pool = None
+        redis_binary_pool = None
 
 
 async def get_redis_info() -> dict:
@@ -46,27 +209,182 @@ async def get_redis_info() -> dict:
         return {"ok": False, "error": str(e)}
 
 async def close_redis_pool():
-    global redis_pool
+    global redis_pool, redis_binary_pool
+    if _counter_tasks:
+        await asyncio.gather(*_counter_tasks, return_exceptions=True)
     if redis_pool:
-        await redis_pool.close()
+        await redis_pool.aclose()
         redis_pool = None
+    if redis_binary_pool:
+        await redis_binary_pool.aclose()
+        redis_binary_pool = None
 
 async def get_redis_client() -> Optional[Redis]:
     return redis_pool
 
+async def get_redis_binary_client() -> Optional[Redis]:
+    """Client returning raw bytes (for compressed values)"""
+    return redis_binary_pool
+
 async def get_cache(key: str, client: Optional[Redis] = None) -> Any:
-    current_client = client or redis_pool
+    """Decoded value of `key`: per-worker L1 first, then Redis.
+
+    Values are read with the binary client and decoded with decode_value(),
+    so both codec-encoded and legacy JSON keys work. `client` is only used
+    when no binary pool is available (it must then hold legacy JSON).
+    The returned object may be shared with other callers - do not mutate it.
+    """
+    cached = l1_cache.get(key)
+    if cached is not MISSING:
+        CACHE_LOOKUPS.inc(tier="l1", result="hit")
+        return cached
+    current_client = redis_binary_pool or client
     if current_client is None:
         return None
     data = await current_client.get(key)
-    return json.loads(data) if data else None
+    if not data:
+        l1_cache.record_miss()
+        CACHE_LOOKUPS.inc(tier="l2", result="miss")
+        return None
+    l1_cache.record_l2_hit()
+    CACHE_LOOKUPS.inc(tier="l2", result="hit")
+    value = decode_value(data)
+    l1_cache.put(key, value, len(data))
+    return value
 
 async def set_cache(key: str, value: Any, expire: int = settings.CACHE_EXPIRE_SECONDS, client: Optional[Redis] = None):
-    current_client = client or redis_pool
-    if current_client is None:
-        return
-    await current_client.set(key, json.dumps(value, default=str), ex=expire)
+    """Write `key` (codec-encoded) to Redis and L1, and invalidate the L1 copies of other workers"""
+    # SET + invalidation PUBLISH in one pipeline
+    await set_many([(key, value, expire)], client=client)
 
 async def delete_cache(key: str):
     if redis_pool:
         await redis_pool.delete(key)
+    await l1_cache.invalidate(redis_pool, key)
+
+# --------------------------
+# Batch operations (one round-trip each)
+# --------------------------
+async def get_many(keys: Iterable[str], client: Optional[Redis] = None, use_l1: bool = True) -> Dict[str, Any]:
+    """Decoded values of `keys` that exist: L1 first, the rest in one MGET.
+
+    Missing and undecodable keys are absent from the result. Set
+    use_l1=False for large values that should not occupy the L1 budget.
+    Returned objects may be shared - do not mutate them.
+    """
+    result: Dict[str, Any] = {}
+    remote: List[str] = []
+    for key in dict.fromkeys(keys):
+        cached = l1_cache.get(key) if use_l1 else MISSING
+        if cached is MISSING:
+            remote.append(key)
+        else:
+            result[key] = cached
+            CACHE_LOOKUPS.inc(tier="l1", result="hit")
+    current_client = redis_binary_pool or client
+    if not remote or current_client is None:
+        return result
+    for key, data in zip(remote, await current_client.mget(remote)):
+        if not data:
+            if use_l1:
+                l1_cache.record_miss()
+            CACHE_LOOKUPS.inc(tier="l2", result="miss")
+            continue
+        try:
+            value = decode_value(data)
+        except ValueError as e:
+            logger.warning("Undecodable cache value for %s (treated as missing): %s", key, e)
+            continue
+        result[key] = value
+        CACHE_LOOKUPS.inc(tier="l2", result="hit")
+        if use_l1:
+            l1_cache.record_l2_hit()
+            l1_cache.put(key, value, len(data))
+    return result
+
+async def set_many(
+    entries: Iterable[Tuple[str, Any, int]],
+    client: Optional[Redis] = None,
+    use_l1: bool = True,
+):
+    """Write (key, value, ttl_seconds) entries in one pipeline.
+
+    With use_l1 the L1 invalidations of all keys are published in the same
+    pipeline and this worker's L1 is updated afterwards.
+    """
+    current_client = redis_binary_pool or client
+    if current_client is None:
+        return
+    encoded = [(key, encode_value(value), ttl) for key, value, ttl in entries]
+    if not encoded:
+        return
+    pipe = current_client.pipeline(transaction=False)
+    for key, data, ttl in encoded:
+        pipe.set(key, data, ex=ttl)
+    if use_l1:
+        l1_cache.queue_invalidations(pipe, [key for key, _, _ in encoded])
+    await pipe.execute()
+    if use_l1:
+        for key, data, ttl in encoded:
+            l1_cache.put(key, decode_value(data), len(data), ttl_seconds=ttl)
+
+# strong references to in-flight counter writes (see incr_counters)
+_counter_tasks: Set[asyncio.Task] = set()
+
+def incr_counters(counters: Dict[str, int]):
+    """Fire-and-forget INCRBY of several counters in one pipeline.
+
+    Returns immediately; the write runs in the background and failures are
+    only logged, so metrics never add latency to (or fail) a request.
+    """
+    if redis_pool is None or not counters:
+        return
+    task = asyncio.ensure_future(_incr_counters(dict(counters)))
+    _counter_tasks.add(task)
+    task.add_done_callback(_counter_tasks.discard)
+
+async def _incr_counters(counters: Dict[str, int]):
+    try:
+        pipe = redis_pool.pipeline(transaction=False)
+        for key, amount in counters.items():
+            pipe.incrby(key, amount)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Counter increment failed (ignored): %s", e)
+
+# --------------------------
+# Leases (single_flight, swr)
+# --------------------------
+# Delete the lease only if we still own it
+_RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+async def acquire_lease(client: Redis, key: str, ttl_seconds: int) -> Optional[str]:
+    """SET NX EX a random token on `key`; return the token if acquired (Redis errors propagate)"""
+    token = uuid.uuid4().hex
+    if await client.set(key, token, nx=True, ex=ttl_seconds):
+        return token
+    return None
+
+async def release_lease(client: Redis, key: str, token: str) -> bool:
+    """Delete `key` if it still holds `token` (best-effort; the TTL expires it otherwise)"""
+    try:
+        return bool(await client.eval(_RELEASE_LEASE_SCRIPT, 1, key, token))
+    except Exception as e:
+        logger.warning("Lease release failed for %s: %s", key, e)
+        return False
+
+def pool_usage() -> Dict[Tuple[str, str], int]:
+    """(client, state) -> connections, for the /metrics gauges"""
+    usage: Dict[Tuple[str, str], int] = {}
+    for name, client in (("text", redis_pool), ("binary", redis_binary_pool)):
+        if client is None:
+            continue
+        pool = client.connection_pool
+        usage[(name, "in_use")] = len(getattr(pool, "_in_use_connections", ()))
+        usage[(name, "max")] = pool.max_connections
+    return usage
@@ -1,18 +1,148 @@
 """Repository for Station and Charger data access"""
 
+import json
 import logging
-from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, text
+from sqlalchemy import select, and_, or_, func
 from sqlalchemy.orm import selectinload
 from geoalchemy2.functions import ST_DWithin, ST_GeogFromText, ST_SetSRID, ST_MakePoint
 
+# The SQL lives in the query registry; the *_SQL strings stay importable from
+# here for the batch and benchmark scripts.
+from app.db.queries import (
+    ADOPT_LEGACY_CHARGERS,
+    ADOPT_LEGACY_CHARGERS_SQL,
+    BULK_UPSERT_CHARGERS,
+    BULK_UPSERT_CHARGERS_SQL,
+    BULK_UPSERT_STATIONS,
+    BULK_UPSERT_STATIONS_SQL,
+    GET_STATION_AVAILABILITY,
+    GET_STATION_AVAILABILITY_SQL,
+    NEARBY_STATIONS,
+    NEARBY_STATIONS_AFTER,
+    NEARBY_STATIONS_SQL,
+    REFRESH_STATION_AVAILABILITY,
+    REFRESH_STATION_AVAILABILITY_SQL,
+    STALE_CHARGERS,
+    STALE_CHARGERS_SQL,
+)
 from app.models import Station, Charger
 
 logger = logging.getLogger(__name__)
 
 
+# provider timestamp keys seen in KEPCO payloads, in order of preference
+KEPCO_TIMESTAMP_KEYS = (
+    "kepco_stat_update_datetime", "stat_update_datetime", "statUpdateDatetime", "statUpdate",
+    "statUpdDt", "update_time", "update_dt", "lastUpdate", "stat_date", "stat_time", "cpStatTime",
+)
+
+
+def _kepco_str(item: Dict[str, Any], *keys: str) -> Optional[str]:
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _kepco_coord(item: Dict[str, Any], *keys: str) -> Optional[float]:
+    raw = _kepco_str(item, *keys)
+    try:
+        value = float(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+    return value if value else None
+
+
+def parse_kepco_timestamp(item: Dict[str, Any]) -> Optional[datetime]:
+    """Provider-side status timestamp of a KEPCO item as aware UTC datetime"""
+    raw = _kepco_str(item, *KEPCO_TIMESTAMP_KEYS)
+    if raw is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(raw)
+    except ValueError:
+        parsed = None
+        for fmt in ("%Y%m%d%H%M%S", "%Y-%m-%d %H:%M:%S"):
+            try:
+                parsed = datetime.strptime(raw, fmt)
+                break
+            except ValueError:
+                continue
+        if parsed is None:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def kepco_station_params(items: List[Dict[str, Any]], synced_at: datetime) -> Dict[str, Any]:
+    """Array parameters of BULK_UPSERT_STATIONS_SQL (one row per csId, last item wins)"""
+    by_cs_id: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        cs_id = _kepco_str(item, "csId", "Csid")
+        if cs_id:
+            by_cs_id[cs_id] = item
+    params: Dict[str, Any] = {
+        "cs_ids": [], "names": [], "addresses": [], "lats": [], "lons": [], "raw_data": [],
+        "synced_at": synced_at,
+    }
+    for cs_id, item in by_cs_id.items():
+        params["cs_ids"].append(cs_id)
+        params["names"].append(_kepco_str(item, "csNm", "Csnm", "csnm"))
+        params["addresses"].append(_kepco_str(item, "addr", "Addr"))
+        params["lats"].append(_kepco_coord(item, "lat", "Lat"))
+        params["lons"].append(_kepco_coord(item, "longi", "Longi", "long"))
+        params["raw_data"].append(json.dumps(item, ensure_ascii=False))
+    return params
+
+
+def kepco_charger_params(items: List[Dict[str, Any]], fetched_at: datetime) -> Dict[str, Any]:
+    """Array parameters of BULK_UPSERT_CHARGERS_SQL (one row per cpId, last item wins)"""
+    by_cp_id: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        cp_id = _kepco_str(item, "cpId", "Cpid")
+        if cp_id and _kepco_str(item, "csId", "Csid"):
+            by_cp_id[cp_id] = item
+    params: Dict[str, Any] = {
+        "cp_ids": [], "cs_ids": [], "cp_nms": [], "cp_stats": [], "charge_tps": [], "cp_tps": [],
+        "kepco_ts": [], "fetched_at": fetched_at,
+    }
+    for cp_id, item in by_cp_id.items():
+        params["cp_ids"].append(cp_id)
+        params["cs_ids"].append(_kepco_str(item, "csId", "Csid"))
+        params["cp_nms"].append(_kepco_str(item, "cpNm"))
+        params["cp_stats"].append(_kepco_str(item, "cpStat"))
+        params["charge_tps"].append(_kepco_str(item, "chargeTp", "Cptp"))
+        params["cp_tps"].append(_kepco_str(item, "cpTp"))
+        params["kepco_ts"].append(parse_kepco_timestamp(item))
+    return params
+
+
+def kepco_upsert_statements(
+    items: List[Dict[str, Any]], now: datetime, include_chargers: bool = True
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """(sql, params) pairs persisting a KEPCO payload, in execution order.
+
+    Used by the repositories and by the synchronous batch scripts, which run
+    them on their own connection. Includes the station_availability refresh.
+    """
+    station_params = kepco_station_params(items, now)
+    if not station_params["cs_ids"]:
+        return []
+    statements = [(BULK_UPSERT_STATIONS_SQL, station_params)]
+    if include_chargers:
+        charger_params = kepco_charger_params(items, now)
+        if charger_params["cp_ids"]:
+            statements.append((ADOPT_LEGACY_CHARGERS_SQL, {"cp_ids": charger_params["cp_ids"]}))
+            statements.append((BULK_UPSERT_CHARGERS_SQL, charger_params))
+            statements.append((REFRESH_STATION_AVAILABILITY_SQL, {"cs_ids": sorted(set(charger_params["cs_ids"]))}))
+    return statements
+
+
 class StationRepository:
     """Repository for Station data operations"""
     
@@ -67,74 +197,57 @@ class StationRepository:
         )
         return result.scalars().all()
     
-    async def upsert_from_kepco_data(self, station_data: Dict[str, Any]) -> Station:
+    async def search_nearby(
+        self, lat: float, lon: float, radius_m: int, limit: int, offset: int = 0
+    ) -> List[Dict[str, Any]]:
         """
-        Insert or update station from KEPCO API data
+        Nearest-first radius search (index-backed KNN, see NEARBY_STATIONS_SQL)
         
-        Args:
-            station_data: Parsed station data from KEPCO API
-            
         Returns:
-            Created or updated Station instance
+            Row mappings with station_id, addr, station_name, lat, lon,
+            sort_distance (meters), total_chargers and available_chargers
+        """
+        result = await NEARBY_STATIONS.execute(
+            self.db,
+            {"lat": lat, "lon": lon, "radius_m": radius_m, "limit": limit, "offset": offset}
+        )
+        return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def search_nearby_after(
+        self, lat: float, lon: float, radius_m: int, limit: int, after: Tuple[float, str]
+    ) -> List[Dict[str, Any]]:
         """
-        cs_id = station_data["cs_id"]
-        existing = await self.get_by_cs_id(cs_id)
+        Keyset page of the radius search: stations after `after`
+        (sort_distance, station_id), ordered by that key
         
-        now = datetime.now(timezone.utc)
+        Returns:
+            Row mappings as search_nearby()
+        """
+        result = await NEARBY_STATIONS_AFTER.execute(
+            self.db,
+            {
+                "lat": lat, "lon": lon, "radius_m": radius_m, "limit": limit,
+                "after_distance": after[0], "after_station_id": after[1],
+            }
+        )
+        return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def upsert_many(self, items: List[Dict[str, Any]], synced_at: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Upsert the stations of a KEPCO payload in one statement
         
-        if existing:
-            # Update existing station
-            existing.cs_nm = station_data.get("cs_nm", existing.cs_nm)
-            existing.addr = station_data.get("addr", existing.addr)
-            existing.lat = station_data.get("lat", existing.lat)
-            existing.longi = station_data.get("longi", existing.longi)
-            existing.static_data_updated_at = now
-            existing.updated_at = now
-            
-            # Update PostGIS location if coordinates available
-            if existing.lat and existing.longi:
-                try:
-                    lat_float = float(existing.lat)
-                    lon_float = float(existing.longi)
-                    point_wkt = f"SRID=4326;POINT({lon_float} {lat_float})"
-                    await self.db.execute(
-                        text("UPDATE stations SET location = ST_GeomFromEWKT(:point) WHERE id = :station_id"),
-                        {"point": point_wkt, "station_id": existing.id}
-                    )
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to update location for station {cs_id}: {e}")
-            
-            station = existing
-        else:
-            # Create new station
-            station = Station(
-                station_code=cs_id,  # Use cs_id as station_code for uniqueness
-                name=station_data.get("cs_nm", ""),
-                cs_id=cs_id,
-                cs_nm=station_data.get("cs_nm", ""),
-                addr=station_data.get("addr", ""),
-                lat=station_data.get("lat", ""),
-                longi=station_data.get("longi", ""),
-                provider="KEPCO",
-                static_data_updated_at=now,
-                created_at=now,
-                updated_at=now
-            )
-            
-            # Set PostGIS location if coordinates available
-            if station.lat and station.longi:
-                try:
-                    lat_float = float(station.lat)
-                    lon_float = float(station.longi)
-                    point_wkt = f"SRID=4326;POINT({lon_float} {lat_float})"
-                    station.location = text(f"ST_GeomFromEWKT('{point_wkt}')")
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to set location for new station {cs_id}: {e}")
+        Args:
+            items: Raw KEPCO items (one per charger; deduplicated by csId)
+            synced_at: last_synced_at to record (default: now)
             
-            self.db.add(station)
-        
-        await self.db.flush()  # Get ID for new stations
-        return station
+        Returns:
+            {cs_id: station DB id}
+        """
+        params = kepco_station_params(items, synced_at or datetime.now(timezone.utc))
+        if not params["cs_ids"]:
+            return {}
+        result = await BULK_UPSERT_STATIONS.execute(self.db, params)
+        return {str(row._mapping["cs_id"]): row._mapping["id"] for row in result.fetchall()}
 
 
 class ChargerRepository:
@@ -164,83 +277,83 @@ class ChargerRepository:
         )
         return result.scalars().all()
     
-    async def upsert_from_kepco_data(self, charger_data: Dict[str, Any], station: Station) -> Charger:
+    async def upsert_many(self, items: List[Dict[str, Any]], fetched_at: Optional[datetime] = None) -> int:
         """
-        Insert or update charger from KEPCO API data
+        Upsert the chargers of a KEPCO payload in a constant number of statements
+        
+        Parent stations must exist (see StationRepository.upsert_many); items
+        of unknown stations are skipped. stat_update_datetime is set to
+        `fetched_at` (server fetch time, used by the 30-minute freshness rule).
         
-        Args:
-            charger_data: Parsed charger data from KEPCO API
-            station: Parent station instance
-            
         Returns:
-            Created or updated Charger instance
+            Number of chargers written
         """
-        cp_id = charger_data["cp_id"]
-        existing = await self.get_by_cp_id(cp_id)
-        
-        now = datetime.now(timezone.utc)
+        params = kepco_charger_params(items, fetched_at or datetime.now(timezone.utc))
+        if not params["cp_ids"]:
+            return 0
+        await ADOPT_LEGACY_CHARGERS.execute(self.db, {"cp_ids": params["cp_ids"]})
+        result = await BULK_UPSERT_CHARGERS.execute(self.db, params)
+        return len(result.fetchall())
+    
+    async def get_stale_chargers(
+        self, threshold_minutes: int = 30, batch_size: int = 500
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Stream chargers with stale dynamic data (status updates older than threshold)
         
-        # Parse KEPCO datetime string to datetime object
-        kepco_datetime_str = charger_data.get("kepco_stat_update_datetime", "")
-        stat_update_datetime = None
-        if kepco_datetime_str:
-            try:
-                # Assuming KEPCO uses format like "2023-10-23 14:30:00"
-                stat_update_datetime = datetime.strptime(kepco_datetime_str, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-            except ValueError:
-                logger.warning(f"Failed to parse KEPCO datetime: {kepco_datetime_str}")
+        Rows are read in keyset-paginated batches (by charger id) instead of
+        loading every stale ORM object at once; each row carries what a
+        refresh needs: id, cp_id, cs_id, address, lat, lon, stat_update_datetime.
         
-        if existing:
-            # Update existing charger
-            existing.cp_nm = charger_data.get("cp_nm", existing.cp_nm)
-            existing.charge_tp = charger_data.get("charge_tp", existing.charge_tp)
-            existing.cp_tp = charger_data.get("cp_tp", existing.cp_tp)
-            existing.cp_stat = charger_data.get("cp_stat", existing.cp_stat)  # Dynamic data
-            existing.kepco_stat_update_datetime = kepco_datetime_str
-            existing.stat_update_datetime = stat_update_datetime
-            existing.updated_at = now
+        Args:
+            threshold_minutes: Staleness threshold in minutes
+            batch_size: Rows per batch
             
-            charger = existing
-        else:
-            # Create new charger
-            charger = Charger(
-                station_id=station.id,
-                charger_code=cp_id,  # Use cp_id as charger_code
-                cp_id=cp_id,
-                cp_nm=charger_data.get("cp_nm", ""),
-                charge_tp=charger_data.get("charge_tp", ""),
-                cp_tp=charger_data.get("cp_tp", ""),
-                cp_stat=charger_data.get("cp_stat", ""),
-                kepco_stat_update_datetime=kepco_datetime_str,
-                stat_update_datetime=stat_update_datetime,
-                cs_id=charger_data.get("cs_id", ""),
-                created_at=now,
-                updated_at=now
+        Yields:
+            Lists of at most batch_size rows
+        """
+        threshold_time = datetime.now(timezone.utc) - timedelta(minutes=threshold_minutes)
+        after_id = 0
+        while True:
+            result = await STALE_CHARGERS.execute(
+                self.db, {"threshold": threshold_time, "after_id": after_id, "limit": batch_size}
             )
-            
-            self.db.add(charger)
+            rows = result.fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]._mapping["id"]
+
+
+class StationAvailabilityRepository:
+    """Repository for the denormalized station_availability counts"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def refresh(self, cs_ids: List[str]) -> None:
+        """
+        Recompute availability counts for the given stations
         
-        return charger
+        Call after chargers of these stations were inserted or updated,
+        inside the same transaction as the charger writes.
+        """
+        cs_ids = sorted({str(cs_id) for cs_id in cs_ids if cs_id})
+        if not cs_ids:
+            return
+        await REFRESH_STATION_AVAILABILITY.execute(self.db, {"cs_ids": cs_ids})
     
-    async def get_stale_chargers(self, threshold_minutes: int = 30) -> List[Charger]:
+    async def get_many(self, cs_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Get chargers with stale dynamic data (status updates older than threshold)
+        Batched lookup of availability counts
         
-        Args:
-            threshold_minutes: Staleness threshold in minutes
-            
         Returns:
-            List of chargers needing status updates
+            {cs_id: row mapping}; stations without a row are absent
         """
-        from datetime import timedelta
-        threshold_time = datetime.now(timezone.utc) - timedelta(minutes=threshold_minutes)
-        
-        result = await self.db.execute(
-            select(Charger).where(
-                or_(
-                    Charger.stat_update_datetime.is_(None),
-                    Charger.stat_update_datetime < threshold_time
-                )
-            )
-        )
-        return result.scalars().all()
\ No newline at end of file
+        cs_ids = [str(cs_id) for cs_id in cs_ids if cs_id]
+        if not cs_ids:
+            return {}
+        result = await GET_STATION_AVAILABILITY.execute(self.db, {"cs_ids": cs_ids})
+        return {str(row._mapping["cs_id"]): dict(row._mapping) for row in result.fetchall()}
@@ -0,0 +1,177 @@
+"""Background refresh of stale charger statuses
+
+The detail endpoint treats charger statuses older than 30 minutes as stale
+and calls KEPCO before answering. This refresher keeps them fresh ahead of
+time: every CHARGER_REFRESH_INTERVAL_SECONDS it streams chargers older than
+CHARGER_REFRESH_STALE_MINUTES (below the 30-minute rule), groups their
+stations by KEPCO search addr (offline reverse geocoder, else the station's
+stored address, e.g. "성남시 분당구"),
+and refetches each addr once with bounded concurrency and a minimum spacing
+between upstream calls. Payloads are persisted through the write-behind
+queue (inline when it is not running).
+
+Fetches go through kepco_fetcher, so a refresh coalesces with concurrent
+searches, detail requests and refreshers of other workers on the same addr.
+Whoever fetched it, a payload newer than the stale cutoff is persisted
+(idempotent upserts): a search that fetched the addr wrote stations only.
+
+Runs inside the API process (lifespan) or standalone via
+scripts/refresh_stale_chargers.py.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.repository.station_repository import ChargerRepository
+from app.services.kepco_fetch import kepco_fetcher
+from app.services.reverse_geocoder import reverse_geocoder, search_addr_from_address
+from app.services.write_behind import persist_kepco_items, write_behind
+
+logger = logging.getLogger(__name__)
+
+
+class ChargerStatusRefresher:
+    """Periodic, rate-limited KEPCO refresh of stale chargers grouped by addr"""
+
+    def __init__(
+        self,
+        interval_seconds: Optional[int] = None,
+        stale_minutes: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        min_call_interval_seconds: Optional[float] = None,
+        max_addrs_per_run: Optional[int] = None,
+    ):
+        self.interval_seconds = int(interval_seconds or settings.CHARGER_REFRESH_INTERVAL_SECONDS)
+        self.stale_minutes = int(stale_minutes or settings.CHARGER_REFRESH_STALE_MINUTES)
+        self.concurrency = int(concurrency or settings.CHARGER_REFRESH_CONCURRENCY)
+        self.min_call_interval_seconds = float(min_call_interval_seconds or settings.CHARGER_REFRESH_MIN_CALL_INTERVAL_SECONDS)
+        self.max_addrs_per_run = int(max_addrs_per_run or settings.CHARGER_REFRESH_MAX_ADDRS_PER_RUN)
+        self._pace_lock = asyncio.Lock()
+        self._next_call_at = 0.0
+        self._last_run: Dict[str, Any] = {}
+        self._stats: Dict[str, int] = {
+            "runs": 0,
+            "addrs_refreshed": 0,
+            "addrs_shared": 0,
+            "addrs_failed": 0,
+            "items_persisted": 0,
+        }
+
+    async def run_forever(self, session_factory) -> None:
+        """Background loop: one refresh pass every interval_seconds"""
+        while True:
+            try:
+                await self.run_once(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Charger status refresh failed: %s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self, session_factory) -> Dict[str, Any]:
+        """Refresh the stale chargers once. Returns a summary of the pass."""
+        started = time.monotonic()
+        async with session_factory() as db:
+            addrs, stale_chargers, unresolved = await self._collect_addrs(db)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh(addr: str):
+            async with semaphore:
+                return await self._refresh_addr(session_factory, addr)
+
+        results = await asyncio.gather(*(refresh(addr) for addr in addrs))
+        summary = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "stale_chargers_scanned": stale_chargers,
+            "unresolved_chargers": unresolved,
+            "addrs": len(addrs),
+            "refreshed": sum(1 for ok in results if ok),
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        self._stats["runs"] += 1
+        self._last_run = summary
+        if addrs:
+            logger.info("Charger status refresh: %s", summary)
+        return summary
+
+    async def _collect_addrs(self, db):
+        """Group stale chargers' stations by KEPCO search addr (up to max_addrs_per_run).
+
+        Returns (addrs, scanned stale chargers, chargers without a resolvable addr).
+        """
+        addrs: Dict[str, Set[str]] = {}
+        stale = unresolved = 0
+        async for rows in ChargerRepository(db).get_stale_chargers(self.stale_minutes):
+            for row in rows:
+                m = row._mapping
+                stale += 1
+                area = None
+                if m["lat"] is not None and m["lon"] is not None:
+                    area = reverse_geocoder.lookup(float(m["lat"]), float(m["lon"]))
+                # outside the boundary dataset: the station's own KEPCO address
+                addr = area.search_addr if area is not None else search_addr_from_address(m["address"])
+                if not addr:
+                    unresolved += 1
+                    continue
+                if addr not in addrs and len(addrs) >= self.max_addrs_per_run:
+                    continue
+                addrs.setdefault(addr, set()).add(str(m["cs_id"]))
+            if len(addrs) >= self.max_addrs_per_run:
+                # the rest is picked up by the next pass
+                break
+        return addrs, stale, unresolved
+
+    async def _pace(self) -> None:
+        """Keep at least min_call_interval_seconds between upstream calls"""
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_call_at - now
+            self._next_call_at = max(now, self._next_call_at) + self.min_call_interval_seconds
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _refresh_addr(self, session_factory, addr: str) -> bool:
+        await self._pace()
+        try:
+            payload, leader, fetched_at = await kepco_fetcher.fetch_by_addr(addr)
+        except Exception as e:
+            self._stats["addrs_failed"] += 1
+            logger.warning("Charger status refresh of addr=%s failed: %s", addr, e)
+            return False
+
+        items = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            self._stats["addrs_failed"] += 1
+            return False
+        if not leader:
+            # cached or fetched by a concurrent request
+            self._stats["addrs_shared"] += 1
+        if fetched_at < datetime.now(timezone.utc) - timedelta(minutes=self.stale_minutes):
+            # as old as the chargers it would refresh
+            return True
+
+        items = [item for item in items if isinstance(item, dict)]
+        if not write_behind.submit(items, with_chargers=True, fetched_at=fetched_at):
+            try:
+                async with session_factory() as db:
+                    await persist_kepco_items(db, items, with_chargers=True, now=fetched_at)
+                    await db.commit()
+            except Exception as e:
+                self._stats["addrs_failed"] += 1
+                logger.warning("Charger status persist of addr=%s failed: %s", addr, e)
+                return False
+        self._stats["addrs_refreshed"] += 1
+        self._stats["items_persisted"] += len(items)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "last_run": self._last_run}
+
+
+# Global instance
+charger_refresher = ChargerStatusRefresher()
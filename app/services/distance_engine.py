@@ -0,0 +1,83 @@
+"""Vectorized great-circle distance engine for station payloads
+
+Station coordinates are kept as float64 NumPy arrays next to the station
+dicts, so a radius search is one vectorized pass (haversine distances,
+radius mask, argsort) instead of a Python loop calling the scalar haversine
+per station and again inside sort keys.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def haversine_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Distances in meters from (lat, lon) to every (lats[i], lons[i])"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class StationBatch:
+    """Station dicts plus their coordinates as numeric arrays.
+
+    Stations whose lat/lon cannot be parsed are dropped on construction.
+    """
+
+    __slots__ = ("stations", "lats", "lons")
+
+    def __init__(self, stations: Sequence[Dict[str, Any]]):
+        kept: List[Dict[str, Any]] = []
+        lats: List[float] = []
+        lons: List[float] = []
+        for s in stations:
+            try:
+                s_lat, s_lon = float(s["lat"]), float(s["lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            kept.append(s)
+            lats.append(s_lat)
+            lons.append(s_lon)
+        self.stations = kept
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        candidates: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (indices, distances_m) of stations within radius_m, nearest first.
+
+        Args:
+            candidates: Optional subset of indices to consider (e.g. an
+                STRtree bounding-box result)
+        """
+        if candidates is None:
+            idx = np.arange(len(self.stations))
+        else:
+            idx = np.asarray(candidates, dtype=np.intp)
+        if idx.size == 0:
+            return idx, np.empty(0, dtype=np.float64)
+
+        dist = haversine_m(lat, lon, self.lats[idx], self.lons[idx])
+        mask = dist <= radius_m
+        idx, dist = idx[mask], dist[mask]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def hits(self, lat: float, lon: float, radius_m: float, candidates: Optional[np.ndarray] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Like within_radius but returns (station, distance_m) pairs"""
+        idx, dist = self.within_radius(lat, lon, radius_m, candidates)
+        return [(self.stations[i], float(d)) for i, d in zip(idx.tolist(), dist.tolist())]
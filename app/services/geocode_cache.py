@@ -0,0 +1,141 @@
+"""Two-level cache for reverse-geocoding results
+
+Coordinates are quantized to a grid cell (REVERSE_GEOCODE_CACHE_CELL_DEG) and
+looked up in a bounded in-process LRU first, then in a Redis hash per kind
+(field = cell). Only successful lookups are cached. Hit/miss counters per
+tier are kept so the cell size and LRU capacity can be tuned.
+
+Every entry expires on its own after REVERSE_GEOCODE_CACHE_TTL_SECONDS: the
+hash field stores "<unix ts>|<value>" and older fields are treated as misses
+(and overwritten by the reload). An EXPIRE on the whole hash would be pushed
+back by every write, so in a busy hash no entry would ever be refreshed.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class GeocodeCache:
+    """Quantized LRU + Redis hash cache for geocoding results"""
+
+    KEY_PREFIX = "geocode_cache"
+
+    def __init__(
+        self,
+        cell_deg: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.cell_deg = float(cell_deg or settings.REVERSE_GEOCODE_CACHE_CELL_DEG)
+        self.max_entries = int(max_entries or settings.REVERSE_GEOCODE_CACHE_LRU_SIZE)
+        self.ttl_seconds = int(ttl_seconds or settings.REVERSE_GEOCODE_CACHE_TTL_SECONDS)
+        # (kind, cell) -> (value, stored at)
+        self._lru: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._stats: Dict[str, int] = {
+            "l1_hits": 0, "l2_hits": 0, "misses": 0, "l1_evictions": 0, "expired": 0,
+        }
+
+    def cell_of(self, lat: float, lon: float) -> str:
+        return f"{math.floor(lat / self.cell_deg)}:{math.floor(lon / self.cell_deg)}"
+
+    def redis_key(self, kind: str) -> str:
+        return f"{self.KEY_PREFIX}:s{self.cell_deg}:{kind}"
+
+    async def get_or_load(
+        self,
+        kind: str,
+        lat: float,
+        lon: float,
+        loader: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        """Return the cached value for the cell of (lat, lon) or call `loader`.
+
+        Args:
+            kind: Namespace of the value (e.g. "search_addr", "full_addr")
+            loader: Coroutine factory producing the value on a miss
+        """
+        cell = self.cell_of(lat, lon)
+        l1_key = (kind, cell)
+
+        now = time.time()
+        entry = self._lru.get(l1_key)
+        if entry is not None:
+            if now - entry[1] < self.ttl_seconds:
+                self._lru.move_to_end(l1_key)
+                self._stats["l1_hits"] += 1
+                return entry[0]
+            del self._lru[l1_key]
+            self._stats["expired"] += 1
+
+        redis_client = await get_redis_client()
+        if redis_client is not None:
+            try:
+                raw = await redis_client.hget(self.redis_key(kind), cell)
+            except Exception as e:
+                logger.warning("Geocode cache HGET failed (ignored): %s", e)
+                raw = None
+            value, stored_at = self._parse(raw)
+            if value and now - stored_at < self.ttl_seconds:
+                self._stats["l2_hits"] += 1
+                self._remember(l1_key, value, stored_at)
+                return value
+            if raw:
+                self._stats["expired"] += 1
+
+        self._stats["misses"] += 1
+        value = await loader()
+        if not value:
+            return value
+
+        self._remember(l1_key, value, now)
+        if redis_client is not None:
+            try:
+                await redis_client.hset(self.redis_key(kind), cell, f"{int(now)}|{value}")
+            except Exception as e:
+                logger.warning("Geocode cache HSET failed (ignored): %s", e)
+        return value
+
+    @staticmethod
+    def _parse(raw: Optional[str]) -> Tuple[Optional[str], float]:
+        """(value, stored at) of a hash field; fields without a timestamp count as expired"""
+        if not raw:
+            return None, 0.0
+        ts, sep, value = raw.partition("|")
+        if not sep or not ts.isdigit():
+            return None, 0.0
+        return value, float(ts)
+
+    def _remember(self, l1_key: Tuple[str, str], value: str, stored_at: float):
+        self._lru[l1_key] = (value, stored_at)
+        self._lru.move_to_end(l1_key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._stats["l1_evictions"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit/miss counters and the current L1 size"""
+        lookups = self._stats["l1_hits"] + self._stats["l2_hits"] + self._stats["misses"]
+        hits = self._stats["l1_hits"] + self._stats["l2_hits"]
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "l1_size": len(self._lru),
+            "l1_capacity": self.max_entries,
+            "cell_deg": self.cell_deg,
+        }
+
+    def clear(self):
+        self._lru.clear()
+
+
+# Global instance
+geocode_cache = GeocodeCache()
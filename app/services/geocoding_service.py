@@ -2,23 +2,31 @@
 
 import logging
 from typing import Optional, Tuple
-import httpx
 import asyncio
 
+from app.core.config import settings
+from app.http_client import NOMINATIM, get_http_client
+from app.services.reverse_geocoder import reverse_geocoder
+from app.services.geocode_cache import geocode_cache
+
 logger = logging.getLogger(__name__)
 
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+
+# Address used by station search when no geocoder can resolve the coordinate
+DEFAULT_SEARCH_ADDR = "서울특별시"
+
 
 class GeocodingService:
     """Service for converting coordinates to addresses and vice versa"""
     
-    def __init__(self):
-        self.timeout = 10.0
-    
     async def reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
         """
         Convert latitude/longitude to address (시군구동 level)
         
-        Uses Nominatim (OpenStreetMap) service for reverse geocoding
+        Uses the offline reverse geocoder first; Nominatim (OpenStreetMap) is
+        only called as a fallback when REVERSE_GEOCODER_NOMINATIM_FALLBACK is set,
+        through the quantized two-level geocode cache
         
         Args:
             lat: Latitude
@@ -28,8 +36,64 @@ class GeocodingService:
             Address string suitable for KEPCO API (e.g., "전라남도 나주시 빛가람동")
             None if geocoding fails
         """
+        area = reverse_geocoder.lookup(lat, lon)
+        if area is not None:
+            return area.full_addr
+
+        if not settings.REVERSE_GEOCODER_NOMINATIM_FALLBACK:
+            return None
+        return await geocode_cache.get_or_load(
+            "full_addr", lat, lon, lambda: self._nominatim_reverse_geocode(lat, lon)
+        )
+
+    async def resolve_search_addr(self, lat: float, lon: float) -> str:
+        """
+        Resolve the `addr` used by station search (e.g., "성남시 분당구")
+        
+        Offline lookup first, then Nominatim (if enabled, through the quantized
+        geocode cache), then DEFAULT_SEARCH_ADDR
+        """
+        area = reverse_geocoder.lookup(lat, lon)
+        if area is not None:
+            return area.search_addr
+
+        if settings.REVERSE_GEOCODER_NOMINATIM_FALLBACK:
+            addr = await geocode_cache.get_or_load(
+                "search_addr", lat, lon, lambda: self._nominatim_search_addr(lat, lon)
+            )
+            if addr:
+                return addr
+        return DEFAULT_SEARCH_ADDR
+
+    async def _nominatim_search_addr(self, lat: float, lon: float) -> Optional[str]:
+        """Nominatim lookup returning "city district" as used by station search"""
         try:
-            url = "https://nominatim.openstreetmap.org/reverse"
+            response = await get_http_client(NOMINATIM).get(
+                NOMINATIM_REVERSE_URL,
+                params={
+                    "lat": lat,
+                    "lon": lon,
+                    "format": "json",
+                    "accept-language": "ko",
+                    "addressdetails": 1
+                },
+                headers={"User-Agent": "Codyssey-EV-App/1.0"}
+            )
+            if response.status_code != 200:
+                return None
+
+            address = response.json().get("address", {})
+            city = address.get("city") or address.get("town") or ""
+            district = address.get("borough") or address.get("suburb") or ""
+            return f"{city} {district}".strip() or None
+        except Exception as e:
+            logger.error("Nominatim search addr lookup failed for (%s, %s): %s", lat, lon, e)
+            return None
+
+    async def _nominatim_reverse_geocode(self, lat: float, lon: float) -> Optional[str]:
+        """Nominatim reverse geocoding (fallback for reverse_geocode)"""
+        try:
+            url = NOMINATIM_REVERSE_URL
             params = {
                 "format": "json",
                 "lat": lat,
@@ -43,50 +107,50 @@ class GeocodingService:
                 "User-Agent": "EVChargingStationApp/1.0"
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if "address" not in data:
-                    logger.warning(f"No address found for coordinates: {lat}, {lon}")
-                    return None
-                
-                address = data["address"]
-                
-                # Extract Korean administrative divisions
-                # Prioritize Korean names if available
-                state = (
-                    address.get("state") or 
-                    address.get("province") or
-                    ""
-                )
-                city = (
-                    address.get("city") or 
-                    address.get("county") or
-                    address.get("town") or
-                    ""
-                )
-                district = (
-                    address.get("suburb") or
-                    address.get("neighbourhood") or
-                    address.get("quarter") or
-                    ""
-                )
-                
-                # Build address string for KEPCO API
-                addr_parts = [part for part in [state, city, district] if part]
-                if not addr_parts:
-                    logger.warning(f"Could not extract address components from: {address}")
-                    return None
-                
-                result = " ".join(addr_parts)
-                logger.info(f"Reverse geocoded ({lat}, {lon}) -> {result}")
-                return result
-                
+            client = get_http_client(NOMINATIM)
+            response = await client.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if "address" not in data:
+                logger.warning("No address found for coordinates: %s, %s", lat, lon)
+                return None
+            
+            address = data["address"]
+            
+            # Extract Korean administrative divisions
+            # Prioritize Korean names if available
+            state = (
+                address.get("state") or 
+                address.get("province") or
+                ""
+            )
+            city = (
+                address.get("city") or 
+                address.get("county") or
+                address.get("town") or
+                ""
+            )
+            district = (
+                address.get("suburb") or
+                address.get("neighbourhood") or
+                address.get("quarter") or
+                ""
+            )
+            
+            # Build address string for KEPCO API
+            addr_parts = [part for part in [state, city, district] if part]
+            if not addr_parts:
+                logger.warning("Could not extract address components from: %s", address)
+                return None
+            
+            result = " ".join(addr_parts)
+            logger.info("Reverse geocoded (%s, %s) -> %s", lat, lon, result)
+            return result
+            
         except Exception as e:
-            logger.error(f"Reverse geocoding failed for ({lat}, {lon}): {e}")
+            logger.error("Reverse geocoding failed for (%s, %s): %s", lat, lon, e)
             return None
     
     def calculate_distance_km(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
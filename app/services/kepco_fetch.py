@@ -0,0 +1,179 @@
+"""Coalesced and cached KEPCO EVchargeManage.do fetches
+
+All KEPCO calls of the station endpoints go through here so concurrent
+requests for the same key share one upstream call (see single_flight).
+
+Each upstream payload (the full charger list of an addr) is cached once in
+Redis (redis_client codec, compressed) under the addr and additionally split
+per csId, so the detail endpoint can read a single station of a
+just-searched area without decompressing the district or calling upstream.
+Every addr refresh rewrites all csId entries of that addr.
+
+Entries keep the time the payload was fetched upstream; callers persist
+statuses with that time, so a cached payload is never stamped as fresher
+than it is (stat_update_datetime drives the 30-minute freshness rule).
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.http_client import KEPCO, get_http_client
+from app.metrics import KEPCO_REQUEST_SECONDS
+from app.redis_client import decode_value, encode_value, get_redis_binary_client
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class KepcoAPIError(Exception):
+    """KEPCO API returned a non-200 response"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"KEPCO API 오류: HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _pack(value: Any) -> bytes:
+    return encode_value(value)
+
+
+def _unpack(raw: Optional[bytes], field: str) -> Optional[Tuple[Any, datetime]]:
+    """(value, fetched_at) of a cache entry; None for misses and older formats"""
+    try:
+        entry = decode_value(raw)
+        return entry[field], datetime.fromtimestamp(float(entry["fetched_at"]), timezone.utc)
+    except Exception:
+        return None
+
+
+class KepcoFetcher:
+    """Fetch KEPCO station/charger payloads by address"""
+
+    ADDR_PREFIX = "kepco_payload:addr"
+    STATION_PREFIX = "kepco_payload:cs"
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = int(ttl_seconds or settings.KEPCO_PAYLOAD_CACHE_SECONDS)
+        self._stats: Dict[str, int] = {"addr_hits": 0, "station_hits": 0, "misses": 0, "upstream_calls": 0}
+
+    async def fetch_by_addr(self, addr: str) -> Tuple[Dict[str, Any], bool, datetime]:
+        """Fetch the raw KEPCO payload for `addr`, coalesced per addr.
+
+        Searches, detail requests and the charger refresher share one
+        coalescing key per addr; each caller persists the part of the
+        payload it needs (the upserts are idempotent), since the caller that
+        fetched it may have written only stations or a single station.
+
+        Args:
+            addr: KEPCO `addr` query parameter
+
+        Returns:
+            (payload, leader, fetched_at): `leader` is True only for the
+            caller whose request fetched the payload upstream; cached
+            payloads and payloads of a concurrent caller come with
+            leader=False. `fetched_at` is the upstream fetch time, to be
+            recorded instead of the current time.
+
+        Raises:
+            KepcoAPIError: non-200 response (not shared with waiting callers
+                beyond the in-flight call)
+        """
+        cached = await self.get_cached_payload(addr)
+        if cached is not None:
+            self._stats["addr_hits"] += 1
+            payload, fetched_at = cached
+            return payload, False, fetched_at
+        self._stats["misses"] += 1
+        shared, leader = await single_flight.do(f"kepco:{addr}", lambda: self._fetch_and_store(addr))
+        return shared["payload"], leader, datetime.fromtimestamp(shared["fetched_at"], timezone.utc)
+
+    async def get_cached_payload(self, addr: str) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        """(raw payload, fetched_at) of an addr from the cache, or None"""
+        redis_client = await get_redis_binary_client()
+        if redis_client is None:
+            return None
+        try:
+            cached = _unpack(await redis_client.get(f"{self.ADDR_PREFIX}:{addr}"), "payload")
+        except Exception as e:
+            logger.warning("KEPCO payload cache read failed (ignored): %s", e)
+            return None
+        return cached if cached is not None and isinstance(cached[0], dict) else None
+
+    async def get_cached_station_items(self, cs_id: str) -> Optional[Tuple[List[Dict[str, Any]], datetime]]:
+        """(KEPCO items (one per charger), fetched_at) of a single csId from the cache, or None"""
+        redis_client = await get_redis_binary_client()
+        if redis_client is None:
+            return None
+        try:
+            cached = _unpack(await redis_client.get(f"{self.STATION_PREFIX}:{cs_id}"), "items")
+        except Exception as e:
+            logger.warning("KEPCO station cache read failed (ignored): %s", e)
+            return None
+        if cached is not None and isinstance(cached[0], list) and cached[0]:
+            self._stats["station_hits"] += 1
+            return cached
+        return None
+
+    async def _fetch_and_store(self, addr: str) -> Dict[str, Any]:
+        payload = await self._fetch(addr)
+        fetched_at = time.time()
+        await self._store(addr, payload, fetched_at)
+        # shared with coalesced callers, which record the same fetch time
+        return {"payload": payload, "fetched_at": fetched_at}
+
+    async def _store(self, addr: str, payload: Dict[str, Any], fetched_at: float):
+        """Cache the addr payload and (re)write the csId index in one pipeline"""
+        redis_client = await get_redis_binary_client()
+        if redis_client is None or not isinstance(payload, dict):
+            return
+        by_cs_id: Dict[str, List[Dict[str, Any]]] = {}
+        items = payload.get("data")
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict) and item.get("csId"):
+                    by_cs_id.setdefault(str(item["csId"]), []).append(item)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.set(
+                f"{self.ADDR_PREFIX}:{addr}", _pack({"fetched_at": fetched_at, "payload": payload}), ex=self.ttl_seconds
+            )
+            for cs_id, cs_items in by_cs_id.items():
+                pipe.set(
+                    f"{self.STATION_PREFIX}:{cs_id}", _pack({"fetched_at": fetched_at, "items": cs_items}), ex=self.ttl_seconds
+                )
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("KEPCO payload cache write failed (ignored): %s", e)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    async def _fetch(self, addr: str) -> Dict[str, Any]:
+        self._stats["upstream_calls"] += 1
+        kepco_url = settings.EXTERNAL_STATION_API_BASE_URL
+        kepco_key = settings.EXTERNAL_STATION_API_KEY
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await get_http_client(KEPCO).get(
+                kepco_url,
+                params={
+                    "addr": addr,
+                    "apiKey": kepco_key,
+                    "returnType": "json"
+                }
+            )
+            outcome = str(response.status_code)
+        finally:
+            KEPCO_REQUEST_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+        logger.info("KEPCO addr=%s status=%s", addr, response.status_code)
+        if response.status_code != 200:
+            raise KepcoAPIError(response.status_code)
+        return response.json()
+
+
+# Global instance
+kepco_fetcher = KepcoFetcher()
@@ -0,0 +1,180 @@
+"""Per-worker L1 cache of decoded Redis values
+
+get_cache()/set_cache() (app/redis_client.py) keep the already-decoded
+objects of hot keys in a bounded in-process LRU with a TTL and a byte budget
+(sized by the length of the serialized value), so repeated reads skip the
+Redis round-trip and decode_value(). Cached objects are shared and must not be
+mutated by callers.
+
+Workers and instances stay coherent through a Redis pub/sub channel: every
+write or delete through the helpers publishes the key and all other
+processes drop their L1 copy. The L1 TTL bounds staleness when a message is
+missed (e.g. while the subscriber reconnects).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# returned by L1Cache.get() on a miss (None is a valid cached value)
+MISSING = object()
+
+
+class L1Cache:
+    """TTL + LRU cache with a byte budget and pub/sub invalidation"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        channel: Optional[str] = None,
+    ):
+        self.enabled = settings.L1_CACHE_ENABLED
+        self.max_entries = int(max_entries or settings.L1_CACHE_MAX_ENTRIES)
+        self.max_bytes = int(max_bytes or settings.L1_CACHE_MAX_BYTES)
+        self.ttl_seconds = float(ttl_seconds or settings.L1_CACHE_TTL_SECONDS)
+        self.channel = channel or settings.L1_CACHE_INVALIDATION_CHANNEL
+        # key -> (value, expires_at monotonic, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        # tags our own invalidation messages so we do not drop what we just wrote
+        self._origin = uuid.uuid4().hex
+        self._stats: Dict[str, int] = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+            "invalidations_sent": 0,
+            "invalidations_received": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Local tier
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Any:
+        """Return the cached object or MISSING"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self._stats["expired"] += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self._stats["l1_hits"] += 1
+        return value
+
+    def put(self, key: str, value: Any, size: int, ttl_seconds: Optional[float] = None):
+        """Store a decoded object; `size` is the length of its serialized form"""
+        if not self.enabled or size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(self.ttl_seconds, ttl_seconds)
+        if ttl <= 0:
+            return
+        self._drop(key)
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._stats["evictions"] += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def record_l2_hit(self):
+        self._stats["l2_hits"] += 1
+
+    def record_miss(self):
+        self._stats["misses"] += 1
+
+    # ------------------------------------------------------------------
+    # Cross-process invalidation
+    # ------------------------------------------------------------------
+    async def invalidate(self, redis_client, key: str):
+        """Drop `key` here and tell every other process to drop it"""
+        self._drop(key)
+        if redis_client is None or not self.enabled:
+            return
+        try:
+            await redis_client.publish(self.channel, f"{self._origin}|{key}")
+            self._stats["invalidations_sent"] += 1
+        except Exception as e:
+            logger.warning("L1 invalidation publish failed for %s: %s", key, e)
+
+    def queue_invalidations(self, pipe, keys: List[str]):
+        """Drop `keys` here and add their invalidation messages to a Redis pipeline"""
+        for key in keys:
+            self._drop(key)
+        if not self.enabled:
+            return
+        for key in keys:
+            pipe.publish(self.channel, f"{self._origin}|{key}")
+        self._stats["invalidations_sent"] += len(keys)
+
+    def _on_message(self, data: Any):
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", "replace")
+        origin, _, key = str(data).partition("|")
+        if origin == self._origin or not key:
+            return
+        self._drop(key)
+        self._stats["invalidations_received"] += 1
+
+    async def run_invalidation_listener(self, redis_client) -> None:
+        """Background loop: apply invalidations published by other processes"""
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # anything cached before (re)subscribing may have missed messages
+                self.clear()
+                while True:
+                    # bounded wait: listen() would hit the pool's socket timeout
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._on_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("L1 invalidation listener error (resubscribing): %s", e)
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit counters per tier (l1 = this worker, l2 = Redis) and L1 usage"""
+        lookups = self._stats["l1_hits"] + self._stats["l2_hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "l1_hit_ratio": round(self._stats["l1_hits"] / lookups, 4) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "enabled": self.enabled,
+        }
+
+
+# Global instance
+l1_cache = L1Cache()
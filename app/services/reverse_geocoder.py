@@ -0,0 +1,161 @@
+"""Offline reverse geocoder for lat/lon to administrative area
+
+Resolves coordinates to 시/도, 시/군/구(구), 읍/면/동 from administrative boundary
+polygons indexed with a shapely STRtree, so station search does not depend on
+Nominatim.
+
+The dataset (REVERSE_GEOCODER_DATASET_PATH, default
+app/data/admin_districts.geojson) is a GeoJSON FeatureCollection of boundary
+polygons whose properties carry sido/sigungu/gu/emd, built from the
+읍/면/동 (행정동) boundaries by scripts/build_admin_districts.py when the
+Docker image is built (ADMIN_BOUNDARIES_URL). A point is
+resolved only by containment (the smallest polygon containing it wins).
+Points outside every polygon - including areas the dataset does not cover -
+return None and fall through to Nominatim; there is deliberately no
+nearest-area guess, which would map e.g. 과천시 to 서초구.
+
+search_addr_from_address() derives the same search addr from a stored
+station address (KEPCO `addr`) without any dataset.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from shapely import STRtree
+from shapely.geometry import Point, shape
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_PATH = Path(__file__).resolve().parent.parent / "data" / "admin_districts.geojson"
+
+# first address token of the metropolitan cities (their 구 is the search unit)
+_METROPOLITAN_SUFFIXES = ("특별시", "광역시")
+
+
+@dataclass(frozen=True)
+class AdminArea:
+    """One administrative area of the dataset"""
+
+    sido: str
+    sigungu: str
+    gu: str = ""
+    emd: str = ""
+
+    @property
+    def search_addr(self) -> str:
+        """Address in the station search format ("성남시 분당구", "서울특별시 강남구")"""
+        if self.gu:
+            return f"{self.sigungu} {self.gu}".strip()
+        return f"{self.sido} {self.sigungu}".strip()
+
+    @property
+    def full_addr(self) -> str:
+        """Full address for the KEPCO API ("경기도 성남시 분당구")"""
+        parts: List[str] = []
+        for part in (self.sido, self.sigungu, self.gu, self.emd):
+            if part and part not in parts:
+                parts.append(part)
+        return " ".join(parts)
+
+
+class ReverseGeocoder:
+    """In-process reverse geocoder backed by an STRtree"""
+
+    def __init__(self, dataset_path: Optional[str] = None):
+        self.dataset_path = Path(dataset_path or settings.REVERSE_GEOCODER_DATASET_PATH or DEFAULT_DATASET_PATH)
+        self._areas: List[AdminArea] = []
+        self._geometries: list = []
+        self._tree: Optional[STRtree] = None
+        self._loaded = False
+
+    @property
+    def ready(self) -> bool:
+        return self._tree is not None
+
+    def load(self) -> bool:
+        """Load and index the dataset. Returns False if it is unavailable."""
+        self._loaded = True
+        try:
+            geometries = self._load_geojson()
+        except Exception as e:
+            logger.warning("Reverse geocoder dataset unavailable (%s): %s", self.dataset_path, e)
+            self._tree = None
+            return False
+
+        if not geometries:
+            logger.warning("Reverse geocoder dataset is empty: %s", self.dataset_path)
+            self._tree = None
+            return False
+
+        self._tree = STRtree(geometries)
+        self._geometries = geometries
+        logger.info("Reverse geocoder loaded %d areas from %s", len(self._areas), self.dataset_path)
+        return True
+
+    def _load_geojson(self) -> list:
+        with open(self.dataset_path, encoding="utf-8") as f:
+            collection = json.load(f)
+        areas, polygons = [], []
+        for feature in collection.get("features", []):
+            try:
+                geom = shape(feature["geometry"])
+            except Exception:
+                continue
+            if geom.is_empty or geom.geom_type not in ("Polygon", "MultiPolygon"):
+                continue
+            areas.append(self._area_from(feature.get("properties") or {}))
+            polygons.append(geom)
+        self._areas = areas
+        return polygons
+
+    @staticmethod
+    def _area_from(props: dict) -> AdminArea:
+        return AdminArea(
+            sido=(props.get("sido") or "").strip(),
+            sigungu=(props.get("sigungu") or "").strip(),
+            gu=(props.get("gu") or "").strip(),
+            emd=(props.get("emd") or "").strip(),
+        )
+
+    def lookup(self, lat: float, lon: float) -> Optional[AdminArea]:
+        """Return the administrative area for a coordinate, or None if unknown"""
+        if not self._loaded:
+            self.load()
+        if self._tree is None:
+            return None
+
+        # polygons covering the point (boundary included); none = not covered
+        hits = self._tree.query(Point(lon, lat), predicate="intersects")
+        if len(hits) == 0:
+            return None
+        # prefer the most specific (smallest) area when boundaries nest
+        best = min(hits, key=lambda i: self._geometries[i].area)
+        return self._areas[int(best)]
+
+
+def search_addr_from_address(address: Optional[str]) -> Optional[str]:
+    """Search addr ("성남시 분당구", "서울특별시 강남구") from a full road/lot address
+
+    Same format as AdminArea.search_addr: 시 + 구 for cities with 구, else
+    시/도 + 시/군/구. Returns None when the address has too few parts.
+    """
+    parts = (address or "").split()
+    if parts and parts[0].endswith("특별자치시"):
+        # 세종: no 시/군/구 level
+        return parts[0]
+    if len(parts) < 2:
+        return None
+    if parts[0].endswith(_METROPOLITAN_SUFFIXES):
+        return f"{parts[0]} {parts[1]}"
+    if len(parts) >= 3 and parts[1].endswith("시") and parts[2].endswith("구"):
+        return f"{parts[1]} {parts[2]}"
+    return f"{parts[0]} {parts[1]}"
+
+
+# Global instance
+reverse_geocoder = ReverseGeocoder()
@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for the station search
+
+Search results are ordered by the key (distance, station_id), where
+distance is the unrounded great-circle distance in meters: the ordering
+distance of the KNN index scan in the spatial query (`<->`), the haversine
+distance in the in-process tiers. Tiers keep that float in `distance_m`
+until the page is sliced and only then format it for the client. The
+cursor is the key of the last station of a page, base64url-encoded together
+with a short fingerprint of the search (coordinates + radius) so a cursor
+cannot be replayed against a different search. The next page is "everything
+after that key", so page N costs the same as page 1 instead of
+recomputing and discarding (N - 1) * limit rows.
+
+Every tier of /api/v1/stations (memory index, tile cache, spatial query,
+KEPCO) uses the same key, so a cursor stays valid when the next page is
+answered by another tier. The tiers use slightly different sphere radii
+(a few centimetres apart at most), so the cursor's own station is skipped
+should another tier place it just after its key.
+"""
+
+import base64
+import bisect
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+CursorKey = Tuple[float, str]
+
+
+class InvalidCursor(ValueError):
+    """Malformed cursor or cursor of another search"""
+
+
+def search_fingerprint(lat: str, lon: str, radius: int) -> int:
+    return zlib.crc32(f"{lat}:{lon}:{radius}".encode("utf-8"))
+
+
+def station_key(station: Dict[str, Any]) -> CursorKey:
+    return float(station["distance_m"]), str(station["station_id"])
+
+
+def encode_cursor(key: CursorKey, fingerprint: int) -> str:
+    raw = json.dumps([key[0], key[1], fingerprint], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, fingerprint: int) -> CursorKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        distance_m, station_id, cursor_fingerprint = json.loads(base64.urlsafe_b64decode(padded))
+        key = (float(distance_m), str(station_id))
+    except Exception as e:
+        raise InvalidCursor("malformed cursor") from e
+    if cursor_fingerprint != fingerprint:
+        raise InvalidCursor("cursor belongs to another search")
+    return key
+
+
+def paginate(
+    items: Sequence[Any],
+    limit: int,
+    after: Optional[CursorKey] = None,
+    offset: int = 0,
+    fingerprint: int = 0,
+    key: Callable[[Any], CursorKey] = station_key,
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of `items`, already sorted by `key`
+
+    Starts after the cursor key when given, else at `offset` (the legacy
+    `page` parameter). Returns the page and the cursor of the next page
+    (None on the last page).
+    """
+    if after is not None:
+        start = bisect.bisect_right(items, after, key=key)
+        while start < len(items) and key(items[start])[1] == after[1]:
+            start += 1
+    else:
+        start = offset
+    page = list(items[start:start + limit])
+    has_more = start + limit < len(items)
+    next_cursor = encode_cursor(key(page[-1]), fingerprint) if page and has_more else None
+    return page, next_cursor
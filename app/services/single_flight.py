@@ -0,0 +1,158 @@
+"""Request coalescing (single-flight) across requests, workers and instances
+
+Two levels:
+- in-process: concurrent callers with the same key share one asyncio task
+- cross-worker: the task takes a Redis lease (SET NX EX) so only one worker
+  in the deployment runs the call; the others poll until the lease is
+  released and read the shared result from Redis. If the leader is still
+  running after SINGLE_FLIGHT_WAIT_SECONDS they get the previous result
+  (kept for SINGLE_FLIGHT_RESULT_TTL_SECONDS) instead of calling upstream too.
+
+The shared result is stored with the cache codec (redis_client.encode_value)
+on the binary client, tagged with the lease token of the leader that
+produced it. A waiter that saw the lease released only accepts the result
+of that lease holder; if the leader failed, the earlier result left in Redis
+is ignored and the waiter calls upstream itself.
+
+Results must be serializable by the cache codec. Callers are told whether they ran the
+call themselves (`leader`) so side effects such as DB upserts happen once.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.redis_client import acquire_lease, decode_value, encode_value, get_redis_binary_client, release_lease
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """In-process future map + Redis lease per key"""
+
+    LOCK_PREFIX = "single_flight:lock"
+    RESULT_PREFIX = "single_flight:result"
+
+    def __init__(
+        self,
+        lock_ttl_seconds: Optional[int] = None,
+        wait_seconds: Optional[float] = None,
+        result_ttl_seconds: Optional[int] = None,
+        poll_interval: float = 0.1,
+    ):
+        self.lock_ttl_seconds = int(lock_ttl_seconds or settings.SINGLE_FLIGHT_LOCK_TTL_SECONDS)
+        self.wait_seconds = float(wait_seconds or settings.SINGLE_FLIGHT_WAIT_SECONDS)
+        self.result_ttl_seconds = int(result_ttl_seconds or settings.SINGLE_FLIGHT_RESULT_TTL_SECONDS)
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, int] = {
+            "leader_calls": 0,
+            "local_shared": 0,
+            "remote_shared": 0,
+            "stale_served": 0,
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run `fn` once per key across concurrent callers.
+
+        Returns:
+            (result, leader) where `leader` is True if this caller's call
+            actually executed `fn` (and should perform follow-up writes)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["local_shared"] += 1
+            result, _ = await asyncio.shield(task)
+            return result, False
+
+        # run in a separate task so a cancelled (disconnected) leader does
+        # not cancel the call for the callers sharing it
+        task = asyncio.ensure_future(self._run_distributed(key, fn))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    async def _run_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        redis_client = await get_redis_binary_client()
+        if redis_client is None:
+            return await self._call(fn), True
+
+        lock_key = f"{self.LOCK_PREFIX}:{key}"
+        result_key = f"{self.RESULT_PREFIX}:{key}"
+        token = None
+        holder = None
+        try:
+            # the lease may be released between SET NX and GET: try once more
+            for _ in range(2):
+                token = await acquire_lease(redis_client, lock_key, self.lock_ttl_seconds)
+                if token is not None:
+                    break
+                holder = await redis_client.get(lock_key)
+                if holder is not None:
+                    break
+        except Exception as e:
+            logger.warning("Single-flight lease unavailable for %s (calling directly): %s", key, e)
+            return await self._call(fn), True
+
+        if token is not None:
+            try:
+                result = await self._call(fn)
+                try:
+                    payload = encode_value({"token": token, "result": result})
+                    await redis_client.set(result_key, payload, ex=self.result_ttl_seconds)
+                except Exception as e:
+                    logger.warning("Single-flight result publish failed for %s: %s", key, e)
+                return result, True
+            finally:
+                await release_lease(redis_client, lock_key, token)
+
+        # another worker holds the lease: wait for it to finish
+        deadline = time.monotonic() + self.wait_seconds
+        released = False
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if not await redis_client.exists(lock_key):
+                    released = True
+                    break
+            except Exception:
+                break
+
+        try:
+            raw = await redis_client.get(result_key)
+        except Exception:
+            raw = None
+        if raw and holder is not None:
+            try:
+                shared = decode_value(raw)
+                from_holder = shared["token"] == holder.decode("ascii")
+                # after a release, only the result of the lease we waited on is
+                # fresh; an earlier one means that leader failed
+                if from_holder or not released:
+                    self._stats["remote_shared" if released else "stale_served"] += 1
+                    return shared["result"], False
+            except Exception:
+                pass
+
+        # leader failed or nothing to share yet: call upstream ourselves
+        return await self._call(fn), True
+
+    async def _call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._stats["leader_calls"] += 1
+        return await fn()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "inflight": len(self._inflight)}
+
+
+# Global instance
+single_flight = SingleFlight()
@@ -0,0 +1,253 @@
+"""In-process spatial index of static station data
+
+Every worker keeps all stations (csId, name, address, lat/lon) in memory,
+indexed with a shapely STRtree over lon/lat points, so radius and nearest-k
+searches need no DB or Redis round-trip. Only the dynamic charger counts are
+fetched afterwards.
+
+The index is fully loaded at startup and refreshed incrementally from rows
+whose updated_at/last_synced_at moved past the last seen watermark; a full
+reload runs periodically to drop deleted stations. Trees are rebuilt in a
+worker thread and swapped atomically, so readers never see a partial index.
+
+The change timestamps come from now(), i.e. the start of the writing
+transaction, so a transaction that commits after a later-started one can
+carry an older timestamp than the watermark. Each delta therefore re-reads
+STATION_INDEX_REFRESH_OVERLAP_SECONDS before the watermark; re-read rows are
+idempotent and only rows that actually differ trigger a rebuild.
+
+Stations pushed by the search (fresh KEPCO results, upsert()) are collected
+and applied in one rebuild STATION_INDEX_UPSERT_DELAY_SECONDS later (or on
+the next refresh tick) instead of one rebuild per response.
+
+When ready, the index is the authoritative source of the radius search; the
+tile cache (app/services/station_tile_cache.py) only answers when it is not.
+sync_age() is the time since the last successful DB load/refresh, and the
+search marks the response stale past STATION_TILE_SOFT_TTL_SECONDS, as it
+does for tiles.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from shapely import STRtree, box, points
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.distance_engine import StationBatch
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEG_LAT = 111320.0
+
+STATION_INDEX_QUERY = """
+    SELECT
+        cs_id AS station_id,
+        COALESCE(address, '') AS addr,
+        COALESCE(name, '') AS station_name,
+        ST_Y(location) AS lat,
+        ST_X(location) AS lon,
+        GREATEST(updated_at, last_synced_at) AS changed_at
+    FROM stations
+    WHERE location IS NOT NULL
+      AND cs_id IS NOT NULL
+"""
+
+STATION_INDEX_DELTA_QUERY = STATION_INDEX_QUERY + """
+      AND GREATEST(updated_at, last_synced_at) > :since
+"""
+
+
+class _Snapshot:
+    """Immutable station batch (coordinates as arrays) + STRtree built from it"""
+
+    def __init__(self, stations: Dict[str, Dict[str, Any]]):
+        self.batch = StationBatch(list(stations.values()))
+        self.stations = self.batch.stations
+        self.tree = STRtree(points(self.batch.lons, self.batch.lats)) if self.stations else None
+
+
+class StationIndex:
+    """STRtree-backed in-memory station index, one per worker"""
+
+    def __init__(self, refresh_seconds: Optional[int] = None, full_reload_seconds: Optional[int] = None):
+        self.refresh_seconds = int(refresh_seconds or settings.STATION_INDEX_REFRESH_SECONDS)
+        self.full_reload_seconds = int(full_reload_seconds or settings.STATION_INDEX_FULL_RELOAD_SECONDS)
+        self.overlap = timedelta(seconds=settings.STATION_INDEX_REFRESH_OVERLAP_SECONDS)
+        self.upsert_delay_seconds = float(settings.STATION_INDEX_UPSERT_DELAY_SECONDS)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # upsert() stations waiting for the next rebuild
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[_Snapshot] = None
+        self._watermark: Optional[datetime] = None
+        self._last_full_load = 0.0
+        # monotonic time of the last successful DB load/refresh
+        self._last_sync = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        return len(self._snapshot.stations) if self._snapshot else 0
+
+    def sync_age(self) -> Optional[float]:
+        """Seconds since the last successful DB load/refresh (None before the first load)"""
+        if self._snapshot is None:
+            return None
+        return time.monotonic() - self._last_sync
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    async def load(self, db: AsyncSession) -> int:
+        """(Re)load every station from the DB. Returns the station count."""
+        rows = (await db.execute(text(STATION_INDEX_QUERY))).fetchall()
+        by_id: Dict[str, Dict[str, Any]] = {}
+        watermark = None
+        for row in rows:
+            station, changed_at = self._station_from(row._mapping)
+            if station is None:
+                continue
+            by_id[station["station_id"]] = station
+            if changed_at and (watermark is None or changed_at > watermark):
+                watermark = changed_at
+
+        async with self._lock:
+            snapshot = await asyncio.to_thread(_Snapshot, by_id)
+            self._by_id, self._snapshot = by_id, snapshot
+            self._watermark = watermark
+            self._last_full_load = self._last_sync = time.monotonic()
+        logger.info("Station index loaded: %d stations", len(by_id))
+        return len(by_id)
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Apply stations changed since the last load/refresh.
+
+        Falls back to a full load when the index is empty or the periodic
+        full reload is due. Returns the number of changed stations.
+        """
+        if (
+            self._snapshot is None
+            or self._watermark is None
+            or time.monotonic() - self._last_full_load >= self.full_reload_seconds
+        ):
+            return await self.load(db)
+
+        since = self._watermark - self.overlap
+        rows = (await db.execute(text(STATION_INDEX_DELTA_QUERY), {"since": since})).fetchall()
+        changed: Dict[str, Dict[str, Any]] = {}
+        watermark = self._watermark
+        for row in rows:
+            station, changed_at = self._station_from(row._mapping)
+            if station is None:
+                continue
+            # rows of the overlap window that are already indexed are skipped
+            if self._by_id.get(station["station_id"]) != station:
+                changed[station["station_id"]] = station
+            if changed_at and changed_at > watermark:
+                watermark = changed_at
+        await self._apply(changed)
+        self._watermark = watermark
+        self._last_sync = time.monotonic()
+        return len(changed)
+
+    async def upsert(self, stations: Iterable[Dict[str, Any]]) -> None:
+        """Queue stations (e.g. freshly fetched from KEPCO) for the next batched rebuild"""
+        if self._snapshot is None:
+            return
+        for s in stations:
+            try:
+                station_id = str(s["station_id"])
+                float(s["lat"]), float(s["lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._pending[station_id] = {k: s.get(k) for k in ("station_id", "addr", "station_name", "lat", "lon")}
+        if self._pending and (self._rebuild_task is None or self._rebuild_task.done()):
+            self._rebuild_task = asyncio.create_task(self._delayed_rebuild())
+
+    async def _delayed_rebuild(self) -> None:
+        await asyncio.sleep(self.upsert_delay_seconds)
+        try:
+            await self._apply({})
+        except Exception as e:
+            logger.warning("Station index rebuild failed: %s", e)
+
+    async def _apply(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        """Merge `updates` and the queued upserts and rebuild the tree once"""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            merged = {
+                station_id: station for station_id, station in {**pending, **updates}.items()
+                if self._by_id.get(station_id) != station
+            }
+            if not merged:
+                return
+            by_id = {**self._by_id, **merged}
+            snapshot = await asyncio.to_thread(_Snapshot, by_id)
+            self._by_id, self._snapshot = by_id, snapshot
+
+    async def run_refresher(self, session_factory) -> None:
+        """Background loop: refresh the index every refresh_seconds"""
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                async with session_factory() as db:
+                    changed = await self.refresh(db)
+                if changed:
+                    logger.info("Station index refreshed: %d changed, %d total", changed, len(self))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Station index refresh failed (keeping previous snapshot): %s", e)
+
+    @staticmethod
+    def _station_from(m) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
+        try:
+            lat, lon = float(m["lat"]), float(m["lon"])
+        except (TypeError, ValueError):
+            return None, None
+        station = {
+            "station_id": str(m["station_id"]),
+            "addr": str(m["addr"]),
+            "station_name": str(m["station_name"]),
+            "lat": str(lat),
+            "lon": str(lon),
+        }
+        return station, m.get("changed_at")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def within_radius(self, lat: float, lon: float, radius_m: float) -> List[Tuple[Dict[str, Any], float]]:
+        """Return (station, distance_m) pairs within radius_m, nearest first.
+
+        Station dicts are shared with the index and must not be mutated.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.tree is None:
+            return []
+        dlat = radius_m / METERS_PER_DEG_LAT
+        dlon = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        candidates = snapshot.tree.query(box(lon - dlon, lat - dlat, lon + dlon, lat + dlat))
+        return snapshot.batch.hits(lat, lon, radius_m, candidates)
+
+    def nearest(self, lat: float, lon: float, k: int, max_radius_m: float = 50000) -> List[Tuple[Dict[str, Any], float]]:
+        """Return the k nearest stations within max_radius_m, nearest first"""
+        radius = min(1000.0, max_radius_m)
+        while True:
+            hits = self.within_radius(lat, lon, radius)
+            if len(hits) >= k or radius >= max_radius_m:
+                return hits[:k]
+            radius = min(radius * 2, max_radius_m)
+
+
+# Global instance
+station_index = StationIndex()
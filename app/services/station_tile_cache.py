@@ -0,0 +1,316 @@
+"""Spatial tile cache for station search
+
+Static station data (csId, address, name, lat/lon) is cached per fixed-size
+grid cell instead of per request coordinate. A radius search is answered by
+covering the circle with cells, fetching all of them in one MGET and
+filtering by exact distance, so the cache hit ratio depends on the area and
+not on GPS jitter, and one tile entry serves every radius bucket and page.
+
+Tiles are read and written with the batch helpers of app/redis_client.py
+(one MGET / one pipeline, codec-encoded, bypassing the L1 cache).
+
+Tiles older than STATION_TILE_SOFT_TTL_SECONDS are served stale and rebuilt
+in the background (app/services/swr.py) until the Redis TTL expires them.
+The stale tiles of one search are rebuilt together: one bounding-box query
+under one revalidation lease. The tile timestamp is the time of the last DB
+rebuild; merging KEPCO stations keeps it, so a merged tile still ages out.
+
+The search only uses the tiles when the in-memory station index
+(app/services/station_index.py), the authoritative tier, cannot answer.
+
+Missing tiles are filled behind single_flight: concurrent searches that miss
+the same set of tiles (in this worker or across the deployment) share one
+bounding-box query, and the leader writes the tiles back.
+"""
+
+import logging
+import math
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.queries import TILE_FILL
+from app.redis_client import get_many, set_many
+from app.services.single_flight import single_flight
+from app.services.swr import STALE, parse_cache_timestamp, swr
+
+logger = logging.getLogger(__name__)
+
+Tile = Tuple[int, int]
+
+EARTH_RADIUS_M = 6371000
+METERS_PER_DEG_LAT = 111320.0
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    dlat, dlon = lat2 - lat1, lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * math.asin(math.sqrt(a))
+
+
+class StationTileCache:
+    """Redis-backed cache of static station data keyed by grid tile"""
+
+    KEY_PREFIX = "station_tile"
+
+    def __init__(
+        self,
+        tile_size_deg: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+        soft_ttl_seconds: Optional[int] = None,
+    ):
+        self.tile_size = float(tile_size_deg or settings.STATION_TILE_SIZE_DEG)
+        self.ttl_seconds = int(ttl_seconds or settings.PERSISTENT_STATION_CACHE_SECONDS)
+        self.soft_ttl_seconds = int(settings.STATION_TILE_SOFT_TTL_SECONDS if soft_ttl_seconds is None else soft_ttl_seconds)
+
+    # ------------------------------------------------------------------
+    # Tile geometry
+    # ------------------------------------------------------------------
+    def tile_of(self, lat: float, lon: float) -> Tile:
+        """Return the (x, y) grid index of the tile containing a point"""
+        return (math.floor(lon / self.tile_size), math.floor(lat / self.tile_size))
+
+    def tile_key(self, tile: Tile) -> str:
+        return f"{self.KEY_PREFIX}:s{self.tile_size}:x{tile[0]}:y{tile[1]}"
+
+    def tile_bounds(self, tile: Tile) -> Tuple[float, float, float, float]:
+        """Return (min_lat, min_lon, max_lat, max_lon) of a tile"""
+        min_lon = tile[0] * self.tile_size
+        min_lat = tile[1] * self.tile_size
+        return min_lat, min_lon, min_lat + self.tile_size, min_lon + self.tile_size
+
+    def covering_tiles(self, lat: float, lon: float, radius_m: float) -> List[Tile]:
+        """Return all tiles intersecting the circle (lat, lon, radius_m).
+
+        Tiles of the bounding box whose closest point lies outside the circle
+        are skipped, which trims the corners for large radii.
+        """
+        dlat = radius_m / METERS_PER_DEG_LAT
+        dlon = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        min_x, min_y = self.tile_of(lat - dlat, lon - dlon)
+        max_x, max_y = self.tile_of(lat + dlat, lon + dlon)
+
+        tiles = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                t_min_lat, t_min_lon, t_max_lat, t_max_lon = self.tile_bounds((x, y))
+                near_lat = min(max(lat, t_min_lat), t_max_lat)
+                near_lon = min(max(lon, t_min_lon), t_max_lon)
+                if _haversine_m(lat, lon, near_lat, near_lon) <= radius_m:
+                    tiles.append((x, y))
+        return tiles
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+    async def get_stations(
+        self,
+        redis_client: Optional[Redis],
+        db: AsyncSession,
+        lat: float,
+        lon: float,
+        radius_m: float,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[float]]:
+        """Return static stations of every tile covering the circle.
+
+        Tiles missing from Redis are rebuilt from the DB with a single
+        bounding-box query and written back in one pipeline. Tiles past the
+        soft TTL are used as-is and rebuilt in the background.
+
+        Returns:
+            (stations, filled, stale_age) where `filled` is the number of
+            tiles that had to be loaded from the DB (0 means a full cache hit)
+            and `stale_age` the age in seconds of the oldest stale tile used
+            (None when all were fresh). Stations are not yet filtered by
+            exact distance.
+        """
+        tiles = self.covering_tiles(lat, lon, radius_m)
+        cached: Dict[str, Any] = {}
+        if redis_client is not None and tiles:
+            try:
+                cached = await get_many([self.tile_key(t) for t in tiles], client=redis_client, use_l1=False)
+            except Exception as e:
+                logger.warning("Tile MGET failed, loading from DB: %s", e)
+
+        stations: List[Dict[str, Any]] = []
+        missing: List[Tile] = []
+        stale: List[Tile] = []
+        stale_age: Optional[float] = None
+        for tile in tiles:
+            payload = self._payload(cached.get(self.tile_key(tile)))
+            if payload is None:
+                missing.append(tile)
+                continue
+            stations.extend(payload.get("stations", []))
+            if self.soft_ttl_seconds > 0:
+                state, age = swr.classify(
+                    parse_cache_timestamp(payload.get("timestamp")),
+                    self.soft_ttl_seconds,
+                    max(self.ttl_seconds - self.soft_ttl_seconds, 0),
+                )
+                if state == STALE:
+                    stale_age = max(stale_age or 0.0, age)
+                    stale.append(tile)
+        if stale:
+            swr.revalidate(self._tile_set_key("rebuild", stale), lambda: self._rebuild_tiles(redis_client, stale))
+
+        if missing:
+            filled, _ = await single_flight.do(
+                self._tile_set_key("fill", missing), lambda: self._fill_tiles(redis_client, db, missing)
+            )
+            for tile in missing:
+                stations.extend(filled.get(self.tile_key(tile), []))
+
+        return stations, len(missing), stale_age
+
+    def _tile_set_key(self, kind: str, tiles: List[Tile]) -> str:
+        """Coalescing key of a set of tiles (fill flight / revalidation lease)"""
+        ids = ",".join(f"{x}:{y}" for x, y in sorted(tiles))
+        return f"{self.KEY_PREFIX}:s{self.tile_size}:{kind}:{zlib.crc32(ids.encode('ascii')):08x}"
+
+    async def _fill_tiles(
+        self, redis_client: Optional[Redis], db: AsyncSession, tiles: List[Tile]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Load missing tiles from the DB and write them back.
+
+        Keyed by tile key (codec-serializable) since the result is shared
+        with the other callers of the flight.
+        """
+        filled = await self.load_tiles_from_db(db, tiles)
+        if redis_client is not None:
+            await self.store_tiles(redis_client, filled)
+        return {self.tile_key(tile): stations for tile, stations in filled.items()}
+
+    async def _rebuild_tiles(self, redis_client: Redis, tiles: List[Tile]):
+        """Background rebuild of stale tiles from the DB (own read session)"""
+        from app.db.database import AsyncReadSessionLocal
+
+        async with AsyncReadSessionLocal() as db:
+            filled = await self.load_tiles_from_db(db, tiles)
+        await self.store_tiles(redis_client, filled)
+
+    async def load_tiles_from_db(self, db: AsyncSession, tiles: Iterable[Tile]) -> Dict[Tile, List[Dict[str, Any]]]:
+        """Load the complete station list of the given tiles from the DB.
+
+        Every requested tile is present in the result (possibly empty) so an
+        empty area is cached as such and does not hit the DB again.
+        """
+        wanted = set(tiles)
+        result: Dict[Tile, List[Dict[str, Any]]] = {t: [] for t in wanted}
+        if not wanted:
+            return result
+
+        bounds = [self.tile_bounds(t) for t in wanted]
+        params = {
+            "min_lat": min(b[0] for b in bounds),
+            "min_lon": min(b[1] for b in bounds),
+            "max_lat": max(b[2] for b in bounds),
+            "max_lon": max(b[3] for b in bounds),
+        }
+        rows = (await TILE_FILL.execute(db, params)).fetchall()
+        for row in rows:
+            m = row._mapping
+            try:
+                s_lat, s_lon = float(m["lat"]), float(m["lon"])
+            except (TypeError, ValueError):
+                continue
+            tile = self.tile_of(s_lat, s_lon)
+            if tile in result:
+                result[tile].append({
+                    "station_id": str(m["station_id"]),
+                    "addr": str(m["addr"]),
+                    "station_name": str(m["station_name"]),
+                    "lat": str(s_lat),
+                    "lon": str(s_lon),
+                })
+        return result
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+    async def store_tiles(
+        self,
+        redis_client: Redis,
+        tiles: Dict[Tile, List[Dict[str, Any]]],
+        timestamps: Optional[Dict[Tile, Any]] = None,
+    ):
+        """Write complete tiles in one pipeline (best-effort)
+
+        `timestamps` keeps the given build time per tile (default: now).
+        """
+        if not tiles:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        timestamps = timestamps or {}
+        try:
+            await set_many(
+                [
+                    (self.tile_key(tile), {"stations": stations, "timestamp": timestamps.get(tile) or now}, self.ttl_seconds)
+                    for tile, stations in tiles.items()
+                ],
+                client=redis_client,
+                use_l1=False,
+            )
+        except Exception as e:
+            logger.warning("Tile cache write failed (ignored): %s", e)
+
+    async def merge_stations(self, redis_client: Optional[Redis], stations: List[Dict[str, Any]]):
+        """Merge freshly fetched stations (e.g. from KEPCO) into cached tiles.
+
+        Only tiles that already exist are updated: a tile that is not cached
+        is not known to be complete and will be rebuilt from the DB instead.
+        The tile keeps its timestamp, so the merge does not postpone the
+        next rebuild.
+        """
+        if redis_client is None or not stations:
+            return
+        by_tile: Dict[Tile, List[Dict[str, Any]]] = {}
+        for s in stations:
+            try:
+                tile = self.tile_of(float(s["lat"]), float(s["lon"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            by_tile.setdefault(tile, []).append({
+                k: s.get(k) for k in ("station_id", "addr", "station_name", "lat", "lon")
+            })
+        if not by_tile:
+            return
+
+        try:
+            cached = await get_many([self.tile_key(t) for t in by_tile], client=redis_client, use_l1=False)
+        except Exception as e:
+            logger.warning("Tile merge read failed (ignored): %s", e)
+            return
+
+        merged: Dict[Tile, List[Dict[str, Any]]] = {}
+        timestamps: Dict[Tile, Any] = {}
+        for tile in by_tile:
+            payload = self._payload(cached.get(self.tile_key(tile)))
+            if payload is None:
+                continue
+            by_id = {str(s.get("station_id")): s for s in payload.get("stations", [])}
+            for s in by_tile[tile]:
+                by_id[str(s.get("station_id"))] = s
+            merged[tile] = list(by_id.values())
+            timestamps[tile] = payload.get("timestamp")
+        await self.store_tiles(redis_client, merged, timestamps)
+
+    async def invalidate(self, redis_client: Optional[Redis], tiles: Iterable[Tile]):
+        if redis_client is None:
+            return
+        keys = [self.tile_key(t) for t in tiles]
+        if keys:
+            await redis_client.delete(*keys)
+
+    @staticmethod
+    def _payload(value: Any) -> Optional[Dict[str, Any]]:
+        return value if isinstance(value, dict) else None
+
+
+# Global instance
+station_tile_cache = StationTileCache()
@@ -0,0 +1,122 @@
+"""Stale-while-revalidate for cached payloads
+
+A cached payload is `fresh` up to its soft TTL, `stale` for a further
+configurable window and `expired` afterwards. Stale payloads are served
+immediately (marked as such by the caller) while a background refresh is
+scheduled. Refreshes are deduplicated per key: one task per worker, and a
+short Redis lease so only one worker of the deployment refreshes a key.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.redis_client import acquire_lease, get_redis_client, release_lease
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+def parse_cache_timestamp(raw_ts: Any) -> Optional[datetime]:
+    """Parse a cached `timestamp` (ISO with/without tz or trailing Z, or YYYYMMDDHHMMSS) as aware UTC"""
+    if raw_ts is None:
+        return None
+    s = str(raw_ts)
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(s)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(s, "%Y%m%d%H%M%S")
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class StaleWhileRevalidate:
+    """Freshness classification + deduplicated background refreshes"""
+
+    LOCK_PREFIX = "swr:revalidate"
+
+    def __init__(self, lock_ttl_seconds: Optional[int] = None):
+        self.lock_ttl_seconds = int(lock_ttl_seconds or settings.SWR_REVALIDATE_LOCK_TTL_SECONDS)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, int] = {
+            "fresh": 0,
+            "stale_served": 0,
+            "expired": 0,
+            "revalidations": 0,
+            "deduplicated": 0,
+            "failed": 0,
+        }
+
+    def classify(self, timestamp: Optional[datetime], soft_ttl_seconds: float, stale_seconds: float) -> Tuple[str, Optional[float]]:
+        """Return (fresh|stale|expired, age_seconds) of a payload written at `timestamp`"""
+        if timestamp is None:
+            self._stats["expired"] += 1
+            return EXPIRED, None
+        age = max((datetime.now(timezone.utc) - timestamp).total_seconds(), 0.0)
+        if age <= soft_ttl_seconds:
+            self._stats["fresh"] += 1
+            return FRESH, age
+        if age <= soft_ttl_seconds + stale_seconds:
+            self._stats["stale_served"] += 1
+            return STALE, age
+        self._stats["expired"] += 1
+        return EXPIRED, age
+
+    def revalidate(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """Schedule `fn` in the background unless a refresh of `key` is running.
+
+        Returns True if a task was scheduled in this worker.
+        """
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            self._stats["deduplicated"] += 1
+            return False
+        task = asyncio.ensure_future(self._run(key, fn))
+        self._tasks[key] = task
+        task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        return True
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]):
+        redis_client = await get_redis_client()
+        lock_key = f"{self.LOCK_PREFIX}:{key}"
+        token = None
+        if redis_client is not None:
+            try:
+                token = await acquire_lease(redis_client, lock_key, self.lock_ttl_seconds)
+                if token is None:
+                    # another worker is refreshing this key
+                    self._stats["deduplicated"] += 1
+                    return
+            except Exception as e:
+                logger.warning("SWR lease unavailable for %s (refreshing anyway): %s", key, e)
+        try:
+            self._stats["revalidations"] += 1
+            await fn()
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.warning("SWR revalidation of %s failed: %s", key, e)
+        finally:
+            if token is not None:
+                await release_lease(redis_client, lock_key, token)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "inflight": len(self._tasks)}
+
+
+# Global instance
+swr = StaleWhileRevalidate()
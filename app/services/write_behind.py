@@ -0,0 +1,229 @@
+"""Write-behind persistence of KEPCO results
+
+The station endpoints answer from the parsed upstream payload and hand the
+DB writes (station/charger upserts, availability refresh) to this queue
+instead of awaiting them. A single background task per worker collects
+jobs until WRITE_BEHIND_BATCH_MAX_ITEMS items are pending or
+WRITE_BEHIND_FLUSH_SECONDS passed since the first one, then applies the
+whole batch with the bulk upserts in one transaction.
+
+A failed batch is retried WRITE_BEHIND_RETRY_ATTEMPTS times with
+exponential backoff (transient errors: failover, lock timeouts). If it still
+fails, the jobs are written one by one so a single bad payload only costs
+its own job; jobs failing on their own are dropped and counted
+(jobs_dropped).
+
+The queue is started and drained in the app lifespan. When it is not
+running (scripts, disabled, shutdown) or full, submit() returns False and
+the caller persists inline with persist_kepco_items().
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.metrics import PERSIST_SECONDS
+from app.repository.station_repository import (
+    ChargerRepository,
+    StationAvailabilityRepository,
+    StationRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def persist_kepco_items(db: AsyncSession, items: List[Dict[str, Any]], with_chargers: bool, now: Optional[datetime] = None) -> None:
+    """Upsert KEPCO items (stations, optionally chargers + availability). Caller commits."""
+    if not items:
+        return
+    now = now or datetime.now(timezone.utc)
+    with PERSIST_SECONDS.time(with_chargers=str(with_chargers).lower()):
+        await StationRepository(db).upsert_many(items, synced_at=now)
+        if with_chargers:
+            await ChargerRepository(db).upsert_many(items, fetched_at=now)
+            cs_ids = sorted({str(item.get("csId")) for item in items if item.get("csId")})
+            await StationAvailabilityRepository(db).refresh(cs_ids)
+
+
+class WriteBehindQueue:
+    """Bounded asyncio queue of KEPCO persistence jobs, flushed in batches"""
+
+    def __init__(
+        self,
+        max_jobs: Optional[int] = None,
+        batch_max_items: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+    ):
+        self.max_jobs = int(max_jobs or settings.WRITE_BEHIND_MAX_JOBS)
+        self.batch_max_items = int(batch_max_items or settings.WRITE_BEHIND_BATCH_MAX_ITEMS)
+        self.flush_seconds = float(flush_seconds or settings.WRITE_BEHIND_FLUSH_SECONDS)
+        # (with_chargers, items, fetched_at, enqueued monotonic time)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._stats: Dict[str, int] = {
+            "enqueued": 0,
+            "rejected": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "retries": 0,
+            "jobs_written": 0,
+            "items_written": 0,
+            "jobs_dropped": 0,
+            "jobs_lost": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def start(self, session_factory) -> None:
+        """Start the flusher task (called from the app lifespan)"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_jobs)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs and flush what is queued (bounded by timeout)"""
+        if self._task is None:
+            return
+        self._stopping = True
+        timeout = float(timeout or settings.WRITE_BEHIND_DRAIN_TIMEOUT_SECONDS)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            pending = self._queue.qsize() if self._queue else 0
+            self._stats["jobs_lost"] += pending
+            logger.warning("Write-behind drain timed out, %d jobs dropped", pending)
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        finally:
+            self._task = None
+
+    def submit(self, items: List[Dict[str, Any]], with_chargers: bool, fetched_at: Optional[datetime] = None) -> bool:
+        """Queue KEPCO items for persistence.
+
+        Returns False when the job was not queued (queue stopped or full);
+        the caller should then persist inline.
+        """
+        if not items:
+            return True
+        if not self.running:
+            return False
+        job = (with_chargers, list(items), fetched_at or datetime.now(timezone.utc), time.monotonic())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            return False
+        self._stats["enqueued"] += 1
+        return True
+
+    async def _run(self, session_factory) -> None:
+        while True:
+            batch = await self._collect()
+            if batch is None:
+                return
+            await self._flush(session_factory, batch)
+
+    async def _collect(self) -> Optional[List[Tuple[bool, List[Dict[str, Any]], datetime, float]]]:
+        """Wait for the first job, then gather more until size or time limit"""
+        queue = self._queue
+        while True:
+            if self._stopping and queue.empty():
+                return None
+            try:
+                first = await asyncio.wait_for(queue.get(), timeout=0.5)
+                break
+            except asyncio.TimeoutError:
+                continue
+
+        batch = [first]
+        pending_items = len(first[1])
+        deadline = time.monotonic() + self.flush_seconds
+        while pending_items < self.batch_max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = queue.get_nowait() if self._stopping else await asyncio.wait_for(queue.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            batch.append(job)
+            pending_items += len(job[1])
+        return batch
+
+    async def _flush(self, session_factory, batch) -> None:
+        attempts = max(1, settings.WRITE_BEHIND_RETRY_ATTEMPTS + 1)
+        backoff = settings.WRITE_BEHIND_RETRY_BACKOFF_SECONDS
+        for attempt in range(attempts):
+            try:
+                await self._write(session_factory, batch)
+                self._written(batch)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Write-behind flush of %d jobs failed (attempt %d/%d): %s", len(batch), attempt + 1, attempts, e)
+            if attempt + 1 < attempts:
+                self._stats["retries"] += 1
+                await asyncio.sleep(backoff * (2 ** attempt))
+
+        self._stats["failed_batches"] += 1
+        # isolate the failing job(s): write the rest one by one
+        for job in batch:
+            try:
+                await self._write(session_factory, [job])
+                self._written([job])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["jobs_dropped"] += 1
+                logger.error("Write-behind job of %d items dropped: %s", len(job[1]), e)
+
+    async def _write(self, session_factory, jobs) -> None:
+        """Persist `jobs` in one transaction, each with its own fetch time"""
+        # jobs in fetch order per time: later jobs win, the upserts keep the
+        # last item per csId/cpId
+        by_time: Dict[Tuple[datetime, bool], List[Dict[str, Any]]] = {}
+        for with_chargers, items, fetched_at, _ in sorted(jobs, key=lambda job: job[2]):
+            by_time.setdefault((fetched_at, with_chargers), []).extend(items)
+        async with session_factory() as db:
+            for (fetched_at, with_chargers), items in by_time.items():
+                await persist_kepco_items(db, items, with_chargers=with_chargers, now=fetched_at)
+            await db.commit()
+
+    def _written(self, jobs) -> None:
+        now = time.monotonic()
+        self._last_lag = max(now - job[3] for job in jobs)
+        self._max_lag = max(self._max_lag, self._last_lag)
+        self._stats["batches"] += 1
+        self._stats["jobs_written"] += len(jobs)
+        self._stats["items_written"] += sum(len(job[1]) for job in jobs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, write lag (enqueue -> commit) and counters of this worker"""
+        return {
+            **self._stats,
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_jobs": self.max_jobs,
+            "last_lag_seconds": round(self._last_lag, 3),
+            "max_lag_seconds": round(self._max_lag, 3),
+        }
+
+
+# Global instance
+write_behind = WriteBehindQueue()
@@ -0,0 +1,112 @@
+"""Per-request stage tracing (Server-Timing header + sampled trace log)
+
+The station endpoints wrap each stage (geocode, caches, PostGIS, KEPCO,
+persistence) in `trace_stage()`. Every stage is observed in the
+STAGE_SECONDS histogram (app/metrics.py); when TRACING_ENABLED the
+middleware also opens a RequestTrace for the request and the stages are
+collected as spans. The response then carries e.g.
+
+    Server-Timing: geocode;dur=0.4, tile_cache;dur=3.1, db_counts;dur=1.2,
+                   total;dur=5.9, source;desc="cache"
+
+and a sampled share of requests (TRACE_LOG_SAMPLE_RATE), plus every request
+slower than TRACE_LOG_SLOW_MS, is logged as one "request trace" record
+with the trace fields passed as `extra` (structured keys of the JSON log
+line, rate limited like any other message). With tracing disabled a stage
+costs one histogram observation and a context variable lookup.
+"""
+
+import contextlib
+import contextvars
+import logging
+import random
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar[Optional["RequestTrace"]] = contextvars.ContextVar("request_trace", default=None)
+
+
+class RequestTrace:
+    """Stage durations and annotations of one request"""
+
+    __slots__ = ("started", "spans", "annotations")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # stage -> seconds (repeated stages are summed)
+        self.spans: Dict[str, float] = {}
+        self.annotations: Dict[str, Any] = {}
+
+    def add_span(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        source = self.annotations.get("source")
+        if source is not None:
+            parts.append(f'source;desc="{source}"')
+        return ", ".join(parts)
+
+    def log_record(self, method: str, path: str, status_code: int) -> Dict[str, Any]:
+        return {
+            "event": "request_trace",
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "total_ms": round(self.elapsed() * 1000, 1),
+            "spans_ms": {name: round(seconds * 1000, 1) for name, seconds in self.spans.items()},
+            **self.annotations,
+        }
+
+
+def start_trace() -> Optional[RequestTrace]:
+    """Open a trace for the current request (None when tracing is disabled)"""
+    if not settings.TRACING_ENABLED:
+        return None
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def detach_trace():
+    """Stop recording into the inherited trace (background tasks spawned by a request)"""
+    _current_trace.set(None)
+
+
+def annotate(**values: Any):
+    """Attach values (e.g. source="cache") to the current trace, if any"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.annotations.update(values)
+
+
+@contextlib.contextmanager
+def trace_stage(endpoint: str, stage: str) -> Iterator[None]:
+    """Time a stage: STAGE_SECONDS histogram + span of the current trace"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, endpoint=endpoint, stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(stage, elapsed)
+
+
+def finish_trace(trace: RequestTrace, response, method: str, path: str):
+    """Set the Server-Timing header and emit the trace log if sampled or slow"""
+    response.headers["Server-Timing"] = trace.server_timing()
+    slow_ms = settings.TRACE_LOG_SLOW_MS
+    sampled = settings.TRACE_LOG_SAMPLE_RATE > 0 and random.random() < settings.TRACE_LOG_SAMPLE_RATE
+    if sampled or (slow_ms > 0 and trace.elapsed() * 1000 >= slow_ms):
+        logger.info("request trace", extra=trace.log_record(method, path, response.status_code))
@@ -0,0 +1,127 @@
+"""Benchmark the Redis cache codecs on real payloads.
+
+Compares the stored size and the encode/decode time of plain JSON (the
+previous format), JSON + zlib and every codec combination of
+app/redis_client.py that is installed (msgpack / orjson, zlib / zstd).
+
+Payloads come from a JSON file (e.g. a saved KEPCO EVchargeManage.do
+response or a station detail body) and/or from keys sampled in Redis
+(station_detail:*, station_tile:*, kepco:*).
+
+Usage:
+  python scripts/bench_cache_codec.py --file kepco_response.json [--runs 200]
+  # uses the app settings (REDIS_HOST, REDIS_PORT, ...)
+  python scripts/bench_cache_codec.py --redis-pattern 'station_tile:*' --sample 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.redis_client import (  # noqa: E402
+    close_redis_pool,
+    decode_value,
+    encode_value,
+    get_redis_binary_client,
+    init_redis_pool,
+    msgpack,
+    zstandard,
+)
+
+
+def candidates():
+    """(label, encode, decode) of the previous format and every installed codec"""
+    result = [
+        ("json", lambda v: json.dumps(v, ensure_ascii=False).encode("utf-8"), lambda b: json.loads(b)),
+        (
+            "json+zlib",
+            lambda v: zlib.compress(json.dumps(v, ensure_ascii=False).encode("utf-8"), 6),
+            lambda b: json.loads(zlib.decompress(b)),
+        ),
+    ]
+    serializers = ["json"] + (["msgpack"] if msgpack is not None else [])
+    compressions = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    for ser in serializers:
+        for comp in compressions:
+            result.append((
+                f"codec {ser}+{comp}",
+                lambda v, s=ser, c=comp: encode_value(v, serializer=s, compression=c),
+                decode_value,
+            ))
+    return result
+
+
+def measure(fn, arg, runs: int) -> float:
+    """Median ms per call"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def load_redis_payloads(pattern: str, sample: int) -> list:
+    await init_redis_pool()
+    try:
+        redis_client = await get_redis_binary_client()
+        if redis_client is None:
+            print("Redis unavailable - skipping sampled keys")
+            return []
+        payloads = []
+        async for key in redis_client.scan_iter(match=pattern, count=500):
+            try:
+                value = decode_value(await redis_client.get(key))
+            except Exception:
+                continue
+            if value is not None:
+                payloads.append(value)
+            if len(payloads) >= sample:
+                break
+        return payloads
+    finally:
+        await close_redis_pool()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Redis cache codecs")
+    parser.add_argument("--file", action="append", default=[], help="JSON payload file (repeatable)")
+    parser.add_argument("--redis-pattern", default=None, help="Sample values of keys matching this pattern")
+    parser.add_argument("--sample", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    payloads = []
+    for path in args.file:
+        with open(path, encoding="utf-8") as f:
+            payloads.append(json.load(f))
+    if args.redis_pattern:
+        payloads.extend(await load_redis_payloads(args.redis_pattern, args.sample))
+    if not payloads:
+        print("No payloads: pass --file and/or --redis-pattern")
+        sys.exit(1)
+
+    print(f"{len(payloads)} payload(s), {args.runs} runs each, "
+          f"msgpack={'yes' if msgpack is not None else 'no'}, zstd={'yes' if zstandard is not None else 'no'}")
+    print(f"{'codec':<22}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+    baseline = None
+    for label, encode, decode in candidates():
+        size = 0
+        encode_ms = decode_ms = 0.0
+        for payload in payloads:
+            blob = encode(payload)
+            size += len(blob)
+            encode_ms += measure(encode, payload, args.runs)
+            decode_ms += measure(decode, blob, args.runs)
+        if baseline is None:
+            baseline = size
+        print(f"{label:<22}{size:>12}{size / baseline:>8.2f}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Benchmark the registered queries of app/db/queries.py by name.
+
+Runs a query repeatedly on the read pool of the app (so connect-time
+warmup applies) and prints the first-call and median/p95 latency. With
+--cold the warmup is disabled, to compare the prepare cost on a new
+connection.
+
+Usage:
+  # uses the app settings (DATABASE_URL, DATABASE_URL_READONLY, ...)
+  python scripts/bench_queries.py --list
+  python scripts/bench_queries.py --query stations.nearby \
+      --params '{"lat": 37.39, "lon": 127.11, "radius_m": 5000, "limit": 20, "offset": 0}' [--runs 50]
+  python scripts/bench_queries.py --query station.detail --params '{"station_id": "12345"}' --cold
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.config import settings  # noqa: E402
+from app.db.queries import QUERIES, get_query  # noqa: E402
+
+
+async def run(name: str, params: dict, runs: int):
+    # import after --cold has been applied to the settings
+    from app.db.database import AsyncReadSessionLocal, AsyncSessionLocal, dispose_engines
+
+    query = get_query(name)
+    read_only = query.sql.lstrip().upper().startswith("SELECT")
+    session_factory = AsyncReadSessionLocal if read_only else AsyncSessionLocal
+    timings = []
+    try:
+        async with session_factory() as db:
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = await query.execute(db, params)
+                rows = len(result.fetchall()) if result.returns_rows else result.rowcount
+                timings.append((time.perf_counter() - started) * 1000)
+            if not read_only:
+                # benchmarking a write statement must not change data
+                await db.rollback()
+    finally:
+        await dispose_engines()
+
+    rest = sorted(timings[1:]) or timings
+    p95 = rest[min(len(rest) - 1, int(len(rest) * 0.95))]
+    print(f"{name}: {runs} runs, {rows} rows, warmup={'on' if settings.DB_WARM_QUERIES else 'off'}")
+    print(f"  first  {timings[0]:>9.3f} ms")
+    print(f"  median {statistics.median(rest):>9.3f} ms")
+    print(f"  p95    {p95:>9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a registered query by name")
+    parser.add_argument("--query", help="Registered query name (see --list)")
+    parser.add_argument("--params", default="{}", help="Bind parameters as JSON")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cold", action="store_true", help="Disable the connect-time warmup")
+    parser.add_argument("--list", action="store_true", help="List the registered queries")
+    args = parser.parse_args()
+
+    if args.list or not args.query:
+        for name, query in QUERIES.items():
+            print(f"{name:<32} {'warm' if query.warm_params is not None else ''}")
+        return
+    if args.query not in QUERIES:
+        print(f"Unknown query {args.query!r} (see --list)")
+        sys.exit(1)
+    if args.cold:
+        settings.DB_WARM_QUERIES = False
+    asyncio.run(run(args.query, json.loads(args.params), max(1, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
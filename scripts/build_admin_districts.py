@@ -0,0 +1,127 @@
+"""Build app/data/admin_districts.geojson for the offline reverse geocoder.
+
+Converts official boundary files into the polygon dataset read by
+app/services/reverse_geocoder.py: one feature per area with sido, sigungu,
+gu and emd properties. Two input layouts are understood:
+
+- 시군구 boundaries (국가공간정보/행정안전부 "시군구 경계", SIG_CD /
+  SIG_KOR_NM): --code-prop SIG_CD --name-prop SIG_KOR_NM (default)
+- 읍/면/동 (행정동) boundaries with the full area name, e.g. the 통계청
+  행정동 경계 as published in vuski/admdongkor (adm_cd / adm_nm =
+  "경기도 성남시분당구 정자1동"): --code-prop adm_cd --name-prop adm_nm
+
+--input may be repeated (e.g. 시군구 + 읍/면/동): lookups pick the smallest
+polygon containing the point, so the 읍/면/동 areas win and the 시군구 layer
+covers gaps. Inputs must be GeoJSON in WGS84 (lon/lat), local paths or
+http(s) URLs; convert a shapefile first, e.g.
+
+  ogr2ogr -f GeoJSON -t_srs EPSG:4326 sig.geojson TL_SCCO_SIG.shp
+
+Usage:
+  python scripts/build_admin_districts.py --input sig.geojson \
+      [--code-prop SIG_CD] [--name-prop SIG_KOR_NM] [--sido 11,41] [--simplify 0.0001]
+  python scripts/build_admin_districts.py --input https://.../HangJeongDong.geojson \
+      --code-prop adm_cd --name-prop adm_nm --simplify 0.0001
+
+The Docker image runs the second form at build time (ADMIN_BOUNDARIES_URL).
+--sido keeps only the given 2-digit 시/도 codes (default: all). Points
+outside the written polygons resolve to None and use Nominatim.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import urllib.request
+
+from shapely.geometry import mapping, shape
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "data", "admin_districts.geojson"
+)
+
+# 시/도 by the first two digits of the 행정표준코드 (SIG_CD)
+SIDO_BY_CODE = {
+    "11": "서울특별시", "26": "부산광역시", "27": "대구광역시", "28": "인천광역시",
+    "29": "광주광역시", "30": "대전광역시", "31": "울산광역시", "36": "세종특별자치시",
+    "41": "경기도", "42": "강원도", "43": "충청북도", "44": "충청남도", "45": "전라북도",
+    "46": "전라남도", "47": "경상북도", "48": "경상남도", "50": "제주특별자치도",
+    "51": "강원특별자치도", "52": "전북특별자치도",
+}
+
+# "성남시 분당구" / "성남시분당구": 일반구 of a city
+_CITY_GU = re.compile(r"^(\S+시)\s*(\S+구)$")
+# first token of a full area name
+_SIDO_SUFFIXES = ("특별시", "광역시", "특별자치시", "특별자치도", "도")
+
+
+def area_properties(code: str, name: str) -> dict:
+    """sido/sigungu/gu/emd of a 시군구 name ("분당구"...) or a full area name"""
+    tokens = name.split()
+    sido = SIDO_BY_CODE.get(code[:2], "")
+    emd = ""
+    if tokens and tokens[0].endswith(_SIDO_SUFFIXES):
+        # full name: 시도 [시군구 [구]] [읍면동]
+        sido, tokens = tokens[0], tokens[1:]
+        if tokens and tokens[-1].endswith(("읍", "면", "동", "가", "리")):
+            emd, tokens = tokens[-1], tokens[:-1]
+    sigungu = " ".join(tokens).strip()
+    if sigungu == sido:
+        # 세종: no 시/군/구 level
+        sigungu = ""
+    match = _CITY_GU.match(sigungu)
+    if match and not sido.endswith(("특별시", "광역시")):
+        return {"sido": sido, "sigungu": match.group(1), "gu": match.group(2), "emd": emd}
+    return {"sido": sido, "sigungu": sigungu, "gu": "", "emd": emd}
+
+
+def read_collection(source: str) -> dict:
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=120) as response:
+            return json.loads(response.read().decode("utf-8"))
+    with open(source, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the reverse geocoder boundary dataset")
+    parser.add_argument("--input", required=True, action="append", help="Boundary GeoJSON (WGS84), path or URL")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--code-prop", default="SIG_CD")
+    parser.add_argument("--name-prop", default="SIG_KOR_NM")
+    parser.add_argument("--sido", default="", help="Comma-separated 2-digit 시/도 codes to keep")
+    parser.add_argument("--simplify", type=float, default=0.0, help="Simplify tolerance in degrees (0 = off)")
+    args = parser.parse_args()
+
+    keep = {c.strip() for c in args.sido.split(",") if c.strip()}
+    features, skipped = [], 0
+    for source in args.input:
+        collection = read_collection(source)
+        for feature in collection.get("features", []):
+            props = feature.get("properties") or {}
+            code = str(props.get(args.code_prop) or "")
+            name = str(props.get(args.name_prop) or "").strip()
+            if not code or not name or (keep and code[:2] not in keep):
+                skipped += 1
+                continue
+            geom = shape(feature["geometry"])
+            if args.simplify > 0:
+                geom = geom.simplify(args.simplify, preserve_topology=True)
+            if geom.is_empty or not geom.is_valid:
+                geom = geom.buffer(0)
+            features.append({
+                "type": "Feature",
+                "properties": {"code": code, **area_properties(code, name)},
+                "geometry": mapping(geom),
+            })
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False)
+    print(f"Wrote {len(features)} areas to {args.output} ({skipped} skipped)")
+    if not features:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
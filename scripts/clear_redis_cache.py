@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 """
 Scan and optionally delete Redis keys matching a pattern.
-Default pattern targets the coordinate-based station cache keys:
-  stations:lat{lat_round}:lon{lon_round}:r{radius}
+Default pattern targets the tile-based station cache keys:
+  station_tile:s{tile_size}:x{tile_x}:y{tile_y}
 
 Usage:
   # dry-run (default) - list keys only
-  REDIS_HOST=red-d3kkesh5pdvs739ka080 REDIS_PORT=6379 python3 scripts/clear_redis_cache.py --pattern "stations:lat37.4073*"
+  REDIS_HOST=red-d3kkesh5pdvs739ka080 REDIS_PORT=6379 python3 scripts/clear_redis_cache.py --pattern "station_tile:s0.05:x2540:*"
 
   # actually delete found keys (careful)
-  REDIS_HOST=red-d3kkesh5pdvs739ka080 REDIS_PORT=6379 python3 scripts/clear_redis_cache.py --pattern "stations:lat37.4073*" --delete
+  REDIS_HOST=red-d3kkesh5pdvs739ka080 REDIS_PORT=6379 python3 scripts/clear_redis_cache.py --pattern "station_tile:s0.05:x2540:*" --delete
 
 If REDIS_PASSWORD is set, it will be used.
 """
@@ -21,7 +21,7 @@ import redis
 
 def parse_args():
     p = argparse.ArgumentParser(description="Scan and optionally delete Redis keys for station cache")
-    p.add_argument("--pattern", default="stations:lat*", help="Redis SCAN pattern to match keys")
+    p.add_argument("--pattern", default="station_tile:*", help="Redis SCAN pattern to match keys")
     p.add_argument("--delete", action="store_true", help="Delete matched keys (use with caution)")
     p.add_argument("--count", type=int, default=100, help="SCAN count hint")
     return p.parse_args()
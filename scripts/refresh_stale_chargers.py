@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Refresh stale charger statuses from KEPCO outside the API process.
+
+Runs the same refresher as the API lifespan (app/services/charger_refresher.py):
+chargers older than CHARGER_REFRESH_STALE_MINUTES are grouped by district and
+refetched with bounded concurrency and a rate limit. Set
+CHARGER_REFRESH_ENABLED=false on the API when running this as its own process.
+
+Usage:
+  # uses the app settings (DATABASE_URL, REDIS_*, EXTERNAL_STATION_API_*)
+  python3 scripts/refresh_stale_chargers.py            # one pass
+  python3 scripts/refresh_stale_chargers.py --loop     # every CHARGER_REFRESH_INTERVAL_SECONDS
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Reuse the app services (run from the repo root or scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.db.database import AsyncSessionLocal  # noqa: E402
+from app.http_client import close_http_clients  # noqa: E402
+from app.redis_client import init_redis_pool, close_redis_pool  # noqa: E402
+from app.services.charger_refresher import charger_refresher  # noqa: E402
+from app.services.reverse_geocoder import reverse_geocoder  # noqa: E402
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Refresh stale charger statuses from KEPCO')
+    parser.add_argument('--loop', action='store_true', help='Keep running, one pass per interval')
+    args = parser.parse_args()
+
+    if not reverse_geocoder.load():
+        # like the API refresher: group by the stations' stored addresses
+        print('WARNING: offline reverse geocoder dataset unavailable - grouping chargers by station address')
+    await init_redis_pool()
+    try:
+        if args.loop:
+            await charger_refresher.run_forever(AsyncSessionLocal)
+        else:
+            summary = await charger_refresher.run_once(AsyncSessionLocal)
+            print(json.dumps({**summary, **charger_refresher.stats()}, ensure_ascii=False, indent=2))
+    finally:
+        await close_http_clients()
+        await close_redis_pool()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -30,9 +30,9 @@ for r in "${radii[@]}"; do
   echo "  saved -> $OUT_DIR/stations_r${r}.json"
 done
 
-# Call admin Redis keys (dry-run) for stations and station_detail
+# Call admin Redis keys (dry-run) for station tiles and station_detail
 echo "--> Listing Redis keys (admin)"
-curl -s -u "$ADMIN_USER" "$SERVICE_URL/admin/redis/keys?pattern=stations:*&count=500" -o "$OUT_DIR/redis_stations_keys.json"
+curl -s -u "$ADMIN_USER" "$SERVICE_URL/admin/redis/keys?pattern=station_tile:*&count=500" -o "$OUT_DIR/redis_station_tile_keys.json"
 curl -s -u "$ADMIN_USER" "$SERVICE_URL/admin/redis/keys?pattern=station_detail:*&count=500" -o "$OUT_DIR/redis_station_detail_keys.json"
 
 # Optional: call station detail for a station_id if known (user may edit this)
@@ -18,6 +18,7 @@ from pprint import pprint
 
 from app.core.config import settings
 from app.redis_client import init_redis_pool, get_redis_client
+from app.services.station_tile_cache import station_tile_cache
 
 # Sample coordinates/radii to test
 TESTS = [
@@ -31,10 +32,8 @@ fake_redis = {}
 
 
 def make_cache_key(lat, lon, radius):
-    coord_decimals = getattr(settings, "CACHE_COORD_ROUND_DECIMALS", 8)
-    lat_round = round(float(lat), coord_decimals)
-    lon_round = round(float(lon), coord_decimals)
-    return f"stations:lat{lat_round}:lon{lon_round}:r{radius}"
+    # station search is cached per grid tile; use the tile of the center point
+    return station_tile_cache.tile_key(station_tile_cache.tile_of(float(lat), float(lon)))
 
 
 def set_fake(key, value, ex):
@@ -70,7 +69,7 @@ def simulate_cache_behavior():
     print("\n[Simulation] Application cache settings:")
     print(f"  SEARCH TTL (seconds): {settings.CACHE_EXPIRE_SECONDS}")
     print(f"  DETAIL TTL (seconds): {getattr(settings, 'CACHE_DETAIL_EXPIRE_SECONDS', 'NOT_SET')}")
-    print(f"  COORD ROUND DECIMALS: {settings.CACHE_COORD_ROUND_DECIMALS}\n")
+    print(f"  TILE SIZE (deg): {settings.STATION_TILE_SIZE_DEG}\n")
 
     for lat, lon, radius in TESTS:
         key = make_cache_key(lat, lon, radius)
@@ -20,10 +20,12 @@
 set -euo pipefail
 
 # --------------------------------------
-# Preserve read-only DATABASE_URL for app
+# Database URLs for the app
 # --------------------------------------
-# If DATABASE_URL_READONLY is set, use it as DATABASE_URL for app
-export DATABASE_URL="${DATABASE_URL_READONLY:-$DATABASE_URL}"
+# DATABASE_URL is the primary (writes); DATABASE_URL_READONLY, when set, is
+# read by the app itself for the read engine (app/db/database.py), so it is
+# no longer copied over DATABASE_URL here.
+APP_DATABASE_URL="${DATABASE_URL:-}"
 
 # --------------------------------------
 # Run DB migrations with admin account
@@ -37,12 +39,16 @@ if [ -n "${DATABASE_URL:-}" ] && [ -n "${MIGRATION_DATABASE_URL:-}" ]; then
   else
     alembic upgrade head || true
   fi
-  # restore read-only DATABASE_URL
-  export DATABASE_URL="${DATABASE_URL_READONLY}"
+  # restore the primary DATABASE_URL
+  export DATABASE_URL="$APP_DATABASE_URL"
 fi
 
 # --------------------------------------
 # Start ASGI server
 # --------------------------------------
-echo "=== Starting server with read-only DB ==="
+if [ -n "${DATABASE_URL_READONLY:-}" ]; then
+  echo "=== Starting server (reads: DATABASE_URL_READONLY, writes: DATABASE_URL) ==="
+else
+  echo "=== Starting server (reads + writes: DATABASE_URL) ==="
+fi
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
@@ -0,0 +1,51 @@
+import json
+import zlib
+
+import pytest
+
+from app import redis_client
+from app.redis_client import CODEC_VERSION, decode_value, encode_value
+
+VALUE = {"stations": [{"station_id": "CS1", "addr": "서울특별시 강남구", "lat": "37.5"}] * 50, "timestamp": "2026-01-01T00:00:00+00:00"}
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_round_trip_json(compression):
+    raw = encode_value(VALUE, serializer="json", compression=compression)
+    assert raw[0] == CODEC_VERSION
+    assert decode_value(raw) == VALUE
+
+
+def test_small_values_are_not_compressed():
+    raw = encode_value({"a": 1}, serializer="json", compression="zlib")
+    assert raw[1] >> 4 == 0
+
+
+@pytest.mark.skipif(redis_client.msgpack is None, reason="msgpack not installed")
+def test_round_trip_msgpack():
+    assert decode_value(encode_value(VALUE, serializer="msgpack", compression="zlib")) == VALUE
+
+
+@pytest.mark.skipif(redis_client.zstandard is None, reason="zstandard not installed")
+def test_round_trip_zstd():
+    assert decode_value(encode_value(VALUE, serializer="json", compression="zstd")) == VALUE
+
+
+def test_legacy_json_values_decode():
+    legacy = json.dumps(VALUE, ensure_ascii=False)
+    assert decode_value(legacy.encode("utf-8")) == VALUE
+    assert decode_value(legacy) == VALUE
+
+
+def test_missing_values_decode_to_none():
+    assert decode_value(None) is None
+    assert decode_value(b"") is None
+
+
+def test_corrupt_values_raise_value_error():
+    with pytest.raises(ValueError):
+        decode_value(bytes((CODEC_VERSION,)))
+    with pytest.raises(ValueError):
+        decode_value(bytes((CODEC_VERSION, 1 << 4)) + b"not zlib")
+    with pytest.raises(ValueError):
+        decode_value(bytes((CODEC_VERSION, 7 << 4)) + zlib.compress(b"{}"))
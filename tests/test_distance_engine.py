@@ -0,0 +1,40 @@
+import pytest
+
+from app.services.distance_engine import StationBatch
+
+ORIGIN = (37.5, 127.0)
+
+
+def _station(station_id, lat, lon):
+    return {"station_id": station_id, "lat": lat, "lon": lon}
+
+
+def test_hits_are_filtered_by_radius_and_nearest_first():
+    batch = StationBatch([
+        _station("far", "37.53", "127.0"),      # ~3.3 km
+        _station("near", "37.501", "127.0"),    # ~111 m
+        _station("outside", "37.6", "127.0"),   # ~11 km
+        _station("mid", "37.51", "127.0"),      # ~1.1 km
+    ])
+    hits = batch.hits(*ORIGIN, 5000)
+    assert [s["station_id"] for s, _ in hits] == ["near", "mid", "far"]
+    distances = [d for _, d in hits]
+    assert distances == sorted(distances)
+    assert distances[0] == pytest.approx(111.2, abs=0.5)
+
+
+def test_radius_boundary_is_inclusive():
+    batch = StationBatch([_station("here", "37.5", "127.0")])
+    assert [s["station_id"] for s, _ in batch.hits(*ORIGIN, 0)] == ["here"]
+
+
+def test_unparseable_coordinates_are_dropped():
+    batch = StationBatch([_station("ok", "37.5", "127.0"), _station("blank", "", "127.0"), {"station_id": "none"}])
+    assert len(batch) == 1
+    assert [s["station_id"] for s, _ in batch.hits(*ORIGIN, 100)] == ["ok"]
+
+
+def test_candidates_restrict_the_search():
+    batch = StationBatch([_station("a", "37.5", "127.0"), _station("b", "37.5001", "127.0")])
+    assert [s["station_id"] for s, _ in batch.hits(*ORIGIN, 1000, candidates=[1])] == ["b"]
+    assert batch.hits(*ORIGIN, 1000, candidates=[]) == []
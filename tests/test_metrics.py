@@ -0,0 +1,32 @@
+from app.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_text_output():
+    hist = Histogram("test_seconds", "Test latency", ["stage"], buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="db")
+    hist.observe(0.5, stage="db")
+    hist.observe(3.0, stage="db")
+    assert hist.render() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="db",le="0.1"} 1',
+        'test_seconds_bucket{stage="db",le="1"} 2',
+        'test_seconds_bucket{stage="db",le="+Inf"} 3',
+        'test_seconds_sum{stage="db"} 3.55',
+        'test_seconds_count{stage="db"} 3',
+    ]
+
+
+def test_histogram_label_values_are_escaped():
+    hist = Histogram("esc_seconds", "Escaping", ["path"], buckets=(1.0,))
+    hist.observe(0.5, path='a"b\\c')
+    assert 'esc_seconds_count{path="a\\"b\\\\c"} 1' in hist.render()
+
+
+def test_registry_render_ends_with_newline():
+    registry = MetricsRegistry(flush_interval_seconds=60)
+    registry.histogram("r_seconds", "Registry", buckets=(1.0,)).observe(2.0)
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "r_seconds_bucket{le=\"+Inf\"} 1" in text
+    assert "r_seconds_sum 2" in text
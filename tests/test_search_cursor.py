@@ -0,0 +1,67 @@
+import base64
+import json
+
+import pytest
+
+from app.services.search_cursor import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    search_fingerprint,
+    station_key,
+)
+
+
+def _stations(*pairs):
+    return [{"station_id": sid, "distance_m": dist} for dist, sid in pairs]
+
+
+def test_cursor_round_trip():
+    fingerprint = search_fingerprint("37.5", "127.0", 5000)
+    cursor = encode_cursor((1234.5678, "CS1"), fingerprint)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, fingerprint) == (1234.5678, "CS1")
+
+
+def test_cursor_of_another_search_is_rejected():
+    cursor = encode_cursor((10.0, "CS1"), search_fingerprint("37.5", "127.0", 5000))
+    with pytest.raises(InvalidCursor, match="another search"):
+        decode_cursor(cursor, search_fingerprint("37.5", "127.0", 10000))
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    base64.urlsafe_b64encode(b"[1, 2]").decode("ascii"),
+    base64.urlsafe_b64encode(json.dumps(["far", "CS1", 0]).encode()).decode("ascii"),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor, match="malformed"):
+        decode_cursor(cursor, 0)
+
+
+def test_paginate_walks_all_pages_by_cursor():
+    items = sorted(_stations((5.0, "C"), (1.0, "A"), (1.0, "B"), (9.0, "D"), (12.0, "E")), key=station_key)
+    seen, after = [], None
+    while True:
+        page, cursor = paginate(items, 2, after, fingerprint=7)
+        seen.extend(s["station_id"] for s in page)
+        if cursor is None:
+            break
+        after = decode_cursor(cursor, 7)
+    assert seen == ["A", "B", "C", "D", "E"]
+
+
+def test_paginate_skips_the_cursor_station_placed_after_its_key():
+    # another tier computed a slightly larger distance for the cursor's station
+    items = _stations((1.0, "A"), (5.0000001, "C"), (9.0, "D"))
+    page, cursor = paginate(items, 10, after=(5.0, "C"))
+    assert [s["station_id"] for s in page] == ["D"]
+    assert cursor is None
+
+
+def test_paginate_offset_fallback():
+    items = _stations((1.0, "A"), (2.0, "B"), (3.0, "C"))
+    page, cursor = paginate(items, 1, offset=1, fingerprint=3)
+    assert [s["station_id"] for s in page] == ["B"]
+    assert decode_cursor(cursor, 3) == (2.0, "B")